@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Times binding arguments to a signature with `inspect.Signature.bind`,
+`sigtools.support.bind_callsig` and the function returned by
+`sigtools.signatures.UpgradedSignature.compile_binder`::
+
+    python benchmarks/binding.py --number 100000
+"""
+
+import argparse
+import timeit
+
+from sigtools import support
+
+
+CASES = [
+    ('request, *, timeout=None, retries=3, verbose=False',
+     ('req',), {'timeout': 5}),
+    ('self, request, *args, **kwargs',
+     ('self', 'req', 1, 2), {'user': 'admin'}),
+    ('a, b, c, d=4, e=5, f=6',
+     (1, 2, 3, 4, 5, 6), {}),
+    ('a, /, b, *, c',
+     (1,), {'b': 2, 'c': 3}),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print('{0:<52} {1:>8} {2:>12} {3:>8}'.format(
+        'signature', 'bind', 'bind_callsig', 'binder'))
+    for sig_str, pos, named in CASES:
+        sig = support.s(sig_str)
+        binder = sig.compile_binder()
+        assert binder(pos, named) == sig.bind(*pos, **named).arguments
+        times = []
+        for stmt in (lambda: sig.bind(*pos, **named),
+                     lambda: support.bind_callsig(sig, pos, named),
+                     lambda: binder(pos, named)):
+            best = min(timeit.repeat(
+                stmt, number=args.number, repeat=args.repeat))
+            times.append(best / args.number * 1e6)
+        print('{0:<52} {1:>6.2f}us {2:>10.2f}us {3:>6.2f}us'.format(
+            '(' + sig_str + ')', *times))
+
+
+if __name__ == '__main__':
+    main()
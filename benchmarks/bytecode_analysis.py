@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Compares the cost of listing the calls a function makes from its bytecode
+with doing so from its source, over every function of the given modules that
+takes ``*args`` or ``**kwargs``::
+
+    python benchmarks/bytecode_analysis.py subprocess logging asyncio.events
+
+The source-based figures are given both with and without the cost of
+locating and parsing the source file, since sigtools parses each file only
+once.
+"""
+
+import argparse
+import importlib
+import time
+import types
+
+from sigtools import _autoforwards, _util
+
+
+def star_functions(module):
+    """Returns the functions and methods defined in ``module`` that take
+    ``*args`` or ``**kwargs``."""
+    found = []
+    def visit(namespace, depth):
+        for value in list(vars(namespace).values()):
+            value = getattr(value, '__func__', value)
+            if isinstance(value, types.FunctionType):
+                if (value.__module__ == module.__name__
+                        and value.__code__.co_flags & 0xc):
+                    found.append(value)
+            elif isinstance(value, type) and depth == 0:
+                visit(value, depth + 1)
+    visit(module, 0)
+    return found
+
+
+def forwarding(calls):
+    return [
+        (repr(call.wrapped), call.use_varargs, call.use_varkwargs)
+        for call in calls if call.use_varargs or call.use_varkwargs]
+
+
+def best_of(repeat, func):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        'modules', nargs='*',
+        default=['subprocess', 'logging', 'functools', 'asyncio.events'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    funcs = []
+    for name in args.modules:
+        funcs.extend(star_functions(importlib.import_module(name)))
+    funcs = [func for func in funcs if _util.get_ast(func) is not None]
+    nodes = [_util.get_ast(func) for func in funcs]
+
+    def parse_and_visit():
+        _util.clear_ast_cache()
+        for func in funcs:
+            _autoforwards.CallListerVisitor(_util.get_ast(func))
+
+    def visit():
+        for node in nodes:
+            _autoforwards.CallListerVisitor(node)
+
+    def bytecode():
+        for func in funcs:
+            _autoforwards.BytecodeCallLister(func.__code__)
+
+    agree = sum(
+        forwarding(_autoforwards.CallListerVisitor(node))
+        == forwarding(_autoforwards.BytecodeCallLister(func.__code__))
+        for func, node in zip(funcs, nodes))
+    print('{0} functions, forwarding calls identical for {1}'.format(
+        len(funcs), agree))
+    print('{0:>18} {1:>10} {2:>14}'.format(
+        'analysis', 'total (ms)', 'per func (us)'))
+    for label, func in [
+            ('source, parsed', parse_and_visit),
+            ('source, cached', visit),
+            ('bytecode', bytecode),
+            ]:
+        best = best_of(args.repeat, func)
+        print('{0:>18} {1:>10.2f} {2:>14.1f}'.format(
+            label, best * 1e3, best * 1e6 / max(len(funcs), 1)))
+
+
+if __name__ == '__main__':
+    main()
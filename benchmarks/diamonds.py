@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Times the resolution of diamond-shaped forwarding graphs, where each
+function forwards ``*args`` and ``**kwargs`` to every function of the next
+layer, so that the number of forwarding paths from the top function to the
+innermost one grows exponentially with the depth::
+
+    python benchmarks/diamonds.py --depth 2 4 8 16
+"""
+
+import argparse
+import linecache
+import time
+
+from sigtools import specifiers
+
+
+def make_graph(depth, width):
+    """Returns the top function of a graph with ``depth`` layers of
+    ``width`` functions each."""
+    lines = ['def n_{0}_0(a, *, b):\n    pass\n'.format(depth)]
+    for layer in range(depth - 1, -1, -1):
+        for i in range(1 if layer == 0 else width):
+            body = ''.join(
+                '    n_{0}_{1}(*args, **kwargs)\n'.format(
+                    layer + 1, 0 if layer + 1 == depth else j)
+                for j in range(1 if layer + 1 == depth else width))
+            lines.append('def n_{0}_{1}(*args, **kwargs):\n{2}'.format(
+                layer, i, body))
+    source = '\n'.join(lines)
+    filename = '<sigtools-bench-diamonds-{0}-{1}>'.format(depth, width)
+    # lets inspect.getsource find the generated functions
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+    namespace = {}
+    exec(compile(source, filename, 'exec'), namespace)
+    return namespace['n_0_0']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--depth', type=int, nargs='+', default=[2, 4, 6, 8])
+    parser.add_argument('--width', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print('{0:>5} {1:>12} {2:>10}'.format('depth', 'paths', 'time (ms)'))
+    for depth in args.depth:
+        func = make_graph(depth, args.width)
+        assert str(specifiers.signature(func)) == '(a, *, b)'
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            specifiers.signature(func)
+            best = min(best, time.perf_counter() - start)
+        print('{0:>5} {1:>12} {2:>10.2f}'.format(
+            depth, args.width ** (depth - 1), best * 1e3))
+
+
+if __name__ == '__main__':
+    main()
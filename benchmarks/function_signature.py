@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Compares building the signature of plain functions from their code objects
+with going through `inspect.signature` and upgrading the result::
+
+    python benchmarks/function_signature.py
+"""
+
+import argparse
+import inspect
+import timeit
+
+from sigtools import _signatures, support
+
+
+FUNCTIONS = {
+    'no parameters': '',
+    '3 parameters': 'a, b, c',
+    'defaults': 'a, b=1, c=2, d=3',
+    'everything': 'a, b=1, /, c=2, *args, d, e=3, **kwargs',
+    'annotations': 'a: int, b: str, *, c: float=1.0',
+    '20 parameters': ', '.join('p{0}'.format(i) for i in range(20)),
+}
+
+
+def inspect_path(func):
+    return _signatures.set_default_sources(inspect.signature(func), func)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print('{0:<16} {1:>12} {2:>12} {3:>8}'.format(
+        '', 'inspect (us)', 'code (us)', 'speedup'))
+    for name, sig_str in FUNCTIONS.items():
+        func = support.f(sig_str)
+        assert _signatures.signature(func) == inspect_path(func)
+        slow = min(timeit.repeat(
+            lambda: inspect_path(func), number=args.number, repeat=3))
+        fast = min(timeit.repeat(
+            lambda: _signatures.signature(func), number=args.number, repeat=3))
+        print('{0:<16} {1:>12.2f} {2:>12.2f} {3:>7.1f}x'.format(
+            name, slow / args.number * 1e6, fast / args.number * 1e6,
+            slow / fast))
+
+
+if __name__ == '__main__':
+    main()
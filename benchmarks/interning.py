@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Measures the memory held by the signatures of a registry of handlers,
+with and without `sigtools.signatures.enable_interning`::
+
+    python benchmarks/interning.py --handlers 1000 5000 --passes 1 3
+
+Each handler takes ``self`` and ``request`` and forwards everything else to
+one of a few shared helpers, so that most of their parameters come from the
+same functions. With several passes, the signatures are resolved and kept
+again for each pass, as when several parts of an application each keep the
+signatures they resolved. Once a pass resolves more than ``--maxsize``
+parameters or signatures, the next pass no longer finds the first ones in
+the pool; ``--maxsize 0`` lifts the limit.
+"""
+
+import argparse
+import gc
+import linecache
+import time
+import tracemalloc
+
+from sigtools import _autoforwards, _util, signatures, specifiers
+
+
+def make_handlers(count, helpers):
+    """Returns ``count`` handler methods forwarding to ``helpers`` shared
+    functions."""
+    lines = []
+    for i in range(helpers):
+        lines.append(
+            'def helper_{0}(request, *, timeout=None, retries=3,'
+            ' verbose=False):\n'
+            '    pass\n'.format(i))
+    for i in range(count):
+        lines.append(
+            'def handler_{0}(self, request, *args, **kwargs):\n'
+            '    return helper_{1}(request, *args, **kwargs)\n'
+            .format(i, i % helpers))
+    source = '\n'.join(lines)
+    filename = '<sigtools-bench-handlers-{0}-{1}>'.format(count, helpers)
+    # lets inspect.getsource find the generated functions
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+    namespace = {}
+    exec(compile(source, filename, 'exec'), namespace)
+    return [namespace['handler_{0}'.format(i)] for i in range(count)]
+
+
+def forget_discovery():
+    """Drops what automatic discovery remembers about each function, so that
+    only the memory held by the signatures and the pool is counted."""
+    _autoforwards.forget_calls()
+    _autoforwards.forget_unusable_code()
+    _util.clear_ast_cache()
+
+
+def measure(handlers, passes):
+    """Returns the memory held by ``passes`` times the signatures of
+    ``handlers`` and the intern pool, in bytes, and the time taken to
+    compute them, in seconds."""
+    forget_discovery()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        sigs = [specifiers.signature(handler)
+                for _ in range(passes) for handler in handlers]
+        duration = time.perf_counter() - start
+        forget_discovery()
+        gc.collect()
+        held = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    assert str(sigs[0]) == \
+        '(self, request, *, timeout=None, retries=3, verbose=False)'
+    return held, duration
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--handlers', type=int, nargs='+',
+                        default=[1000, 5000])
+    parser.add_argument('--passes', type=int, nargs='+', default=[1, 3])
+    parser.add_argument('--helpers', type=int, default=10)
+    parser.add_argument('--maxsize', type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    print('{0:>8} {1:>6} {2:>9} {3:>12} {4:>16} {5:>10}'.format(
+        'handlers', 'passes', 'interning', 'held (KiB)', 'per handler (B)',
+        'time (ms)'))
+    for count in args.handlers:
+        handlers = make_handlers(count, args.helpers)
+        for passes in args.passes:
+            for interning in (False, True):
+                if interning:
+                    signatures.enable_interning(args.maxsize or None)
+                else:
+                    signatures.disable_interning()
+                held, duration = measure(handlers, passes)
+                print('{0:>8} {1:>6} {2:>9} {3:>12.1f} {4:>16.0f} {5:>10.1f}'
+                      .format(count, passes, 'on' if interning else 'off',
+                              held / 1024, held / count, duration * 1e3))
+            signatures.disable_interning()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Measures `sigtools.signatures.merge` on growing numbers of signatures
+that share some parameters and each add a keyword-only one::
+
+    python benchmarks/merge_many.py --count 2 10 50 200
+
+Each signature takes ``a, b=1, *args, c, d<i>=2, **kwargs``, so the merged
+signature gains a keyword-only parameter for every input.
+"""
+
+import argparse
+import time
+
+from sigtools import signatures, support
+
+
+def make_signatures(count):
+    """Returns ``count`` signatures to merge together."""
+    return [
+        support.s('a, b=1, *args, c, d{0}=2, **kwargs'.format(i),
+                  name='f{0}'.format(i))
+        for i in range(count)]
+
+
+def measure(repeat, func):
+    """Returns the best time of ``func``, in seconds."""
+    func()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--count', type=int, nargs='+',
+                        default=[2, 10, 50, 200])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print('{0:>6} {1:>10} {2:>14}'.format(
+        'count', 'time (ms)', 'per sig (us)'))
+    for count in args.count:
+        sigs = make_signatures(count)
+        assert len(signatures.merge(*sigs).parameters) == count + 5
+        best = measure(args.repeat, lambda: signatures.merge(*sigs))
+        print('{0:>6} {1:>10.3f} {2:>14.1f}'.format(
+            count, best * 1e3, best * 1e6 / count))
+
+
+if __name__ == '__main__':
+    main()
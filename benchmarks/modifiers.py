@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Times calling functions decorated with `sigtools.modifiers`, with and
+without ``native=True``, against calling the undecorated function::
+
+    python benchmarks/modifiers.py --number 100000
+"""
+
+import argparse
+import timeit
+
+from sigtools import modifiers, support
+
+
+CASES = [
+    ('kwoargs', 'request, timeout=None, retries=3',
+     lambda native: modifiers.kwoargs('timeout', 'retries', native=native),
+     ('req',), {'timeout': 5}),
+    ('posoargs', 'self, request, *args, **kwargs',
+     lambda native: modifiers.posoargs('self', 'request', native=native),
+     ('self', 'req', 1), {'user': 1}),
+    ('autokwoargs', 'a, b, c=1, d=2, e=3',
+     lambda native: modifiers.autokwoargs(native=native),
+     (1, 2), {'d': 4}),
+    ('kwoargs+posoargs', 'a, b, c, d=4',
+     lambda native: lambda func: modifiers.kwoargs('d', native=native)(
+         modifiers.posoargs('a')(func)),
+     (1, 2, 3), {'d': 5}),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print('{0:<18} {1:>8} {2:>11} {3:>8}'.format(
+        'modifier', 'plain', 'translated', 'native'))
+    for name, sig_str, decorator, pos, named in CASES:
+        func = support.f(sig_str)
+        translated = decorator(False)(func)
+        native = decorator(True)(func)
+        assert translated(*pos, **named) == native(*pos, **named)
+        times = []
+        for target in (func, translated, native):
+            best = min(timeit.repeat(
+                lambda: target(*pos, **named),
+                number=args.number, repeat=args.repeat))
+            times.append(best / args.number * 1e6)
+        print('{0:<18} {1:>6.2f}us {2:>9.2f}us {3:>6.2f}us'.format(
+            name, *times))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Measures the memory allocated while combining parameter sources along a
+forwarding chain, where each function takes a few parameters of its own and
+forwards ``*args`` and ``**kwargs`` to the next one::
+
+    python benchmarks/source_allocations.py --depth 10 25 50
+
+``embed`` combines the signatures of the whole chain directly, while
+``signature`` resolves the outermost function by automatic discovery.
+"""
+
+import argparse
+import gc
+import linecache
+import time
+import tracemalloc
+
+from sigtools import signatures, specifiers
+
+
+def make_chain(depth, width):
+    """Returns the functions of a chain of ``depth`` functions that take
+    ``width`` parameters each, outermost first."""
+    lines = []
+    for level in range(depth):
+        params = ''.join('p{0}_{1}, '.format(level, i) for i in range(width))
+        if level == depth - 1:
+            lines.append('def c_{0}({1}):\n    pass\n'.format(
+                level, params.rstrip(', ')))
+        else:
+            lines.append(
+                'def c_{0}({1}*args, **kwargs):\n'
+                '    c_{2}(*args, **kwargs)\n'.format(level, params, level + 1))
+    source = '\n'.join(lines)
+    filename = '<sigtools-bench-chain-{0}-{1}>'.format(depth, width)
+    # lets inspect.getsource find the generated functions
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+    namespace = {}
+    exec(compile(source, filename, 'exec'), namespace)
+    return [namespace['c_{0}'.format(level)] for level in range(depth)]
+
+
+def measure(repeat, func):
+    """Returns the peak memory allocated by ``func``, in bytes, and its best
+    time, in seconds."""
+    func()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return peak, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--depth', type=int, nargs='+', default=[10, 25, 50])
+    parser.add_argument('--width', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print('{0:>5} {1:>10} {2:>10} {3:>10}'.format(
+        'depth', 'operation', 'peak (KiB)', 'time (ms)'))
+    for depth in args.depth:
+        chain = make_chain(depth, args.width)
+        sigs = [signatures.signature(func) for func in chain]
+        assert len(specifiers.signature(chain[0]).parameters) \
+            == depth * args.width
+        for label, func in [
+                ('embed', lambda: signatures.embed(*sigs)),
+                ('signature', lambda: specifiers.signature(chain[0])),
+                ]:
+            peak, best = measure(args.repeat, func)
+            print('{0:>5} {1:>10} {2:>10.1f} {3:>10.2f}'.format(
+                depth, label, peak / 1024, best * 1e3))
+
+
+if __name__ == '__main__':
+    main()
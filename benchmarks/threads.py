@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Measures how the throughput of `sigtools.signature` scales with the number
+of threads resolving signatures concurrently.
+
+On builds of Python without the GIL (``python3.13t`` and later), throughput
+should grow with the number of threads up to the number of cores. Elsewhere,
+it stays flat::
+
+    python3.13t benchmarks/threads.py --threads 1 2 4 8
+"""
+
+import argparse
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from sigtools import specifiers
+
+
+def make_module(directory, count):
+    """Writes and imports a module with ``count`` chains of functions
+    forwarding ``*args`` and ``**kwargs`` to one another."""
+    lines = []
+    for i in range(count):
+        lines.append(
+            'def inner_{0}(a{0}, b, *, c{0}=None):\n'
+            '    pass\n'
+            'def middle_{0}(m, *args, **kwargs):\n'
+            '    return inner_{0}(*args, **kwargs)\n'
+            'def outer_{0}(o, *args, **kwargs):\n'
+            '    return middle_{0}(*args, **kwargs)\n'.format(i))
+    with open(os.path.join(directory, 'sigtools_bench_threads.py'), 'w') as fh:
+        fh.write('\n'.join(lines))
+    sys.path.insert(0, directory)
+    module = importlib.import_module('sigtools_bench_threads')
+    return [getattr(module, 'outer_{0}'.format(i)) for i in range(count)]
+
+
+def run(funcs, threads, repeat):
+    barrier = threading.Barrier(threads + 1)
+
+    def work():
+        barrier.wait()
+        for _ in range(repeat):
+            for func in funcs:
+                specifiers.signature(func)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return threads * repeat * len(funcs) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=[1, 2, 4, 8])
+    parser.add_argument('--functions', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cache', action='store_true',
+                        help='enable the signature cache')
+    args = parser.parse_args(argv)
+
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    print('Python {0}, GIL {1}'.format(
+        sys.version.split()[0],
+        'enabled' if is_gil_enabled() else 'disabled'))
+    if args.cache:
+        specifiers.enable_cache(maxsize=None)
+
+    directory = tempfile.mkdtemp()
+    try:
+        funcs = make_module(directory, args.functions)
+        run(funcs, 1, 1)
+        base = None
+        print('threads  signatures/s  speedup')
+        for threads in args.threads:
+            rate = run(funcs, threads, args.repeat)
+            base = base or rate
+            print('{0:>7}  {1:>12.0f}  {2:>6.2f}x'.format(
+                threads, rate, rate / base))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -21,8 +21,9 @@
 
 
 __all__ = [
-    'signature'
+    'signature', 'warmup',
     ]
 
 
 from sigtools.specifiers import signature
+from sigtools._warmup import warmup
@@ -22,10 +22,13 @@
 import sys
 import ast
 import collections
+import dis
 import functools
+import threading
 import types
+import weakref
 
-from sigtools import _signatures, _util
+from sigtools import _signatures, _specifiers, _trace, _util
 from sigtools._specifiers import forged_signature
 
 try:
@@ -38,11 +41,18 @@ class UnknownForwards(ValueError):
     pass
 
 
+class UnusableCode(UnknownForwards):
+    """Automatic discovery can't succeed for this code, whatever the
+    arguments or the state of the function's globals."""
+
+
 class UnresolvableName(ValueError):
     pass
 
 
 class Marker(object):
+    __slots__ = ('tainted',)
+
     def __init__(self):
         self.tainted = None
 
@@ -53,6 +63,8 @@ class Marker(object):
             return Unknown(self.tainted)
 
 class Name(Marker):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         super(Name, self).__init__()
         self.name = name
@@ -62,6 +74,8 @@ class Name(Marker):
 
 
 class Attribute(Marker):
+    __slots__ = ('value', 'attr')
+
     def __init__(self, value, attr):
         super(Attribute, self).__init__()
         self.value = value
@@ -72,6 +86,8 @@ class Attribute(Marker):
 
 
 class Arg(Marker):
+    __slots__ = ('name',)
+
     def __init__(self, name):
         super(Arg, self).__init__()
         self.name = name
@@ -81,6 +97,8 @@ class Arg(Marker):
 
 
 class Unknown(object):
+    __slots__ = ('source',)
+
     def __init__(self, source=None):
         self.source = source
 
@@ -209,14 +227,23 @@ class CallListerVisitor(ast.NodeVisitor):
         self.to_revisit = []
         self.varargs = None
         self.varkwargs = None
+        self.spend = _specifiers.current_spend()
 
         self.process_parameters(func.args, main=True)
-        for stmt in func.body:
+        body = func.body
+        if isinstance(func, ast.Lambda):
+            body = [body]
+        for stmt in body:
             self.visit(stmt)
         for node, ns in self.to_revisit:
             self.namespace = ns
             self.process_Call(node)
 
+    def visit(self, node):
+        if self.spend is not None:
+            self.spend.node()
+        return ast.NodeVisitor.visit(self, node)
+
     def process_parameters(self, args, main=False):
         for arg in args.args:
             name = get_param(arg)
@@ -326,6 +353,465 @@ class CallListerVisitor(ast.NodeVisitor):
         return iter(self.calls)
 
 
+class _Ref(object):
+    """A value on the simulated stack that was loaded from a name."""
+    __slots__ = ('marker', 'namespace', 'name', 'placeholder')
+
+    def __init__(self, marker, namespace, name, placeholder):
+        self.marker = marker
+        self.namespace = namespace
+        self.name = name
+        self.placeholder = placeholder
+
+
+class _AttrRef(object):
+    __slots__ = ('value', 'attr')
+
+    def __init__(self, value, attr):
+        self.value = value
+        self.attr = attr
+
+
+class _Const(object):
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _Seq(object):
+    """A tuple or list being built for a call's positional arguments."""
+    __slots__ = ('items', 'stars')
+
+    def __init__(self, items=(), stars=()):
+        self.items = tuple(items)
+        self.stars = tuple(stars)
+
+    def extend(self, item):
+        if isinstance(item, _Seq):
+            return _Seq(self.items + item.items, self.stars + item.stars)
+        if isinstance(item, _Const) and isinstance(item.value, (tuple, list)):
+            return _Seq(self.items + (_UNKNOWN,) * len(item.value), self.stars)
+        return _Seq(self.items, self.stars + (item,))
+
+
+class _Map(object):
+    """A dict being built for a call's keyword arguments."""
+    __slots__ = ('items', 'stars')
+
+    def __init__(self, items=(), stars=()):
+        self.items = tuple(items)
+        self.stars = tuple(stars)
+
+    def update(self, item):
+        return _Map(self.items, self.stars + (item,))
+
+
+_NULL = object()
+_UNKNOWN = object()
+
+_COMPREHENSIONS = frozenset(['<listcomp>', '<setcomp>', '<dictcomp>', '<genexpr>'])
+_CO_NEWLOCALS = 0x0002
+_CO_VARARGS = 0x0004
+_CO_VARKEYWORDS = 0x0008
+
+_CALL_HAS_NULL = sys.version_info >= (3, 11)
+
+_NO_STACK = frozenset([
+    'NOP', 'RESUME', 'CACHE', 'EXTENDED_ARG', 'PRECALL', 'KW_NAMES',
+    'COPY_FREE_VARS', 'MAKE_CELL', 'SETUP_ANNOTATIONS', 'POP_BLOCK',
+    'NOT_TAKEN', 'LIST_TO_TUPLE',
+])
+_JUMPS = frozenset([
+    'JUMP_FORWARD', 'JUMP_BACKWARD', 'JUMP_ABSOLUTE', 'JUMP',
+    'JUMP_BACKWARD_NO_INTERRUPT', 'JUMP_NO_INTERRUPT',
+])
+_TERMINATORS = frozenset([
+    'RETURN_VALUE', 'RETURN_CONST', 'RAISE_VARARGS', 'RERAISE'])
+_BRANCHES = frozenset(dis.opname[op] for op in dis.hasjrel + dis.hasjabs)
+
+
+def _describe(item):
+    if isinstance(item, _Ref):
+        return item.name
+    elif isinstance(item, _AttrRef):
+        return '{0}.{1}'.format(_describe(item.value), item.attr)
+    elif isinstance(item, _Const):
+        return repr(item.value)
+    return 'expression'
+
+
+def _nonlocal_stores(code):
+    """Names of ``code``'s free variables that it, or a function nested in
+    it, assigns to or deletes."""
+    freevars = frozenset(code.co_freevars)
+    if not freevars:
+        return set()
+    ret = set()
+    for instr in dis.get_instructions(code):
+        if instr.opname in ('STORE_DEREF', 'DELETE_DEREF'):
+            if instr.argval in freevars:
+                ret.add(instr.argval)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            ret.update(_nonlocal_stores(const) & freevars)
+    return ret
+
+
+def _exception_handlers(code):
+    """Maps the offset of each exception handler in ``code`` to the depth
+    of the stack when it starts."""
+    if not getattr(code, 'co_exceptiontable', None):
+        return {}
+    entries = dis.Bytecode(code).exception_entries
+    return dict(
+        (entry.target, entry.depth + entry.lasti + 1) for entry in entries)
+
+
+class BytecodeCallLister(object):
+    """Lists the calls made by a code object, like `CallListerVisitor`
+    does for a function's syntax tree, by simulating its bytecode."""
+
+    def __init__(self, code):
+        self.code = code
+        self.namespace = Namespace()
+        self.calls = []
+        self.deferred = []
+        self.varargs = None
+        self.varkwargs = None
+        self.spend = _specifiers.current_spend()
+
+        self.process_parameters(code, main=True)
+        self.run(code)
+        for code, namespace in self.deferred:
+            self.namespace = namespace
+            self.process_parameters(code)
+            self.run(code)
+
+    has_hide_starargs = CallListerVisitor.has_hide_starargs
+
+    def process_parameters(self, code, main=False):
+        count = code.co_argcount + code.co_kwonlyargcount
+        for name in code.co_varnames[:count]:
+            self.namespace[name] = Arg(name) if main else Unknown(name)
+        varargs = varkwargs = None
+        if code.co_flags & _CO_VARARGS:
+            name = code.co_varnames[count]
+            varargs = self.namespace[name] = Arg(name)
+            self.namespace.set_immutable_value(name)
+            count += 1
+        if code.co_flags & _CO_VARKEYWORDS:
+            name = code.co_varnames[count]
+            varkwargs = self.namespace[name] = Arg(name)
+        if main:
+            self.varargs = varargs
+            self.varkwargs = varkwargs
+
+    def load(self, name):
+        namespace = self.namespace
+        marker = namespace.get(name, None)
+        if marker is None:
+            marker = Name(name)
+        placeholder = None
+        if not namespace.is_immutable_value(name):
+            placeholder = namespace[name] = Unknown(name)
+        return _Ref(marker, namespace, name, placeholder)
+
+    def store(self, name):
+        self.namespace[name] = Unknown(name)
+
+    def read_only(self, item):
+        """Undoes the invalidation of a name that was loaded only to be
+        called, starred or to have an attribute looked up."""
+        if isinstance(item, _Ref) and item.placeholder is not None:
+            if item.namespace.get(item.name) is item.placeholder:
+                item.namespace[item.name] = item.marker
+
+    def resolve(self, item, tainted=False):
+        if isinstance(item, _Ref):
+            ret = item.marker
+        elif isinstance(item, _AttrRef):
+            ret = Attribute(self.resolve(item.value, tainted), item.attr)
+        elif isinstance(item, (Marker, Unknown)):
+            ret = item
+        else:
+            ret = Unknown(_describe(item))
+        if not tainted:
+            return ret.get_untainted()
+        return ret
+
+    def resolve_star(self, stars):
+        for item in stars:
+            self.read_only(item)
+        if not stars:
+            return None
+        elif len(stars) == 1:
+            return self.resolve(stars[0])
+        else:
+            return Unknown([_describe(item) for item in stars])
+
+    def call(self, callee, args, kwargs):
+        for item in callee:
+            if item is not _NULL:
+                break
+        else:
+            item = _UNKNOWN
+        self.read_only(item)
+        wrapped = self.resolve(item, tainted=True)
+        if isinstance(wrapped, Attribute):
+            instance = wrapped
+            while isinstance(instance, Attribute):
+                instance = instance.value
+            if isinstance(instance, Arg):
+                instance.tainted = 'call to {0}'.format(_describe(item))
+        if not isinstance(args, _Seq):
+            args = _Seq().extend(args)
+        if not isinstance(kwargs, _Map):
+            kwargs = _Map(stars=(kwargs,))
+        fwdargs = [self.resolve(arg) for arg in args.items]
+        fwdkwargs = dict(
+            (name, self.resolve(value)) for name, value in kwargs.items)
+        varargs = self.resolve_star(args.stars)
+        varkwargs = self.resolve_star(kwargs.stars)
+        use_varargs, hide_args = \
+            self.has_hide_starargs(varargs, self.varargs)
+        use_varkwargs, hide_kwargs = \
+            self.has_hide_starargs(varkwargs, self.varkwargs)
+        self.calls.append(Call(
+            wrapped, fwdargs, fwdkwargs, varargs, varkwargs,
+            use_varargs, use_varkwargs, hide_args, hide_kwargs))
+
+    def make_function(self, code):
+        if (code.co_name in _COMPREHENSIONS
+                or not code.co_flags & _CO_NEWLOCALS):
+            self.run(code)
+            return
+        namespace = Namespace(self.namespace)
+        for name in _nonlocal_stores(code):
+            namespace.add_nonlocal(name)
+            namespace[name] = Unknown(name)
+        self.deferred.append((code, namespace))
+
+    def run(self, code):
+        stack = []
+        branches = {}
+        handlers = _exception_handlers(code)
+        reachable = True
+        kwnames = ()
+        spend = self.spend
+
+        def pop():
+            return stack.pop() if stack else _UNKNOWN
+
+        def popn(n):
+            if n <= 0:
+                return []
+            ret = [pop() for i in range(n)]
+            ret.reverse()
+            return ret
+
+        for instr in dis.get_instructions(code):
+            if spend is not None:
+                spend.node()
+            op = instr.opname
+            offset = instr.offset
+            arg = instr.arg
+            if offset in branches:
+                target_stack = branches.pop(offset)
+                if reachable and len(stack) == len(target_stack):
+                    stack = [
+                        a if a is b else _UNKNOWN
+                        for a, b in zip(stack, target_stack)]
+                elif reachable:
+                    stack = [_UNKNOWN] * min(len(stack), len(target_stack))
+                else:
+                    stack = target_stack
+                reachable = True
+            elif not reachable:
+                stack = [_UNKNOWN] * handlers.get(offset, 0)
+                reachable = True
+
+            if op in _NO_STACK:
+                if op == 'KW_NAMES':
+                    kwnames = code.co_consts[arg]
+            elif (op == 'CALL_INTRINSIC_1'
+                    and instr.argrepr == 'INTRINSIC_LIST_TO_TUPLE'):
+                # the LIST_TO_TUPLE of python 3.12 and later
+                pass
+            elif op in ('LOAD_FAST', 'LOAD_FAST_CHECK', 'LOAD_DEREF',
+                        'LOAD_CLASSDEREF', 'LOAD_NAME'):
+                stack.append(self.load(instr.argval))
+            elif op == 'LOAD_GLOBAL':
+                if _CALL_HAS_NULL and arg & 1:
+                    stack.append(_NULL)
+                stack.append(self.load(instr.argval))
+            elif op == 'LOAD_FAST_LOAD_FAST':
+                for name in instr.argval:
+                    stack.append(self.load(name))
+            elif op in ('LOAD_CLOSURE', 'LOAD_FAST_AND_CLEAR'):
+                stack.append(_UNKNOWN)
+            elif op == 'LOAD_CONST':
+                stack.append(_Const(instr.argval))
+            elif op == 'PUSH_NULL':
+                stack.append(_NULL)
+            elif op in ('STORE_FAST', 'STORE_DEREF', 'STORE_NAME',
+                        'STORE_GLOBAL'):
+                pop()
+                self.store(instr.argval)
+            elif op in ('DELETE_FAST', 'DELETE_DEREF', 'DELETE_NAME',
+                        'DELETE_GLOBAL'):
+                self.store(instr.argval)
+            elif op == 'STORE_FAST_STORE_FAST':
+                popn(2)
+                for name in instr.argval:
+                    self.store(name)
+            elif op == 'STORE_FAST_LOAD_FAST':
+                pop()
+                store_name, load_name = instr.argval
+                self.store(store_name)
+                stack.append(self.load(load_name))
+            elif op in ('LOAD_BUILD_CLASS', 'LOAD_ASSERTION_ERROR',
+                        'LOAD_LOCALS'):
+                stack.append(_UNKNOWN)
+            elif op in ('LOAD_ATTR', 'LOAD_METHOD'):
+                value = pop()
+                self.read_only(value)
+                attr = _AttrRef(value, instr.argval)
+                if op == 'LOAD_METHOD' or (
+                        sys.version_info >= (3, 12) and arg & 1):
+                    stack.append(_NULL)
+                stack.append(attr)
+            elif op in ('STORE_ATTR', 'DELETE_ATTR'):
+                self.read_only(pop())
+                if op == 'STORE_ATTR':
+                    pop()
+            elif op == 'LOAD_SUPER_ATTR':
+                popn(3)
+                if arg & 1:
+                    stack.append(_NULL)
+                stack.append(_AttrRef(_UNKNOWN, instr.argval))
+            elif op in ('CALL', 'CALL_KW', 'CALL_FUNCTION', 'CALL_METHOD',
+                        'CALL_FUNCTION_KW'):
+                if op in ('CALL_KW', 'CALL_FUNCTION_KW'):
+                    names = pop()
+                    kwnames = names.value if isinstance(names, _Const) else ()
+                args = popn(arg)
+                split = len(args) - len(kwnames)
+                kwargs = _Map(zip(kwnames, args[split:]))
+                args = _Seq(args[:split])
+                kwnames = ()
+                callee = popn(2 if _CALL_HAS_NULL or op == 'CALL_METHOD' else 1)
+                self.call(callee, args, kwargs)
+                stack.append(_UNKNOWN)
+            elif op == 'CALL_FUNCTION_EX':
+                kwargs = pop() if arg & 1 else _Map()
+                args = pop()
+                callee = popn(2 if _CALL_HAS_NULL else 1)
+                self.call(callee, args, kwargs)
+                stack.append(_UNKNOWN)
+            elif op in ('BUILD_LIST', 'BUILD_TUPLE'):
+                stack.append(_Seq(popn(arg)))
+            elif op in ('BUILD_TUPLE_UNPACK_WITH_CALL', 'BUILD_TUPLE_UNPACK',
+                        'BUILD_LIST_UNPACK'):
+                seq = _Seq()
+                for item in popn(arg):
+                    seq = seq.extend(item)
+                stack.append(seq)
+            elif op in ('LIST_EXTEND', 'LIST_APPEND'):
+                item = pop()
+                if len(stack) >= arg and isinstance(stack[-arg], _Seq):
+                    if op == 'LIST_APPEND':
+                        item = _Seq([item])
+                    stack[-arg] = stack[-arg].extend(item)
+            elif op == 'BUILD_MAP':
+                items = popn(2 * arg)
+                keys = items[::2]
+                if all(isinstance(k, _Const) and isinstance(k.value, str)
+                       for k in keys):
+                    stack.append(_Map(
+                        (k.value, v) for k, v in zip(keys, items[1::2])))
+                else:
+                    stack.append(_UNKNOWN)
+            elif op == 'BUILD_CONST_KEY_MAP':
+                keys = pop()
+                values = popn(arg)
+                if isinstance(keys, _Const):
+                    stack.append(_Map(zip(keys.value, values)))
+                else:
+                    stack.append(_UNKNOWN)
+            elif op in ('DICT_MERGE', 'DICT_UPDATE'):
+                item = pop()
+                if len(stack) >= arg and isinstance(stack[-arg], _Map):
+                    stack[-arg] = stack[-arg].update(item)
+            elif op in ('BUILD_MAP_UNPACK_WITH_CALL', 'BUILD_MAP_UNPACK'):
+                kwargs = _Map()
+                for item in popn(arg):
+                    if isinstance(item, _Map) and not item.stars:
+                        kwargs = _Map(kwargs.items + item.items, kwargs.stars)
+                    else:
+                        kwargs = kwargs.update(item)
+                stack.append(kwargs)
+            elif op == 'MAKE_FUNCTION':
+                items = popn(1 - dis.stack_effect(instr.opcode, arg))
+                for item in items:
+                    if (isinstance(item, _Const)
+                            and isinstance(item.value, types.CodeType)):
+                        self.make_function(item.value)
+                stack.append(_UNKNOWN)
+            elif op == 'SET_FUNCTION_ATTRIBUTE':
+                func = pop()
+                value = pop()
+                if arg & 8 and isinstance(value, _Seq):
+                    # python 3.13 loads closure cells with LOAD_FAST, but
+                    # capturing a name doesn't change it
+                    for item in value.items:
+                        self.read_only(item)
+                stack.append(func)
+            elif op in ('COPY', 'DUP_TOP'):
+                n = arg if op == 'COPY' else 1
+                stack.append(stack[-n] if len(stack) >= n else _UNKNOWN)
+            elif op == 'DUP_TOP_TWO':
+                stack.extend(stack[-2:] if len(stack) >= 2 else [_UNKNOWN] * 2)
+            elif op in ('SWAP', 'ROT_TWO', 'ROT_THREE', 'ROT_FOUR', 'ROT_N'):
+                n = {'ROT_TWO': 2, 'ROT_THREE': 3, 'ROT_FOUR': 4}.get(op, arg)
+                items = popn(n)
+                if op == 'SWAP':
+                    items[0], items[-1] = items[-1], items[0]
+                else:
+                    items.insert(0, items.pop())
+                stack.extend(items)
+            elif op in _TERMINATORS:
+                popn(dis.stack_effect(instr.opcode, arg) * -1)
+                reachable = False
+            elif op in _BRANCHES:
+                effect = dis.stack_effect(instr.opcode, arg, jump=True)
+                target = stack[:len(stack) + min(effect, 0)]
+                target.extend([_UNKNOWN] * max(effect, 0))
+                if instr.argval > offset:
+                    if instr.argval in branches:
+                        other = branches[instr.argval]
+                        target = [
+                            a if a is b else _UNKNOWN
+                            for a, b in zip(target, other)]
+                    branches[instr.argval] = target
+                if op in _JUMPS:
+                    reachable = False
+                else:
+                    effect = dis.stack_effect(instr.opcode, arg, jump=False)
+                    popn(-effect)
+                    stack.extend([_UNKNOWN] * effect)
+            else:
+                effect = dis.stack_effect(
+                    instr.opcode, arg if instr.opcode >= dis.HAVE_ARGUMENT
+                    else None)
+                pops = max(-effect, 0) + 1
+                popn(pops)
+                stack.extend([_UNKNOWN] * (pops + effect))
+
+    def __iter__(self):
+        return iter(self.calls)
+
+
 class EmptyBoundArguments(object):
     def __init__(self):
         self.arguments = {}
@@ -384,30 +870,38 @@ def forward_signatures(func, calls, args, kwargs, sig):
         try:
             wrapped_func = rn(wrapped, unknown=False)
         except UnresolvableName:
-            raise UnknownForwards
+            raise UnknownForwards(
+                'could not resolve {0!r}'.format(wrapped))
         fwdargsvals = [rn(arg) for arg in fwdargs]
         fwdargsvals.extend(rn(fwdvarargs))
         fwdkwargsvals = dict((n, rn(arg)) for n, arg in fwdkwargs.items())
         fwdkwargsvals.update(rn(fwdvarkwargs))
         using_partial = wrapped_func == functools.partial
         if using_partial:
+            if not fwdargs:
+                raise UnknownForwards(
+                    'no function passed to {0!r}'.format(wrapped))
             wrapped_func = fwdargsvals.pop(0)
-        try:
-            wrapped_sig = forged_signature(
-                wrapped_func, args=fwdargsvals, kwargs=fwdkwargsvals)
-        except (ValueError, TypeError):
-            raise UnknownForwards
-        try:
-            ausig = _signatures.forwards(
-                sig, wrapped_sig,
-                len(fwdargs) - using_partial,
-                *fwdkwargs,
-                hide_args=hide_args, hide_kwargs=hide_kwargs,
-                use_varargs=use_varargs, use_varkwargs=use_varkwargs,
-                partial=using_partial)
-            yield ausig
-        except ValueError:
-            raise UnknownForwards
+        with _trace.step('forward', wrapped_func):
+            try:
+                wrapped_sig = forged_signature(
+                    wrapped_func, args=fwdargsvals, kwargs=fwdkwargsvals)
+            except (ValueError, TypeError):
+                raise UnknownForwards(
+                    'no signature for {0}'.format(_util.qualname(wrapped_func)))
+            try:
+                ausig = _signatures.forwards(
+                    sig, wrapped_sig,
+                    len(fwdargs) - using_partial,
+                    *fwdkwargs,
+                    hide_args=hide_args, hide_kwargs=hide_kwargs,
+                    use_varargs=use_varargs, use_varkwargs=use_varkwargs,
+                    partial=using_partial)
+            except ValueError:
+                raise UnknownForwards(
+                    'incompatible signature for {0}'.format(
+                        _util.qualname(wrapped_func)))
+        yield ausig
 
 
 def autoforwards_partial(par, args, kwargs):
@@ -425,41 +919,200 @@ def any_params_star(sig):
     return False
 
 
-class cleanup_functools_wrapper(object):
-    attrs = ['__wrapped__', '__signature__']
+def own_signature(func):
+    """Returns the signature of ``func`` itself, disregarding any
+    ``__wrapped__`` or ``__signature__`` attribute set on it, without
+    modifying ``func``.
 
-    def __init__(self, func):
-        self.func = func
+    :raises UnusableCode: if ``func`` is a class with its own
+        ``__signature__``, whose signature can't be computed without it.
+    """
+    try:
+        attrs = vars(func)
+    except TypeError:
+        attrs = {}
+    if '__wrapped__' not in attrs and '__signature__' not in attrs:
+        return _signatures.signature(func)
+    if isinstance(func, types.FunctionType):
+        bare = types.FunctionType(
+            func.__code__, func.__globals__, func.__name__,
+            func.__defaults__, func.__closure__)
+        bare.__kwdefaults__ = func.__kwdefaults__
+        bare.__annotations__ = func.__annotations__
+        sig = _util.funcsigs.signature(bare)
+    elif '__signature__' not in attrs:
+        sig = _util.funcsigs.signature(func, follow_wrapped=False)
+    elif isinstance(func, type):
+        raise UnusableCode('class with its own __signature__')
+    else:
+        # what inspect.signature would look at without __signature__
+        call = _util.safe_get(type(func).__call__, func, type(func))
+        sig = _util.funcsigs.signature(call, follow_wrapped=False)
+    return _signatures.set_default_sources(sig, func)
+
+
+_unusable_code = weakref.WeakKeyDictionary()
+_unusable_code_lock = threading.Lock()
+
+
+def forget_unusable_code():
+    """Forgets which code objects automatic discovery gave up on."""
+    with _unusable_code_lock:
+        _unusable_code.clear()
+
+
+_STAR_CALL_OPS = frozenset(
+    dis.opmap[name] for name in (
+        'CALL_FUNCTION_EX',
+        'BUILD_TUPLE_UNPACK_WITH_CALL', 'BUILD_MAP_UNPACK_WITH_CALL')
+    if name in dis.opmap)
+_LOAD_LOCAL_OPS = tuple(
+    dis.opmap[name] for name in (
+        'LOAD_FAST', 'LOAD_FAST_CHECK', 'LOAD_FAST_BORROW')
+    if name in dis.opmap)
+_UNCERTAIN_OPS = frozenset(
+    dis.opmap[name] for name in (
+        'EXTENDED_ARG', 'LOAD_FAST_LOAD_FAST', 'LOAD_FAST_BORROW_LOAD_FAST_BORROW',
+        'STORE_FAST_LOAD_FAST')
+    if name in dis.opmap)
+
+
+def _nested_codes(code):
+    yield code
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            for nested in _nested_codes(const):
+                yield nested
+
+
+def _uses_local(code, index):
+    if code.co_varnames[index] in code.co_cellvars:
+        return True
+    co_code = code.co_code
+    if index > 255 or _UNCERTAIN_OPS.intersection(co_code[::2]):
+        # loading the local would need an EXTENDED_ARG, which may be missing
+        # from older bytecode
+        return True
+    # may also match an argument followed by an opcode, which only makes
+    # the check more lenient
+    return any(bytes((op, index)) in co_code for op in _LOAD_LOCAL_OPS)
+
+
+def prefilter(code):
+    """Tells, from a quick look at ``code``'s bytecode, why it cannot
+    possibly pass its ``*args`` or ``**kwargs`` on, or returns ``None`` if it
+    might."""
+    if not any(_STAR_CALL_OPS.intersection(nested.co_code[::2])
+               for nested in _nested_codes(code)):
+        return 'no call unpacks *args or **kwargs'
+    index = code.co_argcount + code.co_kwonlyargcount
+    for flag in (_CO_VARARGS, _CO_VARKEYWORDS):
+        if code.co_flags & flag:
+            if _uses_local(code, index):
+                return None
+            index += 1
+    return '*args and **kwargs are never used'
+
+
+class PrefilterStats(object):
+    """Counts how often automatic signature discovery looked at a
+    function's bytecode before fetching its source, and how often that was
+    enough to give up.
+
+    :ivar int checked: Functions whose bytecode was looked at.
+    :ivar int skipped: Functions given up on without reading their source.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets the counters back to zero."""
+        with self._lock:
+            self.checked = 0
+            self.skipped = 0
+
+    def count(self, skipped):
+        with self._lock:
+            self.checked += 1
+            if skipped:
+                self.skipped += 1
+
+    def __repr__(self):
+        return '<{0} checked={1} skipped={2}>'.format(
+            _util.qualname(type(self)), self.checked, self.skipped)
+
+
+prefilter_stats = PrefilterStats()
 
-    def __enter__(self):
-        try:
-            self.saved_attrs
-        except AttributeError:
-            pass
-        else:
-            raise NotImplementedError('This context manager is not reentrant')
-        self.saved_attrs = {}
-        for attr in self.attrs:
-            try:
-                self.saved_attrs[attr] = getattr(self.func, attr)
-                delattr(self.func, attr)
-            except AttributeError:
-                pass
 
-    def __exit__(self, *exc):
-        for attr, val in self.saved_attrs.items():
-            setattr(self.func, attr, val)
+_code_calls = weakref.WeakKeyDictionary()
+_code_calls_lock = threading.Lock()
+
+
+def forget_calls():
+    """Forgets the forwarding calls found in each code object."""
+    with _code_calls_lock:
+        _code_calls.clear()
 
 
 def autoforwards_function(func, args, kwargs):
-    with cleanup_functools_wrapper(func):
-        sig = _signatures.signature(func)
+    if type(func) is not types.FunctionType:
+        return _autoforwards_function(func, args, kwargs)
+    code = func.__code__
+    with _unusable_code_lock:
+        reason = _unusable_code.get(code)
+    if reason is not None:
+        raise UnusableCode(reason)
+    try:
+        return _autoforwards_function(func, args, kwargs)
+    except UnusableCode as exc:
+        with _unusable_code_lock:
+            _unusable_code[code] = str(exc)
+        raise
+
+
+def _autoforwards_function(func, args, kwargs):
+    sig = own_signature(func)
     if not any_params_star(sig):
-        raise UnknownForwards
+        raise UnusableCode('no *args or **kwargs parameter')
+    return merge_forwards(func, forwarding_calls(func), args, kwargs, sig)
+
+
+def forwarding_calls(func):
+    """Lists the calls in ``func`` that pass on its ``*args`` or
+    ``**kwargs``, from its source if available or else from its bytecode.
+
+    They only depend on ``func``'s code, so they are listed once per code
+    object and then reused for any arguments or closure."""
+    cacheable = type(func) is types.FunctionType
+    if cacheable:
+        with _code_calls_lock:
+            calls = _code_calls.get(func.__code__)
+        if calls is not None:
+            return calls
+    code = getattr(func, '__code__', None)
+    if isinstance(code, types.CodeType):
+        reason = prefilter(code)
+        prefilter_stats.count(reason is not None)
+        if reason is not None:
+            raise UnusableCode(reason)
     func_ast = _util.get_ast(func)
-    if func_ast is None:
-        raise UnknownForwards
-    return autoforwards_ast(func, func_ast, sig, args, kwargs)
+    if func_ast is not None:
+        with _trace.step('CallListerVisitor', func):
+            calls = CallListerVisitor(func_ast)
+    elif code is None:
+        raise UnusableCode('source code unavailable')
+    else:
+        with _trace.step('BytecodeCallLister', func):
+            calls = BytecodeCallLister(code)
+    calls = tuple(
+        call for call in calls if call.use_varargs or call.use_varkwargs)
+    if cacheable:
+        with _code_calls_lock:
+            _code_calls[func.__code__] = calls
+    return calls
 
 
 def autoforwards_hint(func, args, kwargs):
@@ -467,22 +1120,30 @@ def autoforwards_hint(func, args, kwargs):
     if h is not None:
         return autoforwards_ast(h[0], h[1], h[2], args, kwargs)
     else:
-        raise UnknownForwards()
+        raise UnknownForwards('no autoforwards hint')
 
 
 def autoforwards_ast(func, func_ast, sig, args=(), kwargs={}):
-    sigs = list(forward_signatures(
-        func, CallListerVisitor(func_ast),
-        args, kwargs, sig))
+    if func_ast is None:
+        # the source of func is unavailable, its bytecode is read instead
+        calls = forwarding_calls(func)
+    else:
+        with _trace.step('CallListerVisitor', func):
+            calls = CallListerVisitor(func_ast)
+    return merge_forwards(func, calls, args, kwargs, sig)
+
+
+def merge_forwards(func, calls, args, kwargs, sig):
+    sigs = list(forward_signatures(func, calls, args, kwargs, sig))
     if sigs:
         return _signatures.merge(*sigs)
     else:
-        raise UnknownForwards('No forwarding of *args, **kwargs found')
+        raise UnusableCode('No forwarding of *args, **kwargs found')
 
 
 def autoforwards_method(method, args, kwargs):
     if method.__self__ is None:
-        raise UnknownForwards
+        raise UnknownForwards('unbound method')
     return _signatures.mask(
         autoforwards(method.__func__, (method.__self__,) + tuple(args), kwargs),
         1)
@@ -0,0 +1,208 @@
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import collections
+import importlib
+from concurrent import futures
+
+from sigtools import _diskcache, _signatures, _specifiers, _util
+
+
+ParameterDescription = collections.namedtuple(
+    'ParameterDescription', 'name kind default annotation sources')
+ParameterDescription.__doc__ = """Describes a parameter using only strings.
+
+:ivar str name: The parameter's name.
+:ivar str kind: The name of its `~inspect.Parameter.kind`, for instance
+    ``'KEYWORD_ONLY'``.
+:ivar default: The `repr` of its default value, or `None`.
+:ivar annotation: The source of its annotation, or `None`.
+:ivar tuple sources: The qualified names of the functions it comes from.
+"""
+
+
+class SignatureDescription(collections.namedtuple(
+        'SignatureDescription',
+        'name text parameters return_annotation error payload')):
+    """Describes a signature using only strings, numbers and tuples, so that
+    it can be pickled and inspected without importing the callable it
+    belongs to.
+
+    :ivar str name: The name the callable was looked up with.
+    :ivar str text: The signature as formatted by `str`, or `None`.
+    :ivar tuple parameters: A `ParameterDescription` for each parameter.
+    :ivar return_annotation: The source of the return annotation, or `None`.
+    :ivar error: If the signature could not be computed, a string describing
+        the exception that was raised, otherwise `None`.
+    :ivar payload: The full signature, with its sources, defaults and
+        annotations referred to by name, in the encoding used to
+        :ref:`persist signatures <persistent signature cache>`.
+        `to_signature` rebuilds the signature from it. `None` if the
+        signature references objects that can't be found by name. Treat it
+        as opaque: its layout may change between versions of sigtools.
+    """
+
+    __slots__ = ()
+
+    def __str__(self):
+        if self.error is not None:
+            return '{0}: {1}'.format(self.name, self.error)
+        return self.name + self.text
+
+    def to_signature(self):
+        """Imports the callable and rebuilds its signature from this
+        description, with the same sources, defaults and annotations as if
+        it was computed in this process. Signatures that reference objects
+        that can't be found by name are computed again instead.
+
+        :raises ValueError: if the signature could not be computed.
+        """
+        if self.error is not None:
+            raise ValueError(str(self))
+        obj = lookup(self.name)
+        if self.payload is not None:
+            try:
+                return _diskcache.decode(obj, self.payload)
+            except Exception:
+                pass
+        return _specifiers.forged_signature(obj)
+
+
+def lookup(name):
+    """Finds the object designated by a dotted name, either in the
+    ``module.qualname`` or ``module:qualname`` form."""
+    module_name, sep, qualname = name.partition(':')
+    if sep:
+        return _diskcache.lookup_global(module_name, qualname)
+    parts = name.split('.')
+    for i in range(len(parts), 0, -1):
+        module_name = '.'.join(parts[:i])
+        try:
+            obj = importlib.import_module(module_name)
+        except ModuleNotFoundError as exc:
+            if i == 1 or not (module_name + '.').startswith(exc.name + '.'):
+                raise
+            continue
+        for attr in parts[i:]:
+            obj = getattr(obj, attr)
+        return obj
+
+
+def _annotation_source(upgraded):
+    if upgraded is _signatures.EmptyAnnotation:
+        return None
+    if isinstance(upgraded, _signatures._PostponedAnnotation):
+        return upgraded._raw_annotation
+    return _util.funcsigs.formatannotation(upgraded.source_value())
+
+
+def _source_name(obj):
+    module_name = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if isinstance(module_name, str) and isinstance(qualname, str):
+        return '{0}.{1}'.format(module_name, qualname)
+    return _util.qualname(obj)
+
+
+def describe_signature(name, sig, obj=None):
+    """Describes ``sig``, the signature of the object designated by
+    ``name``."""
+    params = tuple(
+        ParameterDescription(
+            param.name, param.kind.name,
+            None if param.default is param.empty else repr(param.default),
+            _annotation_source(param.upgraded_annotation),
+            tuple(_source_name(src) for src in param.sources),
+        )
+        for param in sig.parameters.values()
+    )
+    payload = None
+    if obj is not None:
+        try:
+            payload = _diskcache.encode(obj, sig)[1]
+        except _diskcache.Unpersistable:
+            pass
+    return SignatureDescription(
+        name, str(sig), params,
+        _annotation_source(sig.upgraded_return_annotation), None, payload)
+
+
+def describe(name, auto=True):
+    """Computes the signature of the object designated by ``name`` and
+    describes it. Exceptions are reported in the description's ``error``
+    attribute rather than raised."""
+    try:
+        obj = lookup(name)
+        sig = _specifiers.forged_signature(obj, auto=auto)
+        return describe_signature(name, sig, obj)
+    except Exception as exc:
+        return SignatureDescription(
+            name, None, (), None,
+            '{0}: {1}'.format(type(exc).__name__, exc), None)
+
+
+def _describe_chunk(names, auto):
+    return [describe(name, auto) for name in names]
+
+
+def _chunks(names, size):
+    for i in range(0, len(names), size):
+        yield names[i:i + size]
+
+
+def describe_many(names, *, auto=True, max_workers=None, chunksize=64,
+                  executor=None):
+    """Describes the signatures of the objects designated by ``names``,
+    spreading the work over a pool of processes.
+
+    :param names: Dotted names, in the ``module.qualname`` or
+        ``module:qualname`` form.
+    :param bool auto: Passed on to `signature`.
+    :param max_workers: How many processes to start, by default as many as
+        there are processors.
+    :param int chunksize: How many names to send to a process at once.
+    :param executor: A `concurrent.futures.Executor` to use instead of
+        starting a new pool of processes.
+    :returns: A list of `SignatureDescription`, in the same order as
+        ``names``. Objects whose signature could not be computed get a
+        description whose ``error`` attribute says why.
+
+    ::
+
+        >>> from sigtools import specifiers
+        >>> descs = specifiers.describe_many(['fnmatch.fnmatch', 'json.dumps'])
+        >>> print(descs[0])
+        fnmatch.fnmatch(name, pat)
+        >>> descs[1].parameters[1]
+        ParameterDescription(name='skipkeys', kind='KEYWORD_ONLY', default='False', annotation=None, sources=('json.dumps',))
+
+    Descriptions hold only strings, numbers and tuples, so they can be
+    pickled, stored or sent elsewhere. Call `SignatureDescription.to_signature`
+    to get the signature itself back.
+    """
+    chunks = list(_chunks(list(names), max(1, chunksize)))
+    autos = [auto] * len(chunks)
+    if executor is None:
+        with futures.ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(_describe_chunk, chunks, autos))
+    else:
+        results = list(executor.map(_describe_chunk, chunks, autos))
+    return [desc for chunk in results for desc in chunk]
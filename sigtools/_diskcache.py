@@ -0,0 +1,504 @@
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""On-disk storage for `sigtools.specifiers.SignatureCache`.
+
+Signatures are stored as plain tuples that `marshal` can write. The objects
+a signature references, its sources, defaults and annotations, are
+stored either as literals or as a path from a module-level name, so that
+they can be looked up again in a new process. Signatures that reference
+objects that can't be found again that way are not stored.
+"""
+
+import hashlib
+import importlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+
+from sigtools import _signatures, _specifiers, _util
+
+
+FORMAT = 1
+SUFFIX = '.sigs'
+
+_empty = _util.funcsigs.Parameter.empty
+_literal_types = (
+    type(None), bool, int, float, complex, str, bytes, type(Ellipsis))
+_followed_attrs = (
+    '__wrapped__', '__func__', 'func', 'wrapper', 'args', 'keywords',
+    '__defaults__', '__kwdefaults__', '__annotations__')
+_max_search = 256
+
+
+class Unpersistable(Exception):
+    """Raised when a signature references an object that can't be looked up
+    again in another process."""
+
+
+def _is_literal(value):
+    if type(value) in _literal_types:
+        return True
+    if type(value) in (tuple, frozenset):
+        return all(_is_literal(item) for item in value)
+    return False
+
+
+class _FileHashes(object):
+    """Memoizes the hashes of files, rehashing a file only when its size or
+    modification time changes."""
+
+    def __init__(self):
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = st.st_mtime_ns, st.st_size
+        with self._lock:
+            known = self._hashes.get(path)
+        if known is not None and known[0] == stamp:
+            return known[1]
+        try:
+            with open(path, 'rb') as fh:
+                digest = hashlib.blake2b(fh.read(), digest_size=16).hexdigest()
+        except OSError:
+            return None
+        with self._lock:
+            self._hashes[path] = stamp, digest
+        return digest
+
+
+file_hash = _FileHashes()
+
+
+def module_file(module_name):
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if isinstance(path, str) and os.path.isfile(path):
+        return path
+    return None
+
+
+_stamp = None
+
+
+def sigtools_stamp():
+    """Identifies the version of sigtools that computed a signature."""
+    global _stamp
+    if _stamp is None:
+        directory = os.path.dirname(os.path.abspath(__file__))
+        h = hashlib.blake2b(digest_size=16)
+        h.update(sys.implementation.cache_tag.encode())
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.py'):
+                h.update(name.encode())
+                h.update(str(file_hash(os.path.join(directory, name))).encode())
+        _stamp = h.hexdigest()
+    return _stamp
+
+
+def lookup_global(module_name, qualname):
+    if '<' in qualname:
+        raise LookupError(qualname)
+    try:
+        obj = sys.modules[module_name]
+    except KeyError:
+        obj = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _follow(obj, step):
+    kind, name = step
+    if kind == 'a':
+        value = _specifiers._static_attr(obj, name)
+        if value is None:
+            raise LookupError(name)
+        return value
+    return obj[name]
+
+
+def _neighbours(obj):
+    if isinstance(obj, tuple):
+        for i, item in enumerate(obj):
+            yield ('i', i), item
+        return
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if _is_literal(key):
+                yield ('i', key), value
+        return
+    for attr in _followed_attrs:
+        try:
+            value = _specifiers._static_attr(obj, attr)
+        except Exception:
+            continue
+        if value is not None:
+            yield ('a', attr), value
+
+
+class _Encoder(object):
+    """Turns a signature into plain tuples, recording the objects it
+    references in a table."""
+
+    def __init__(self, root=_util.UNSET):
+        self.refs = []
+        self.objs = []
+        self.indices = {}
+        self.deps = set()
+        self.keepalive = []
+        self.paths = None
+        self.root_index = None if root is _util.UNSET else self.ref(root)
+
+    def ref(self, obj):
+        key = id(obj)
+        try:
+            return self.indices[key]
+        except KeyError:
+            pass
+        spec = self._spec(obj)
+        index = len(self.refs)
+        self.refs.append(spec)
+        self.objs.append(obj)
+        self.indices[key] = index
+        if spec[0] in ('g', 'p'):
+            self._add_deps(obj)
+            self.paths = None
+        return index
+
+    def _add_deps(self, obj):
+        for module_name in (getattr(obj, '__module__', None),
+                            getattr(type(obj), '__module__', None)):
+            if isinstance(module_name, str):
+                path = module_file(module_name)
+                if path is not None:
+                    self.deps.add(path)
+        code = getattr(obj, '__code__', None)
+        filename = getattr(code, 'co_filename', None)
+        if isinstance(filename, str) and os.path.isfile(filename):
+            self.deps.add(filename)
+
+    def _spec(self, obj):
+        if obj is _empty:
+            return ('e',)
+        if _is_literal(obj):
+            return ('l', obj)
+        module_name = getattr(obj, '__module__', None)
+        qualname = getattr(obj, '__qualname__', None)
+        if isinstance(module_name, str) and isinstance(qualname, str):
+            try:
+                found = lookup_global(module_name, qualname)
+            except Exception:
+                found = None
+            if found is obj:
+                return ('g', module_name, qualname)
+        path = self._search(obj)
+        if path is None:
+            raise Unpersistable(obj)
+        return path
+
+    def _search(self, target):
+        if self.paths is None:
+            self.paths = {}
+            queue = [
+                (self.objs[i], ('p', i, ()))
+                for i, spec in enumerate(self.refs)
+                if spec[0] in ('g', 'p')]
+            for obj, path in queue:
+                self.paths.setdefault(id(obj), path)
+            while queue and len(self.paths) < _max_search:
+                obj, (_, base, steps) = queue.pop(0)
+                if len(steps) >= 4:
+                    continue
+                for step, value in _neighbours(obj):
+                    if id(value) not in self.paths:
+                        path = 'p', base, steps + (step,)
+                        self.paths[id(value)] = path
+                        self.keepalive.append(value)
+                        queue.append((value, path))
+        return self.paths.get(id(target))
+
+    def annotation(self, upgraded):
+        if upgraded is _signatures.EmptyAnnotation:
+            return ('E',)
+        if type(upgraded) is _signatures._PostponedAnnotation:
+            return ('P', self.ref(upgraded._raw_annotation),
+                    self.ref(upgraded._function))
+        if type(upgraded) is _signatures._PreEvaluatedAnnotation:
+            return ('V', self.ref(upgraded._annotation))
+        raise Unpersistable(upgraded)
+
+    def sources(self, sources):
+        return tuple(
+            (key, tuple(
+                (self.ref(func), depth) for func, depth in value.items()
+            ) if key == '+depths' else tuple(self.ref(func) for func in value))
+            for key, value in sources.items()
+        )
+
+    def parameter(self, param):
+        return (
+            param.name, int(param.kind),
+            self.ref(param.default), self.ref(param.annotation),
+            self.annotation(param.upgraded_annotation),
+            self.ref(param._function),
+            tuple(self.ref(func) for func in param.sources),
+            tuple((self.ref(func), depth)
+                  for func, depth in param.source_depths.items()),
+        )
+
+
+def encode(obj, sig):
+    """Returns ``(dependencies, payload)`` describing ``sig``, the signature
+    of ``obj``.
+
+    :raises Unpersistable: if ``sig`` can't be described.
+    """
+    if type(sig) is not _signatures.UpgradedSignature:
+        raise Unpersistable(sig)
+    enc = _Encoder(obj)
+    if enc.refs[enc.root_index][0] != 'g':
+        raise Unpersistable(obj)
+    params = tuple(enc.parameter(param) for param in sig.parameters.values())
+    ret = (
+        enc.ref(sig.return_annotation),
+        enc.annotation(sig.upgraded_return_annotation))
+    sources = enc.sources(sig.sources)
+    payload = tuple(enc.refs), params, ret, sources
+    deps = []
+    for path in sorted(enc.deps):
+        digest = file_hash(path)
+        if digest is None:
+            raise Unpersistable(path)
+        deps.append((path, digest))
+    return tuple(deps), payload
+
+
+class _Decoder(object):
+    def __init__(self, refs):
+        self.objs = []
+        for spec in refs:
+            self.objs.append(self._relink(spec))
+
+    def _relink(self, spec):
+        kind = spec[0]
+        if kind == 'e':
+            return _empty
+        if kind == 'l':
+            return spec[1]
+        if kind == 'g':
+            return lookup_global(spec[1], spec[2])
+        obj = self.objs[spec[1]]
+        for step in spec[2]:
+            obj = _follow(obj, step)
+        return obj
+
+    def annotation(self, spec):
+        kind = spec[0]
+        if kind == 'E':
+            return _signatures.EmptyAnnotation
+        if kind == 'P':
+            return _signatures._PostponedAnnotation(
+                self.objs[spec[1]], self.objs[spec[2]])
+        return _signatures._PreEvaluatedAnnotation(self.objs[spec[1]])
+
+    def sources(self, spec):
+        objs = self.objs
+        ret = {}
+        for key, value in spec:
+            if key == '+depths':
+                ret[key] = dict((objs[i], depth) for i, depth in value)
+            else:
+                ret[key] = [objs[i] for i in value]
+        return ret
+
+    def parameter(self, spec):
+        (name, kind, default, annotation, upgraded, function,
+         sources, depths) = spec
+        objs = self.objs
+        return _signatures.UpgradedParameter(
+            name, _util.funcsigs._ParameterKind(kind),
+            default=objs[default], annotation=objs[annotation],
+            upgraded_annotation=self.annotation(upgraded),
+            function=objs[function],
+            sources=[objs[i] for i in sources],
+            source_depths=dict((objs[i], depth) for i, depth in depths),
+        )
+
+
+def decode(obj, payload):
+    """Rebuilds the signature of ``obj`` from the payload returned by
+    `encode`.
+
+    :raises Exception: if an object it references can no longer be found.
+    """
+    refs, params, ret, sources = payload
+    dec = _Decoder(refs)
+    if dec.objs[0] is not obj:
+        raise LookupError(obj)
+    return _signatures.UpgradedSignature(
+        [dec.parameter(param) for param in params],
+        return_annotation=dec.objs[ret[0]],
+        upgraded_return_annotation=dec.annotation(ret[1]),
+        sources=dec.sources(sources),
+        __validate_parameters__=False,
+    )
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as fh:
+            data = fh.read()
+        fmt, stamp, entries = marshal.loads(data)
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if fmt != FORMAT or stamp != sigtools_stamp() or type(entries) is not dict:
+        return {}
+    return entries
+
+
+class DiskStore(object):
+    """Stores signatures in ``directory``, in one file per source file of
+    the introspected objects.
+
+    Each file is named after the hash of the source file's contents. In it,
+    signatures are keyed on the module and qualified name of the object,
+    and on the ``auto`` flag. Along with each signature are the hashes of
+    the source files of every object it references, so that it is ignored
+    once any of them changes.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._files = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _where(self, obj, auto):
+        module_name = getattr(obj, '__module__', None)
+        qualname = getattr(obj, '__qualname__', None)
+        if not isinstance(module_name, str) or not isinstance(qualname, str):
+            return None
+        path = module_file(module_name)
+        if path is None:
+            return None
+        digest = file_hash(path)
+        if digest is None:
+            return None
+        return digest, (module_name, qualname, bool(auto))
+
+    def _path(self, digest):
+        return os.path.join(self.directory, digest + SUFFIX)
+
+    def _entries(self, digest):
+        with self._lock:
+            try:
+                return self._files[digest]
+            except KeyError:
+                pass
+        entries = _read(self._path(digest))
+        with self._lock:
+            return self._files.setdefault(digest, entries)
+
+    def load(self, obj, auto):
+        """Returns the stored signature of ``obj``, or `None`."""
+        where = self._where(obj, auto)
+        if where is None:
+            return None
+        digest, key = where
+        entry = self._entries(digest).get(key)
+        if entry is None:
+            return None
+        deps, payload = entry
+        for path, expected in deps:
+            if file_hash(path) != expected:
+                return None
+        try:
+            return decode(obj, payload)
+        except Exception:
+            return None
+
+    def save(self, obj, auto, sig):
+        """Records ``sig`` as the signature of ``obj``, to be written by
+        `flush`. Returns whether ``sig`` could be recorded."""
+        where = self._where(obj, auto)
+        if where is None:
+            return False
+        digest, key = where
+        try:
+            entry = encode(obj, sig)
+        except Unpersistable:
+            return False
+        entries = self._entries(digest)
+        with self._lock:
+            if entries.get(key) != entry:
+                entries[key] = entry
+                self._dirty.add(digest)
+        return True
+
+    def flush(self):
+        """Writes the signatures recorded since the last flush."""
+        with self._lock:
+            dirty = [(digest, dict(self._files[digest]))
+                     for digest in self._dirty]
+            self._dirty.clear()
+        if not dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for digest, entries in dirty:
+            path = self._path(digest)
+            merged = _read(path)
+            merged.update(entries)
+            data = marshal.dumps((FORMAT, sigtools_stamp(), merged))
+            fd, tmp = tempfile.mkstemp(
+                dir=self.directory, prefix='.' + digest, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    fh.write(data)
+                os.replace(tmp, path)
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Forgets every stored signature, removing the files it wrote."""
+        with self._lock:
+            self._files.clear()
+            self._dirty.clear()
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(SUFFIX):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
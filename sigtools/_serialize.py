@@ -0,0 +1,348 @@
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""A compact encoding of `sigtools.signatures.UpgradedSignature` as bytes.
+
+The encoding uses the tables of `sigtools._diskcache`: each object the
+signature references is stored once, either as a literal, by module and
+qualified name, or as a path from an object stored by name. Objects that
+can't be stored that way are replaced by a placeholder with the same
+`repr`. Postponed annotations of functions that can't be stored are stored
+evaluated, or as their text if they can't be evaluated. Decoding looks up
+the sources of the signature and its parameters only when they are first
+accessed.
+"""
+
+import marshal
+
+from sigtools import _diskcache, _signatures, _util
+
+
+MAGIC = 'sigtools.signature'
+VERSION = 1
+
+_UNRESOLVED = object()
+_KINDS = frozenset(int(kind) for kind in _util.funcsigs._ParameterKind)
+
+
+class _Placeholder(object):
+    """Stands in for an object that couldn't be encoded, with the same
+    `repr`."""
+
+    __slots__ = ('_text',)
+
+    def __init__(self, text):
+        self._text = text
+
+    def __repr__(self):
+        return self._text
+
+
+class _Encoder(_diskcache._Encoder):
+    def _add_deps(self, obj):
+        pass
+
+    def seed(self, funcs):
+        """Records the objects found under the names of ``funcs``, so that
+        functions and defaults hidden by decorators can be found from
+        them."""
+        for func in funcs:
+            module_name = getattr(func, '__module__', None)
+            qualname = getattr(func, '__qualname__', None)
+            if not isinstance(module_name, str) \
+                    or not isinstance(qualname, str):
+                continue
+            try:
+                found = _diskcache.lookup_global(module_name, qualname)
+            except Exception:
+                continue
+            self.ref(found)
+
+    def _spec(self, obj):
+        try:
+            return super()._spec(obj)
+        except _diskcache.Unpersistable:
+            pass
+        return ('r', repr(obj))
+
+    def annotation(self, upgraded):
+        if type(upgraded) is _signatures._PostponedAnnotation:
+            function = self.ref(upgraded._function)
+            if self.refs[function][0] == 'r':
+                # a placeholder has no globals to evaluate the annotation in
+                try:
+                    value = upgraded.source_value()
+                except Exception:
+                    value = upgraded._raw_annotation
+                return ('V', self.ref(value))
+        return super().annotation(upgraded)
+
+
+def dumps(sig):
+    """Encodes ``sig`` as bytes.
+
+    :raises ValueError: if one of its annotations is of an unknown kind.
+    """
+    enc = _Encoder()
+    enc.seed(sig.sources._depths)
+    try:
+        params = tuple(
+            enc.parameter(param) for param in sig.parameters.values())
+        ret = (
+            enc.ref(sig.return_annotation),
+            enc.annotation(sig.upgraded_return_annotation))
+    except _diskcache.Unpersistable as exc:
+        raise ValueError('Cannot encode {0!r}'.format(exc.args[0]))
+    sources = enc.sources(sig.sources)
+    return marshal.dumps(
+        (MAGIC, VERSION, tuple(enc.refs), params, ret, sources))
+
+
+class _Links(object):
+    """The objects referenced by an encoded signature, each looked up when
+    first needed."""
+
+    def __init__(self, refs):
+        self.refs = refs
+        self.objs = [_UNRESOLVED] * len(refs)
+
+    def __getitem__(self, index):
+        obj = self.objs[index]
+        if obj is _UNRESOLVED:
+            obj = self.objs[index] = self._relink(self.refs[index])
+        return obj
+
+    def _relink(self, spec):
+        kind = spec[0]
+        if kind == 'e':
+            return _util.funcsigs.Parameter.empty
+        if kind == 'l':
+            return spec[1]
+        if kind == 'g':
+            return _diskcache.lookup_global(spec[1], spec[2])
+        if kind == 'r':
+            return _Placeholder(spec[1])
+        obj = self[spec[1]]
+        for step in spec[2]:
+            obj = _diskcache._follow(obj, step)
+        return obj
+
+    def annotation(self, spec):
+        kind = spec[0]
+        if kind == 'E':
+            return _signatures.EmptyAnnotation
+        if kind == 'P':
+            return _signatures._PostponedAnnotation(self[spec[1]], self[spec[2]])
+        return _signatures._PreEvaluatedAnnotation(self[spec[1]])
+
+
+class _LinkedParameter(_signatures.UpgradedParameter):
+    """A decoded parameter, which looks up its sources and upgraded
+    annotation when they are first accessed."""
+
+    __slots__ = ('_links', '_link_spec')
+
+    def __getattr__(self, name):
+        if name not in ('upgraded_annotation', '_function',
+                        'sources', 'source_depths'):
+            raise AttributeError(name)
+        links = self._links
+        upgraded, function, sources, depths = self._link_spec
+        self.upgraded_annotation = links.annotation(upgraded)
+        self._function = links[function]
+        self.sources = [links[i] for i in sources]
+        self.source_depths = dict((links[i], depth) for i, depth in depths)
+        return getattr(self, name)
+
+
+class _LinkedSourceMap(_signatures.SourceMap):
+    """A decoded `SourceMap`, which looks up its functions when first
+    accessed."""
+
+    __slots__ = ('_links', '_link_spec')
+
+    def __getattr__(self, name):
+        if name not in ('_params', '_depths'):
+            raise AttributeError(name)
+        links = self._links
+        params = {}
+        depths = {}
+        for key, value in self._link_spec:
+            if key == '+depths':
+                depths = dict((links[i], depth) for i, depth in value)
+            else:
+                params[key] = tuple(links[i] for i in value)
+        self._params = params
+        self._depths = depths
+        return getattr(self, name)
+
+
+def _is_index(value, refs):
+    return type(value) is int and 0 <= value < len(refs)
+
+
+def _is_tuple(value, length=None):
+    return type(value) is tuple and (length is None or len(value) == length)
+
+
+def _valid_ref(spec, index):
+    if not _is_tuple(spec) or not spec:
+        return False
+    kind = spec[0]
+    if kind == 'e':
+        return len(spec) == 1
+    if kind == 'l':
+        return len(spec) == 2
+    if kind == 'g':
+        return (len(spec) == 3 and type(spec[1]) is str
+                and type(spec[2]) is str)
+    if kind == 'r':
+        return len(spec) == 2 and type(spec[1]) is str
+    if kind == 'p':
+        # paths only start from objects found before them, so they can't
+        # loop
+        return (len(spec) == 3 and type(spec[1]) is int
+                and 0 <= spec[1] < index and _is_tuple(spec[2])
+                and all(_is_tuple(step, 2) and (
+                            step[0] == 'i'
+                            or step[0] == 'a' and type(step[1]) is str)
+                        for step in spec[2]))
+    return False
+
+
+def _valid_annotation(spec, refs):
+    if not _is_tuple(spec) or not spec:
+        return False
+    kind = spec[0]
+    if kind == 'E':
+        return len(spec) == 1
+    if kind == 'P':
+        return (len(spec) == 3 and _is_index(spec[1], refs)
+                and _is_index(spec[2], refs))
+    if kind == 'V':
+        return len(spec) == 2 and _is_index(spec[1], refs)
+    return False
+
+
+def _valid_funcs(spec, refs):
+    return _is_tuple(spec) and all(_is_index(i, refs) for i in spec)
+
+
+def _valid_depths(spec, refs):
+    return _is_tuple(spec) and all(
+        _is_tuple(item, 2) and _is_index(item[0], refs)
+        and type(item[1]) is int
+        for item in spec)
+
+
+def _valid_parameter(spec, refs):
+    if not _is_tuple(spec, 8):
+        return False
+    (name, kind, default, annotation, upgraded, function,
+     sources, depths) = spec
+    return (
+        type(name) is str and type(kind) is int
+        and kind in _KINDS
+        and _is_index(default, refs) and _is_index(annotation, refs)
+        and _valid_annotation(upgraded, refs)
+        and _is_index(function, refs)
+        and _valid_funcs(sources, refs) and _valid_depths(depths, refs))
+
+
+def _check(refs, params, ret, sources):
+    """Raises `ValueError` unless the records of an encoded signature are
+    shaped as `dumps` writes them, with every index within ``refs``."""
+    valid = (
+        _is_tuple(refs)
+        and all(_valid_ref(spec, i) for i, spec in enumerate(refs))
+        and _is_tuple(params)
+        and all(_valid_parameter(spec, refs) for spec in params)
+        and len(set(spec[0] for spec in params)) == len(params)
+        and _is_tuple(ret, 2) and _is_index(ret[0], refs)
+        and _valid_annotation(ret[1], refs)
+        and _is_tuple(sources)
+        and all(
+            _is_tuple(item, 2) and type(item[0]) is str
+            and (_valid_depths(item[1], refs) if item[0] == '+depths'
+                 else _valid_funcs(item[1], refs))
+            for item in sources))
+    if not valid:
+        raise ValueError('Malformed signature encoding')
+
+
+def _parameter(links, spec):
+    (name, kind, default, annotation, upgraded, function,
+     sources, depths) = spec
+    param = _LinkedParameter.__new__(_LinkedParameter)
+    param._name = name
+    param._kind = _util.funcsigs._ParameterKind(kind)
+    param._default = links[default]
+    param._annotation = links[annotation]
+    param._fingerprint = None
+    param._structure = None
+    param._links = links
+    param._link_spec = upgraded, function, sources, depths
+    return param
+
+
+def loads(data):
+    """Rebuilds a signature from the bytes returned by `dumps`.
+
+    ``data`` must come from a trusted source: decoding it imports the
+    modules it names and reads attributes of the objects found in them.
+
+    :raises ValueError: if ``data`` wasn't returned by `dumps`, or by a
+        version of it that encoded signatures differently, if its records
+        are malformed, or if an object it references, other than the
+        sources of the signature and the functions its annotations are
+        evaluated in, can't be found. Those are looked up when first
+        accessed, which raises `ImportError`, `AttributeError` or
+        `LookupError` if they can't be found.
+    """
+    try:
+        magic, version, refs, params, ret, sources = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        raise ValueError('Not an encoded signature')
+    if magic != MAGIC:
+        raise ValueError('Not an encoded signature')
+    if version != VERSION:
+        raise ValueError(
+            'Unsupported signature encoding version {0}'.format(version))
+    _check(refs, params, ret, sources)
+    links = _Links(refs)
+    try:
+        sig = _signatures.UpgradedSignature(
+            [_parameter(links, param) for param in params],
+            return_annotation=links[ret[0]],
+            upgraded_return_annotation=links.annotation(ret[1]),
+            __validate_parameters__=False,
+        )
+    except (ImportError, AttributeError, LookupError, TypeError) as exc:
+        raise ValueError(
+            'Cannot find an object the signature references: {0}'
+            .format(exc)) from exc
+    src = _LinkedSourceMap.__new__(_LinkedSourceMap)
+    src._own_params = src._own_depths = True
+    src._entries = None
+    src._links = links
+    src._link_spec = sources
+    sig._sources = src
+    return sig
@@ -22,17 +22,27 @@
 import __future__
 import abc
 import sys
+import threading
 import types
 from itertools import zip_longest
 import itertools
 import collections
+import functools
 from functools import partial
 import typing
 import warnings
 
 import attr
 
-from sigtools import _util
+from sigtools import _trace, _util
+
+
+_POSITIONAL_ONLY = _util.funcsigs.Parameter.POSITIONAL_ONLY
+_POSITIONAL_OR_KEYWORD = _util.funcsigs.Parameter.POSITIONAL_OR_KEYWORD
+_VAR_POSITIONAL = _util.funcsigs.Parameter.VAR_POSITIONAL
+_KEYWORD_ONLY = _util.funcsigs.Parameter.KEYWORD_ONLY
+_VAR_KEYWORD = _util.funcsigs.Parameter.VAR_KEYWORD
+_empty = _util.funcsigs.Parameter.empty
 
 
 class UpgradedAnnotation(metaclass=abc.ABCMeta):
@@ -78,6 +88,37 @@ class UpgradedAnnotation(metaclass=abc.ABCMeta):
             return EmptyAnnotation
         return _PreEvaluatedAnnotation(value)
 
+    @staticmethod
+    def source_values(annotations) -> list:
+        """Returns the `source_value` of each of ``annotations``.
+
+        Postponed annotations from functions that share their globals are
+        evaluated together, in a single expression."""
+        annotations = list(annotations)
+        ret = [None] * len(annotations)
+        groups = {}
+        for i, annotation in enumerate(annotations):
+            if type(annotation) is _PostponedAnnotation:
+                value = annotation._memoized()
+                if value is not _UNEVALUATED:
+                    ret[i] = value
+                    continue
+                group = groups.setdefault(
+                    id(annotation._function.__globals__), ([], []))
+                group[0].append(i)
+                group[1].append(annotation)
+            else:
+                ret[i] = annotation.source_value()
+        for indices, pending in groups.values():
+            values = _evaluate_together(pending)
+            for i, value in zip(indices, values):
+                ret[i] = value
+        return ret
+
+    def refresh(self):
+        """Forgets the value `source_value` remembered, if any, so that the
+        annotation is evaluated again."""
+
     def __eq__(self, other):
         if isinstance(other, UpgradedAnnotation):
             return self.source_value() == other.source_value()
@@ -101,15 +142,97 @@ def _is_co_flag_enabled(obj):
         return has_flag
 
 
+_UNEVALUATED = object()
+
+
+@functools.lru_cache(maxsize=4096)
+def _compile_annotation(raw_annotation):
+    return compile(raw_annotation, '<string>', 'eval')
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_annotations(raw_annotations):
+    # each annotation on its own lines, so that none can swallow the others
+    return compile(
+        '(\n{0},\n)'.format(',\n'.join(
+            '(\n{0}\n)'.format(raw) for raw in raw_annotations)),
+        '<string>', 'eval')
+
+
+def _globals_snapshot(names, namespace):
+    return tuple([namespace.get(name, _UNEVALUATED) for name in names])
+
+
+def _evaluate_together(annotations):
+    """Evaluates postponed ``annotations`` that share their globals."""
+    if len(annotations) == 1:
+        return [annotations[0].source_value()]
+    raw = tuple(annotation._raw_annotation for annotation in annotations)
+    namespace = annotations[0]._function.__globals__
+    try:
+        if not all(isinstance(r, str) for r in raw):
+            raise TypeError
+        code = _compile_annotations(raw)
+        values = eval(code, namespace, {})
+    except Exception:
+        # evaluate them one by one to raise the same error as source_value
+        return [annotation.source_value() for annotation in annotations]
+    if len(values) != len(annotations):
+        return [annotation.source_value() for annotation in annotations]
+    memo = code.co_names, _globals_snapshot(code.co_names, namespace)
+    for annotation, value in zip(annotations, values):
+        annotation._memo = memo + (value,)
+    return values
+
+
 @attr.define(eq=False)
 class _PostponedAnnotation(UpgradedAnnotation):
-    """An annotation whose evaluation was postponed per :PEP:`563`"""
+    """An annotation whose evaluation was postponed per :PEP:`563`
+
+    The value is remembered along with the globals it was computed from,
+    and computed again once one of them is rebound.
+    """
 
     _raw_annotation: typing.Any
     _function: types.FunctionType
+    _memo: typing.Any = attr.field(default=None, init=False, repr=False)
 
     def source_value(self):
-        return eval(self._raw_annotation, self._function.__globals__, {})
+        value = self._memoized()
+        if value is not _UNEVALUATED:
+            return value
+        raw = self._raw_annotation
+        namespace = self._function.__globals__
+        if not isinstance(raw, str):
+            return eval(raw, namespace, {})
+        code = _compile_annotation(raw)
+        value = eval(code, namespace, {})
+        self._memo = (
+            code.co_names, _globals_snapshot(code.co_names, namespace), value)
+        return value
+
+    def _memoized(self):
+        memo = self._memo
+        if memo is None:
+            return _UNEVALUATED
+        names, snapshot, value = memo
+        namespace = self._function.__globals__
+        for name, before in zip(names, snapshot):
+            if namespace.get(name, _UNEVALUATED) is not before:
+                return _UNEVALUATED
+        return value
+
+    def refresh(self):
+        self._memo = None
+
+    def __eq__(self, other):
+        if (type(other) is _PostponedAnnotation
+                and self._function.__globals__
+                    is other._function.__globals__
+                and self._raw_annotation == other._raw_annotation):
+            # evaluated in the same namespace, they can only be equal
+            return True
+        return super().__eq__(other)
 
 
 @attr.define(eq=False)
@@ -133,21 +256,342 @@ class _EmptyAnnotation(UpgradedAnnotation):
 EmptyAnnotation: UpgradedAnnotation = _EmptyAnnotation()
 
 
+def _writing_back(method):
+    @functools.wraps(method)
+    def _write(self, *args, **kwargs):
+        ret = method(self, *args, **kwargs)
+        self._write_back()
+        return ret
+    return _write
+
+
+class _SourceList(list):
+    """The functions a parameter comes from, as looked up in a `SourceMap`.
+    Modifying it in place writes the new functions back to the map."""
+
+    __slots__ = ('_map', '_name', '_funcs')
+
+    def __init__(self, funcs, source_map, name):
+        super().__init__(funcs)
+        self._map = source_map
+        self._name = name
+        self._funcs = funcs
+
+    def _write_back(self):
+        funcs = self._funcs = tuple(self)
+        self._map._writable_params()[self._name] = funcs
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+class _SourceDepths(dict):
+    """The depths of the functions of a `SourceMap`, as looked up in it.
+    Modifying it in place writes the new depths back to the map."""
+
+    __slots__ = ('_map', '_depths')
+
+    def __init__(self, depths, source_map):
+        super().__init__(depths)
+        self._map = source_map
+        self._depths = depths
+
+    def _write_back(self):
+        # the map's dict may be shared with other maps or parameters
+        self._map._depths = self._depths = dict(self)
+        self._map._own_depths = True
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+for _name in (
+        'append', 'extend', 'insert', 'remove', 'pop', 'clear', 'sort',
+        'reverse', '__setitem__', '__delitem__', '__iadd__', '__imul__'):
+    setattr(_SourceList, _name, _writing_back(getattr(list, _name)))
+for _name in (
+        'update', 'setdefault', 'pop', 'popitem', 'clear',
+        '__setitem__', '__delitem__', '__ior__'):
+    if hasattr(dict, _name):
+        setattr(_SourceDepths, _name, _writing_back(getattr(dict, _name)))
+del _name
+
+
+class SourceMap(collections.abc.MutableMapping):
+    """Sources of a signature's parameters, as found on
+    `UpgradedSignature.sources`.
+
+    Maps each parameter name to the list of functions it comes from, and
+    ``'+depths'`` to a dict of how deep each of these functions was found,
+    like the plain ``dict`` used before it, which it compares equal to.
+
+    The functions are kept in tuples that are shared between the maps
+    derived from one another, and `copy` shares the whole structure until
+    either the copy or the original is modified. The lists and dicts
+    returned by lookups can be modified in place: they write their new
+    contents back to the map they were looked up in, and to no other.
+    """
+
+    __slots__ = ('_params', '_depths', '_own_params', '_own_depths',
+                 '_entries')
+
+    def __init__(self, sources=()):
+        self._params = {}
+        self._depths = {}
+        self._own_params = self._own_depths = True
+        self._entries = None
+        if isinstance(sources, SourceMap):
+            self._params = sources._params
+            self._depths = sources._depths
+            self._own_params = self._own_depths = False
+            sources._own_params = sources._own_depths = False
+        elif sources:
+            self.update(sources)
+
+    @classmethod
+    def _of(cls, params, depths, own_depths=True):
+        ret = cls.__new__(cls)
+        ret._params = params
+        ret._depths = depths
+        ret._own_params = True
+        ret._own_depths = own_depths
+        ret._entries = None
+        return ret
+
+    def __getitem__(self, name):
+        # the same list or dict is returned until the map is modified
+        # otherwise, like the values of a dict would be
+        entries = self._entries
+        if entries is None:
+            entries = self._entries = {}
+        entry = entries.get(name)
+        if name == '+depths':
+            depths = self._depths
+            if entry is None or entry._depths is not depths:
+                entry = entries[name] = _SourceDepths(depths, self)
+        else:
+            funcs = self._params[name]
+            if entry is None or entry._funcs is not funcs:
+                entry = entries[name] = _SourceList(funcs, self, name)
+        return entry
+
+    def __setitem__(self, name, value):
+        if name == '+depths':
+            self._depths = dict(value)
+            self._own_depths = True
+        else:
+            self._writable_params()[name] = tuple(value)
+
+    def __delitem__(self, name):
+        if name == '+depths':
+            self._depths = {}
+            self._own_depths = True
+        else:
+            del self._writable_params()[name]
+
+    def __contains__(self, name):
+        return name == '+depths' or name in self._params
+
+    def __iter__(self):
+        for name in self._params:
+            yield name
+        yield '+depths'
+
+    def __len__(self):
+        return len(self._params) + 1
+
+    def __repr__(self):
+        return '{0}({1!r})'.format(type(self).__name__, dict(self.items()))
+
+    def copy(self):
+        """Returns a map with the same sources, sharing this one's contents
+        until either is modified."""
+        return type(self)(self)
+
+    def funcs(self, name):
+        """Returns the functions ``name`` comes from, as a tuple."""
+        return self._params.get(name, ())
+
+    def _writable_params(self):
+        if not self._own_params:
+            self._params = dict(self._params)
+            self._own_params = True
+        return self._params
+
+    def _writable_depths(self):
+        if not self._own_depths:
+            self._depths = dict(self._depths)
+            self._own_depths = True
+        elif self._entries:
+            # about to be modified in place
+            self._entries.pop('+depths', None)
+        return self._depths
+
+    def _add(self, name, *sources):
+        """Appends the functions ``name`` comes from in each of ``sources``,
+        creating its entry even if there are none."""
+        params = self._writable_params()
+        funcs = params.get(name, ())
+        for src in sources:
+            more = src._params.get(name)
+            if more:
+                funcs = funcs + more if funcs else more
+        params[name] = funcs
+
+    def _discard(self, name):
+        if name in self._params:
+            del self._writable_params()[name]
+
+    def _param_depths(self, funcs):
+        # the view reads the depths dict, so it must not be modified anymore
+        self._own_depths = False
+        return _ParamDepths(funcs, self._depths)
+
+
+class _ParamDepths(collections.abc.MutableMapping):
+    """How deep each source of a parameter was found, looked up in the
+    depths of its signature's `SourceMap` rather than copied from them,
+    until it is first modified."""
+
+    __slots__ = ('_funcs', '_depths')
+
+    def __init__(self, funcs, depths):
+        self._funcs = funcs
+        self._depths = depths
+
+    def __getitem__(self, func):
+        if self._funcs is None or func in self._funcs:
+            return self._depths[func]
+        raise KeyError(func)
+
+    def __iter__(self):
+        funcs = self._funcs
+        if funcs is None:
+            return iter(self._depths)
+        return self._iter_funcs(funcs, self._depths)
+
+    @staticmethod
+    def _iter_funcs(funcs, depths):
+        for i, func in enumerate(funcs):
+            if func in depths and func not in funcs[:i]:
+                yield func
+
+    def __len__(self):
+        funcs = self._funcs
+        if funcs is None:
+            return len(self._depths)
+        return sum(1 for func in self._iter_funcs(funcs, self._depths))
+
+    def _writable(self):
+        if self._funcs is not None:
+            # the signature's depths are shared, copy ours out of them
+            self._depths = dict(self.items())
+            self._funcs = None
+        return self._depths
+
+    def __setitem__(self, func, depth):
+        self._writable()[func] = depth
+
+    def __delitem__(self, func):
+        del self._writable()[func]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+
+def _source_map(sources):
+    if type(sources) is SourceMap:
+        return sources
+    return SourceMap(sources)
+
+
+def _binder_source(shape):
+    """Returns the source of ``make_binder(fallback)``, which creates a
+    function binding arguments to parameters of the given ``shape``, a tuple
+    of ``(name, kind, has_default)``.
+
+    The generated function only handles calls that bind successfully, and
+    returns ``fallback(args, kwargs)`` for everything else."""
+    fail = 'return fallback(args, kwargs)'
+    positional = sum(
+        kind in (_POSITIONAL_ONLY, _POSITIONAL_OR_KEYWORD)
+        for name, kind, has_default in shape)
+    has_varargs = any(kind == _VAR_POSITIONAL for name, kind, _ in shape)
+    varkwargs = next(
+        (name for name, kind, _ in shape if kind == _VAR_KEYWORD), None)
+    # without **kwargs, named arguments are counted instead of copied
+    kwargs = 'rest' if varkwargs is not None else 'kwargs'
+    body = ['n = len(args)', 'ret = {}']
+    if not has_varargs:
+        body += ['if n > {0}:'.format(positional), '    ' + fail]
+    if varkwargs is not None:
+        body.append('rest = dict(kwargs)')
+    else:
+        body.append('named = 0')
+    i = 0
+    for name, kind, has_default in shape:
+        key = repr(name)
+        if kind in (_POSITIONAL_ONLY, _POSITIONAL_OR_KEYWORD):
+            body.append('if n > {0}:'.format(i))
+            if kind == _POSITIONAL_OR_KEYWORD:
+                body += ['    if {0} in kwargs:'.format(key), '        ' + fail]
+            body.append('    ret[{0}] = args[{1}]'.format(key, i))
+            i += 1
+            if kind == _POSITIONAL_ONLY and has_default:
+                body += ['elif {0} in kwargs:'.format(key), '    ' + fail]
+        elif kind == _VAR_POSITIONAL:
+            body += [
+                'if n > {0}:'.format(i),
+                '    ret[{0}] = tuple(args[{1}:])'.format(key, i)]
+            continue
+        elif kind == _VAR_KEYWORD:
+            continue
+        if kind != _POSITIONAL_ONLY:
+            body.append('{0} {1} in {2}:'.format(
+                'elif' if kind == _POSITIONAL_OR_KEYWORD else 'if',
+                key, kwargs))
+            if varkwargs is not None:
+                body.append('    ret[{0}] = rest.pop({0})'.format(key))
+            else:
+                body += [
+                    '    ret[{0}] = kwargs[{0}]'.format(key),
+                    '    named += 1']
+        if not has_default:
+            body += ['else:', '    ' + fail]
+    if varkwargs is not None:
+        body += ['if rest:', '    ret[{0}] = rest'.format(repr(varkwargs))]
+    else:
+        body += ['if named != len(kwargs):', '    ' + fail]
+    body.append('return ret')
+    return '\n'.join(
+        ['def make_binder(fallback):', '    def bind(args, kwargs):']
+        + ['        ' + line for line in body]
+        + ['    return bind', ''])
+
+
+@functools.lru_cache(maxsize=1024)
+def _binder_factory(shape):
+    """Compiles `_binder_source`, once for all signatures with the same
+    parameter names and kinds, and which of them have defaults."""
+    namespace = {}
+    exec(compile(_binder_source(shape), '<sigtools binder>', 'exec'),
+         namespace)
+    return namespace['make_binder']
+
+
 class UpgradedSignature(_util.funcsigs.Signature):
     """A `~inspect.Signature` augmented with parameter sources and upgraded annotations,
     as returned by `sigtools.signature` or `sigtools.signatures.signature`
     """
-    __slots__ = _util.funcsigs.Signature.__slots__ + ('sources', 'upgraded_return_annotation')
+    __slots__ = _util.funcsigs.Signature.__slots__ + ('_sources', 'upgraded_return_annotation', '_binder', '_structure', '__weakref__')
 
     def __init__(self, parameters=None, *args, upgraded_return_annotation=EmptyAnnotation, _stacklevel=0, **kwargs):
-        self.sources = kwargs.pop('sources', {})
-        """
-        Sources of the signature's parameters.
-        
-        .. warning::
-        
-            Interface is likely to change in `sigtools` 5.0.
-        """
+        self.sources = kwargs.pop('sources', ())
+        self._binder = None
+        self._structure = None
         self.upgraded_return_annotation = upgraded_return_annotation
         """
         Return annotation.
@@ -157,11 +601,27 @@ class UpgradedSignature(_util.funcsigs.Signature):
         parameters = _upgrade_parameters_with_warning(parameters, stacklevel=_stacklevel + 1)
         super(Signature, self).__init__(parameters, *args, **kwargs)
 
+    @property
+    def sources(self):
+        """
+        Sources of the signature's parameters, as a `SourceMap`.
+
+        .. warning::
+
+            Interface is likely to change in `sigtools` 5.0.
+        """
+        return self._sources
+
+    @sources.setter
+    def sources(self, sources):
+        self._sources = _source_map(sources)
+
     @classmethod
     def _upgrade(cls, inst, function, sources, *, _stacklevel=0):
         """Upgrades an `inspect.Signature` given a function and soources"""
         if isinstance(inst, cls):
             return inst
+        sources = _source_map(sources)
         params = [
             UpgradedParameter._upgrade(param, function, sources)
             for param in inst.parameters.values()
@@ -209,16 +669,157 @@ class UpgradedSignature(_util.funcsigs.Signature):
 
     def evaluated(self):
         """Returns a copy of this Signature with annotations replaced by their evaluated counterparts"""
+        params = list(self.parameters.values())
+        values = UpgradedAnnotation.source_values(
+            [param.upgraded_annotation for param in params]
+            + [self.upgraded_return_annotation])
         return self.replace(
-            parameters=[param.evaluated() for param in self.parameters.values()],
-            return_annotation=self.upgraded_return_annotation.source_value(),
+            parameters=[
+                param.replace(annotation=value)
+                for param, value in zip(params, values)],
+            return_annotation=values[-1],
         )
 
+    def compile_binder(self):
+        """Returns a function that binds ``(args, kwargs)`` to the
+        parameters of this signature, like `~inspect.Signature.bind`, but
+        generated for this signature's parameters so that calling it doesn't
+        go through them one by one.
+
+        The function returns a `dict` equal to the ``arguments`` of the
+        `~inspect.BoundArguments` that ``bind(*args, **kwargs)`` would return,
+        and raises the same `TypeError` when the arguments don't fit. It is
+        compiled once for all signatures with the same parameter names, kinds
+        and required parameters, and kept with this signature.
+
+        ::
+
+            >>> from sigtools import support
+            >>> binder = support.s('a, b=2, *args, c, **kwargs').compile_binder()
+            >>> binder((1,), {'c': 3})
+            {'a': 1, 'c': 3}
+            >>> binder((1, 2, 3), {'c': 4, 'd': 5})
+            {'a': 1, 'b': 2, 'args': (3,), 'c': 4, 'kwargs': {'d': 5}}
+            >>> binder((), {'c': 3})
+            Traceback (most recent call last):
+              ...
+            TypeError: missing a required argument: 'a'
+        """
+        binder = self._binder
+        if binder is None:
+            shape = tuple(
+                (param.name, param.kind, param.default is not _empty)
+                for param in self.parameters.values())
+            binder = self._binder = _binder_factory(shape)(self._bind_slowly)
+        return binder
+
+    def _bind_slowly(self, args, kwargs):
+        return self.bind(*args, **kwargs).arguments
+
+    def to_bytes(self):
+        """Encodes this signature as bytes, which `from_bytes` turns back
+        into an equal signature, in this process or another.
+
+        Parameters, defaults, annotations, the return annotation and the
+        sources of each parameter along with their depths are encoded.
+        Functions, classes and other objects are encoded by their module and
+        qualified name, or by where they can be found from such objects.
+        Objects that can't be found that way, such as functions defined
+        inside other functions or most instances, are replaced by a
+        placeholder with the same `repr`. The :PEP:`563` annotations of such
+        functions are encoded evaluated, or as their text if evaluating them
+        fails.
+
+        ::
+
+            >>> from sigtools import signatures
+            >>> def func(a, b: int = 2, *, c=None):
+            ...     pass
+            ...
+            >>> data = signatures.signature(func).to_bytes()
+            >>> print(signatures.UpgradedSignature.from_bytes(data))
+            (a, b: int = 2, *, c=None)
+
+        :raises ValueError: if an annotation is of a kind unknown to
+            `sigtools`.
+        """
+        from sigtools import _serialize
+        return _serialize.dumps(self)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuilds a signature from the bytes returned by `to_bytes`.
+
+        The objects it references are looked up as the signature is built,
+        except for the sources of parameters and the functions their
+        stringified annotations are evaluated in, which are looked up when
+        they are first accessed.
+
+        .. warning::
+
+            Only pass it data from a trusted source, such as a cache your
+            own application wrote. Decoding imports the modules the data
+            names and reads attributes of the objects found in them, which
+            can run arbitrary code.
+
+        :raises ValueError: if ``data`` doesn't encode a signature, is
+            malformed, was encoded in a format this version of `sigtools`
+            doesn't read, or references an object that can't be found as
+            the signature is built. Objects looked up when first accessed raise `ImportError`,
+            `AttributeError` or `LookupError` instead.
+        """
+        from sigtools import _serialize
+        return _serialize.loads(data)
+
     def __eq__(self, other):
-        if not super().__eq__(other):
+        if self is other:
+            return True
+        if not isinstance(other, UpgradedSignature):
+            return super().__eq__(other)
+        if _signature_structure(self) != _signature_structure(other):
             return False
+        # the upgraded annotations are only compared once all else is equal
+        parameters = other.parameters
+        for param in self.parameters.values():
+            other_param = parameters[param.name]
+            if (param is not other_param
+                    and param.upgraded_annotation
+                        != other_param.upgraded_annotation):
+                return False
         return self.upgraded_return_annotation == other.upgraded_return_annotation
 
+    def __hash__(self):
+        positional, keyword, return_annotation = _signature_structure(self)
+        return hash((positional, frozenset(keyword.values()), return_annotation))
+
+
+def _param_structure(param):
+    """Returns what `inspect.Parameter` compares, computed once per
+    parameter. It hashes like the parameter would in `inspect`."""
+    ret = param._structure
+    if ret is None:
+        ret = param._structure = (
+            param._name, param._kind, param._annotation, param._default)
+    return ret
+
+
+def _signature_structure(sig):
+    """Returns what `inspect.Signature` compares, computed once per
+    signature: the structure of positional parameters in order, that of
+    keyword-only parameters by name, and the return annotation."""
+    ret = sig._structure
+    if ret is None:
+        positional = []
+        keyword = {}
+        for param in sig.parameters.values():
+            if param.kind == _KEYWORD_ONLY:
+                keyword[param.name] = _param_structure(param)
+            else:
+                positional.append(_param_structure(param))
+        ret = sig._structure = (
+            tuple(positional), keyword, sig.return_annotation)
+    return ret
+
 
 Signature = UpgradedSignature
 
@@ -227,18 +828,14 @@ class UpgradedParameter(_util.funcsigs.Parameter):
     """A `~inspect.Parameter` augmented with parameter sources and upgraded annotations,
     as found on signatures returned by `sigtools.signature` or `sigtools.signatures.signature`.
     """
-    __slots__ = _util.funcsigs.Parameter.__slots__ + ('upgraded_annotation', '_function', 'sources', "source_depths")
+    __slots__ = _util.funcsigs.Parameter.__slots__ + ('upgraded_annotation', '_function', 'sources', "source_depths", '_fingerprint', '_structure')
 
     @classmethod
     def _upgrade(cls, inst, function, function_sources):
         if isinstance(inst, cls):
             return inst
-        sources = function_sources.get(inst.name, [])
-        source_depths = {
-            func: depth
-            for func, depth in function_sources.get("+depths", {}).items()
-            if func in sources
-        }
+        function_sources = _source_map(function_sources)
+        funcs = function_sources.funcs(inst.name)
         return cls(
             name=inst.name,
             kind=inst.kind,
@@ -246,12 +843,14 @@ class UpgradedParameter(_util.funcsigs.Parameter):
             annotation=inst.annotation,
             upgraded_annotation=UpgradedAnnotation.upgrade(inst.annotation, function, inst.name),
             function=function,
-            sources=sources,
-            source_depths=source_depths,
+            sources=list(funcs),
+            source_depths=function_sources._param_depths(funcs),
         )
 
     def __init__(self, *args, function=None, sources=[], source_depths={}, upgraded_annotation=EmptyAnnotation, **kwargs):
         super().__init__(*args, **kwargs)
+        self._fingerprint = None
+        self._structure = None
         self._function = function
         self.sources = sources
         """
@@ -294,9 +893,16 @@ class UpgradedParameter(_util.funcsigs.Parameter):
         return self.replace(annotation=self.upgraded_annotation.source_value())
 
     def __eq__(self, other):
-        if not super().__eq__(other):
-            return False
-        return self.upgraded_annotation == other.upgraded_annotation
+        if self is other:
+            return True
+        if not isinstance(other, UpgradedParameter):
+            return super().__eq__(other)
+        return (
+            _param_structure(self) == _param_structure(other)
+            and self.upgraded_annotation == other.upgraded_annotation)
+
+    def __hash__(self):
+        return hash(_param_structure(self))
 
 
 def _upgrade_parameters_with_warning(parameters, stacklevel=1):
@@ -319,9 +925,9 @@ def _upgrade_parameters_with_warning(parameters, stacklevel=1):
 
 
 def default_sources(sig, obj):
-    srcs = dict((pname, [obj]) for pname in sig.parameters)
-    srcs['+depths'] = {obj: 0}
-    return srcs
+    funcs = (obj,)
+    return SourceMap._of(
+        dict.fromkeys(sig.parameters, funcs), {obj: 0})
 
 
 def set_default_sources(sig, obj):
@@ -329,6 +935,84 @@ def set_default_sources(sig, obj):
     return Signature._upgrade(sig, obj, default_sources(sig, obj))
 
 
+_CO_VARARGS = 0x04
+_CO_VARKEYWORDS = 0x08
+_SIGNATURE_OVERRIDES = (
+    '__wrapped__', '__signature__', '_partialmethod', '__partialmethod__')
+
+
+def _function_signature(func):
+    """Builds the signature of a plain Python function directly from its
+    code object, defaults and annotations, like
+    ``set_default_sources(inspect.signature(func), func)`` would."""
+    code = func.__code__
+    names = code.co_varnames
+    argcount = code.co_argcount
+    posonlycount = code.co_posonlyargcount
+    kwonlycount = code.co_kwonlyargcount
+    flags = code.co_flags
+    defaults = func.__defaults__ or ()
+    kwdefaults = func.__kwdefaults__ or {}
+    annotations = func.__annotations__
+    empty = _empty
+
+    specs = []
+    first_default = argcount - len(defaults)
+    for i in range(argcount):
+        specs.append((
+            names[i],
+            _POSITIONAL_ONLY if i < posonlycount else _POSITIONAL_OR_KEYWORD,
+            defaults[i - first_default] if i >= first_default else empty))
+    i = argcount + kwonlycount
+    if flags & _CO_VARARGS:
+        specs.append((names[i], _VAR_POSITIONAL, empty))
+        i += 1
+    for name in names[argcount:argcount + kwonlycount]:
+        specs.append((name, _KEYWORD_ONLY, kwdefaults.get(name, empty)))
+    if flags & _CO_VARKEYWORDS:
+        specs.append((names[i], _VAR_KEYWORD, empty))
+
+    if annotations:
+        postponed = _is_co_flag_enabled(func)
+        upgraded = {}
+        for name, annotation in annotations.items():
+            if postponed:
+                upgraded[name] = _PostponedAnnotation(annotation, func)
+            else:
+                upgraded[name] = _PreEvaluatedAnnotation(annotation)
+    else:
+        upgraded = annotations
+
+    funcs = (func,)
+    depths = {func: 0}
+    sources = {}
+    params = _util.OrderedDict()
+    new = UpgradedParameter.__new__
+    for name, kind, default in specs:
+        param = new(UpgradedParameter)
+        param._name = name
+        param._kind = kind
+        param._default = default
+        param._annotation = annotations.get(name, empty)
+        param.upgraded_annotation = upgraded.get(name, EmptyAnnotation)
+        param._function = func
+        param.sources = [func]
+        param.source_depths = _ParamDepths(funcs, depths)
+        param._fingerprint = None
+        param._structure = None
+        sources[name] = funcs
+        params[name] = param
+
+    sig = UpgradedSignature.__new__(UpgradedSignature)
+    sig._parameters = types.MappingProxyType(params)
+    sig._return_annotation = annotations.get('return', empty)
+    sig.upgraded_return_annotation = upgraded.get('return', EmptyAnnotation)
+    sig._sources = SourceMap._of(sources, depths, own_depths=False)
+    sig._binder = None
+    sig._structure = None
+    return sig
+
+
 def signature(obj):
     """Retrieves to unmodified signature from ``obj``, without taking
     `sigtools.specifiers` decorators into account or attempting automatic
@@ -336,6 +1020,10 @@ def signature(obj):
 
     For these features, use `sigtools.signature`.
     """
+    if type(obj) is types.FunctionType:
+        attrs = obj.__dict__
+        if not attrs or not any(name in attrs for name in _SIGNATURE_OVERRIDES):
+            return _function_signature(obj)
     if isinstance(obj, partial):
         sig = _util.funcsigs.signature(obj.func)
         sig = set_default_sources(sig, obj.func)
@@ -346,13 +1034,24 @@ def signature(obj):
 
 
 def copy_sources(src, func_swap={}, increase=False):
-    ret = dict(
-        (k, [func_swap.get(f, f) for f in v])
-        for k, v in src.items()
-        if k != '+depths')
-    ret['+depths'] = dict(
-        (func_swap.get(f, f), v + increase)
-        for f, v in src.get('+depths', {}).items())
+    src = _source_map(src)
+    if func_swap:
+        swapped = {}
+        params = {}
+        for name, funcs in src._params.items():
+            try:
+                params[name] = swapped[id(funcs)]
+            except KeyError:
+                params[name] = swapped[id(funcs)] = tuple(
+                    func_swap.get(f, f) for f in funcs)
+        ret = SourceMap._of(params, src._depths, own_depths=False)
+    else:
+        ret = src.copy()
+    if func_swap or increase:
+        ret._depths = dict(
+            (func_swap.get(f, f), v + increase)
+            for f, v in src._depths.items())
+        ret._own_depths = True
     return ret
 
 
@@ -403,9 +1102,8 @@ def sort_params(sig, sources=False, _stacklevel=0):
         else:
             raise AssertionError('Unknown param kind {0}'.format(param.kind))
     if sources:
-        src = getattr(sig, 'sources', {})
         return SortedParameters(posargs, pokargs, varargs, kwoargs, varkwas,
-                                copy_sources(src))
+                                sig.sources.copy())
     else:
         return posargs, pokargs, varargs, kwoargs, varkwas
 
@@ -454,142 +1152,320 @@ class IncompatibleSignatures(ValueError):
 
 
 
-def _add_sources(ret_src, name, *from_sources):
-    target = ret_src.setdefault(name, [])
-    target.extend(itertools.chain.from_iterable(
-        src.get(name, ()) for src in from_sources))
-
-def _add_all_sources(ret_src, params, from_source):
-    """Adds the sources from from_source of all given parameters into the
-    lhs sources multidict"""
-    for param in params:
-        ret_src.setdefault(param.name, []).extend(
-            from_source.get(param.name, ()))
-
 def _exclude_from_seq(seq, el):
     for i, x in enumerate(seq):
         if el is x:
             seq[i] = None
             break
 
-def merge_depths(l, r):
+def merge_depths(l, r, increase=0):
+    if not r:
+        return dict(l)
     ret = dict(l)
     for func, depth in r.items():
+        depth += increase
         if func in ret and depth > ret[func]:
             continue
         ret[func] = depth
     return ret
 
 
-class _Merger(object):
-    def __init__(self, left, right):
-        self.l = left
-        self.r = right
-        self.performed = False
+def _flatten_parts(parts):
+    if len(parts) == 1:
+        return parts[0]
+    return tuple(itertools.chain.from_iterable(parts))
 
-    def perform_once(self):
-        self.performed = True
-        self._merge()
 
-    def __iter__(self):
-        self.perform_once()
-        ret = (
+class _Merger(object):
+    """Merges signatures sorted by `sort_params` into the first one, one
+    after the other.
+
+    Only the positional parameters are rebuilt at each step. Keyword-only
+    parameters, sources and depths are updated in place, so that merging
+    many signatures costs in proportion to their total size rather than
+    to the size of the accumulated result times their number. The
+    keyword-only parameters are ordered by ``kwo_keys``, and the sources of
+    each parameter are kept as a list of tuples of functions until
+    `result` is called.
+    """
+
+    def __init__(self, first):
+        self.first = first
+        self.merged = False
+        self.posargs = list(first.posargs)
+        self.pokargs = list(first.pokargs)
+        self.varargs = first.varargs
+        self.varkwargs = first.varkwargs
+        self.kwoargs = dict(first.kwoargs)
+        self.kwo_keys = dict((name, i) for i, name in enumerate(first.kwoargs))
+        self.front = 0
+        self.back = len(self.kwo_keys)
+        sources = _source_map(first.sources)
+        self.src = {}
+        for param in itertools.chain(
+                self.posargs, self.pokargs, (self.varargs, self.varkwargs),
+                self.kwoargs.values()):
+            if param:
+                funcs = sources.funcs(param.name)
+                self.src[param.name] = [funcs] if funcs else []
+        self.depths = dict(sources._depths)
+
+    def result(self):
+        """Returns the merged parameters as a `SortedParameters`."""
+        if not self.merged:
+            return self.first._replace(sources=_source_map(
+                self.first.sources).copy())
+        keys = self.kwo_keys
+        kwoargs = _util.OrderedDict(
+            (name, self.kwoargs[name]) for name in sorted(keys, key=keys.get))
+        src = SourceMap._of(
+            dict((name, _flatten_parts(parts))
+                 for name, parts in self.src.items()),
+            self.depths)
+        return SortedParameters(
             self.posargs, self.pokargs, self.varargs,
-            self.kwoargs, self.varkwargs,
-            self.src)
-        return iter(ret)
+            kwoargs, self.varkwargs, src)
 
-    def _merge(self):
-        self.posargs = []
-        self.pokargs = []
-        self.varargs_src = [self.l.varargs, self.r.varargs]
-        self.kwoargs = _util.OrderedDict()
-        self.varkwargs_src = [
-            self.l.varkwargs,
-            self.r.varkwargs
-            ]
-        self.src = {'+depths': self._merge_depths()}
+    def merge(self, right):
+        """Merges the `SortedParameters` ``right`` into the result.
 
+        :raises ValueError: if the signatures are incompatible.
+        """
+        self.merged = True
+        self.r = right
+        self.r_src = _source_map(right.sources)
+        src = self.src
+        # sources of the left side's positional and star parameters are
+        # moved out, then put back in as each parameter is merged. Names
+        # that several parameters share, which can happen until the last
+        # signature is merged, are copied instead.
+        self.l_src = l_src = {}
+        self.shared = shared = set()
+        for param in itertools.chain(
+                self.posargs, self.pokargs, (self.varargs, self.varkwargs)):
+            if param:
+                name = param.name
+                if name in self.kwoargs:
+                    shared.add(name)
+                    l_src[name] = list(src[name])
+                elif name in l_src:
+                    shared.add(name)
+                else:
+                    l_src[name] = src.pop(name, [])
+        self.new_src = {}
+        self.varargs_src = [self.varargs, right.varargs]
+        self.varkwargs_src = [self.varkwargs, right.varkwargs]
 
-        self.l_unmatched_kwoargs = _util.OrderedDict()
-        for param in self.l.kwoargs.values():
+        kwoargs = self.kwoargs
+        self.matched = matched = []
+        self.r_unmatched_kwoargs = _util.OrderedDict()
+        for param in right.kwoargs.values():
             name = param.name
-            if name in self.r.kwoargs:
-                self.kwoargs[name] = self._concile_meta(
-                    param, self.r.kwoargs[name])
-                self.src[name] = list(itertools.chain(
-                    self.l.sources.get(name, ()), self.r.sources.get(name, ())))
+            if name in kwoargs:
+                kwoargs[name] = self._concile_meta(kwoargs[name], param)
+                funcs = self.r_src.funcs(name)
+                if funcs:
+                    src[name].append(funcs)
+                matched.append(name)
             else:
-                self.l_unmatched_kwoargs[param.name] = param
-
-        self.r_unmatched_kwoargs = _util.OrderedDict()
-        for param in self.r.kwoargs.values():
-            if param.name not in self.l.kwoargs:
-                self.r_unmatched_kwoargs[param.name] = param
-
-        il_pokargs = iter(self.l.pokargs)
-        ir_pokargs = iter(self.r.pokargs)
+                self.r_unmatched_kwoargs[name] = param
+        self.l_unmatched = len(kwoargs) - len(matched)
+        self.l_matched = set(matched)
+        self.converted = []
+        self.converted_names = set()
+        self.overridden = {}
+
+        l_posargs = self.posargs
+        l_pokargs = self.pokargs
+        self.posargs = []
+        self.pokargs = []
+        il_pokargs = iter(l_pokargs)
+        ir_pokargs = iter(right.pokargs)
 
-        for l_param, r_param in zip_longest(self.l.posargs, self.r.posargs):
+        for l_param, r_param in zip_longest(l_posargs, right.posargs):
             if l_param and r_param:
                 p = self._concile_meta(l_param, r_param)
                 self.posargs.append(p)
                 if l_param.name == r_param.name:
-                    _add_sources(self.src, l_param.name,
-                                 self.l.sources, self.r.sources)
+                    self._add(l_param.name, self._l(l_param.name),
+                              self._r(l_param.name))
                 else:
-                    _add_sources(self.src, l_param.name, self.l.sources)
+                    self._add(l_param.name, self._l(l_param.name))
             else:
                 if l_param:
                     self._merge_unbalanced_pos(
-                        l_param, self.l.sources,
-                        ir_pokargs, self.r.varargs, self.r.sources)
+                        l_param, self._l, ir_pokargs, right.varargs)
                 else:
                     self._merge_unbalanced_pos(
-                        r_param, self.r.sources,
-                        il_pokargs, self.l.varargs, self.l.sources)
+                        r_param, self._r, il_pokargs, self.varargs)
 
+        # pokargs before this index were already made positional-only
+        positional = 0
         for l_param, r_param in zip_longest(il_pokargs, ir_pokargs):
             if l_param and r_param:
                 if l_param.name == r_param.name:
                     self.pokargs.append(self._concile_meta(l_param, r_param))
-                    _add_sources(self.src, l_param.name,
-                                 self.l.sources, self.r.sources)
+                    self._add(l_param.name, self._l(l_param.name),
+                              self._r(l_param.name))
                 else:
-                    for i, pokarg in enumerate(self.pokargs):
-                        self.pokargs[i] = pokarg.replace(
-                            kind=pokarg.POSITIONAL_ONLY)
-                    self.pokargs.append(
-                        self._concile_meta(l_param, r_param)
-                        .replace(kind=l_param.POSITIONAL_ONLY))
-                    _add_sources(self.src, l_param.name, self.l.sources)
+                    pokargs = self.pokargs
+                    for i in range(positional, len(pokargs)):
+                        pokargs[i] = _with_kind(
+                            pokargs[i], pokargs[i].POSITIONAL_ONLY)
+                    pokargs.append(_with_kind(
+                        self._concile_meta(l_param, r_param),
+                        l_param.POSITIONAL_ONLY))
+                    positional = len(pokargs)
+                    self._add(l_param.name, self._l(l_param.name))
             else:
                 if l_param:
                     self._merge_unbalanced_pok(
-                        l_param, self.l.sources,
-                        self.r.varargs, self.r.varkwargs,
-                        self.r_unmatched_kwoargs, self.r.sources)
+                        l_param, self._l, self._r,
+                        right.varargs, right.varkwargs,
+                        self._in_r_limbo, self._pop_r_limbo)
                 else:
                     self._merge_unbalanced_pok(
-                        r_param, self.r.sources,
-                        self.l.varargs, self.l.varkwargs,
-                        self.l_unmatched_kwoargs, self.l.sources)
+                        r_param, self._r, self._l,
+                        self.varargs, self.varkwargs,
+                        self._in_l_limbo, self._pop_l_limbo)
 
-        if self.l_unmatched_kwoargs:
-            self._merge_unmatched_kwoargs(
-                self.l_unmatched_kwoargs, self.r.varkwargs, self.l.sources)
+        self._merge_l_unmatched_kwoargs()
         if self.r_unmatched_kwoargs:
-            self._merge_unmatched_kwoargs(
-                self.r_unmatched_kwoargs, self.l.varkwargs, self.r.sources)
+            self._merge_r_unmatched_kwoargs()
 
+        self.front -= len(matched) + len(self.converted)
+        key = self.front
+        matched.sort(key=self.kwo_keys.__getitem__)
+        for name in itertools.chain(matched, self.converted):
+            self.kwo_keys[name] = key
+            key += 1
+
+        l_varargs = self.varargs
+        l_varkwargs = self.varkwargs
         self.varargs = self._add_starargs(
-            self.varargs_src, self.l.varargs, self.r.varargs)
+            self.varargs_src, l_varargs, right.varargs)
         self.varkwargs = self._add_starargs(
-            self.varkwargs_src, self.l.varkwargs, self.r.varkwargs)
+            self.varkwargs_src, l_varkwargs, right.varkwargs)
+
+        depths = self.depths
+        for func, depth in self.r_src._depths.items():
+            if func in depths and depth > depths[func]:
+                continue
+            depths[func] = depth
+        del self.r, self.r_src, self.l_src, self.new_src, self.shared
+        del self.overridden, self.converted_names
+
+    def _l(self, name):
+        """The sources of the left side's parameter ``name``."""
+        if name in self.shared:
+            return list(self.l_src.get(name, ()))
+        try:
+            return self.l_src.pop(name)
+        except KeyError:
+            return []
+
+    def _r(self, name):
+        """The sources of the right side's parameter ``name``."""
+        funcs = self.r_src.funcs(name)
+        return [funcs] if funcs else []
+
+    def _add(self, name, *parts):
+        target = self.new_src.get(name)
+        for part in parts:
+            if target is None:
+                target = part
+            else:
+                target.extend(part)
+        self.new_src[name] = [] if target is None else target
+
+    def _in_l_limbo(self, name):
+        return name in self.kwoargs and name not in self.l_matched
+
+    def _pop_l_limbo(self, name):
+        self.l_matched.add(name)
+        self.l_unmatched -= 1
+        self.l_src[name] = self.src.pop(name)
+        del self.kwo_keys[name]
+        return self.kwoargs.pop(name)
+
+    def _in_r_limbo(self, name):
+        return name in self.r_unmatched_kwoargs
+
+    def _pop_r_limbo(self, name):
+        return self.r_unmatched_kwoargs.pop(name)
+
+    def _convert(self, param):
+        name = param.name
+        if name in self.overridden:
+            self.overridden[name] = param
+        elif name not in self.kwoargs:
+            self.kwoargs[name] = param
+            self.converted.append(name)
+        elif name in self.l_matched or name in self.converted_names:
+            # replaces the matched parameter of the same name in its place
+            self.kwoargs[name] = param
+        else:
+            # yields to the unmatched parameter of the same name if it is
+            # kept, but takes the place of a converted parameter either way
+            self.converted.append(name)
+            self.overridden[name] = param
+        self.converted_names.add(name)
+
+    def _merge_l_unmatched_kwoargs(self):
+        """Keeps or drops the left side's keyword-only parameters that the
+        right side doesn't have, and puts the sources of the other
+        parameters merged so far in."""
+        src = self.src
+        o_varkwargs = self.r.varkwargs
+        if self.l_unmatched and not o_varkwargs:
+            keys = self.kwo_keys
+            unmatched = [
+                name for name in sorted(keys, key=keys.get)
+                if name not in self.l_matched]
+            non_defaulted = [
+                self.kwoargs[name] for name in unmatched
+                if self.kwoargs[name].default == _empty]
+            if non_defaulted:
+                raise ValueError(
+                    'Unmatched keyword parameters: {0}'.format(
+                    ' '.join(str(arg) for arg in non_defaulted)))
+            for name in unmatched:
+                del keys[name], src[name]
+                try:
+                    self.kwoargs[name] = self.overridden[name]
+                except KeyError:
+                    del self.kwoargs[name]
+        for name, parts in self.new_src.items():
+            existing = src.get(name)
+            if existing is None:
+                src[name] = parts
+            elif name in self.l_matched:
+                existing.extend(parts)
+            else:
+                src[name] = parts + existing
+        self.new_src = {}
+        if self.l_unmatched and o_varkwargs:
+            _exclude_from_seq(self.varkwargs_src, o_varkwargs)
 
-    def _merge_depths(self):
-        return merge_depths(self.l.sources.get('+depths', {}),
-                            self.r.sources.get('+depths', {}))
+    def _merge_r_unmatched_kwoargs(self):
+        unmatched = self.r_unmatched_kwoargs
+        if self.varkwargs:
+            for name, param in unmatched.items():
+                self.kwoargs[name] = param
+                self.kwo_keys[name] = self.back
+                self.back += 1
+                self.src.setdefault(name, []).extend(self._r(name))
+            _exclude_from_seq(self.varkwargs_src, self.varkwargs)
+        else:
+            non_defaulted = [
+                arg
+                for arg in unmatched.values()
+                if arg.default == arg.empty
+                ]
+            if non_defaulted:
+                raise ValueError(
+                    'Unmatched keyword parameters: {0}'.format(
+                    ' '.join(str(arg) for arg in non_defaulted)))
 
     def _add_starargs(self, which, left, right):
         if not left or not right:
@@ -597,80 +1473,63 @@ class _Merger(object):
         if all(which):
             ret = self._concile_meta(left, right)
             if left.name == right.name:
-                _add_sources(self.src, ret.name,
-                             self.l.sources, self.r.sources)
+                parts = self._l(left.name) + self._r(right.name)
             else:
-                _add_sources(self.src, ret.name, self.l.sources)
+                parts = self._l(left.name)
         elif which[0]:
             ret = left
-            _add_sources(self.src, ret.name, self.l.sources)
+            parts = self._l(left.name)
         else:
             ret = right
-            _add_sources(self.src, ret.name, self.r.sources)
+            parts = self._r(right.name)
+        self.src.setdefault(ret.name, []).extend(parts)
         return ret
 
     def _merge_unbalanced_pos(self, existing, src,
-                              convert_from, o_varargs, o_src):
+                              convert_from, o_varargs):
         try:
             other = next(convert_from)
         except StopIteration:
             if o_varargs:
                 self.posargs.append(existing)
-                _add_sources(self.src, existing.name, src)
+                self._add(existing.name, src(existing.name))
                 _exclude_from_seq(self.varargs_src, o_varargs)
             elif existing.default == existing.empty:
                 raise ValueError('Unmatched positional parameter: {0}'
                                  .format(existing))
         else:
             self.posargs.append(self._concile_meta(existing, other))
-            _add_sources(self.src, existing.name, src)
+            self._add(existing.name, src(existing.name))
 
     def _merge_unbalanced_pok(
-            self, existing, src,
-            o_varargs, o_varkwargs, o_kwargs_limbo, o_src):
+            self, existing, src, o_src,
+            o_varargs, o_varkwargs, in_o_limbo, pop_o_limbo):
         """tries to insert positional-or-keyword parameters for which there were
         no matched positional parameter"""
-        if existing.name in o_kwargs_limbo:
-            self.kwoargs[existing.name] = self._concile_meta(
-                existing, o_kwargs_limbo.pop(existing.name)
-                ).replace(kind=existing.KEYWORD_ONLY)
-            _add_sources(self.src, existing.name, o_src, src)
+        if in_o_limbo(existing.name):
+            self._convert(_with_kind(self._concile_meta(
+                existing, pop_o_limbo(existing.name)
+                ), existing.KEYWORD_ONLY))
+            self._add(existing.name, o_src(existing.name), src(existing.name))
         elif o_varargs and o_varkwargs:
             self.pokargs.append(existing)
-            _add_sources(self.src, existing.name, src)
+            self._add(existing.name, src(existing.name))
         elif o_varkwargs:
             # convert to keyword argument
-            self.kwoargs[existing.name] = existing.replace(
-                kind=existing.KEYWORD_ONLY)
-            _add_sources(self.src, existing.name, src)
+            self._convert(_with_kind(existing, existing.KEYWORD_ONLY))
+            self._add(existing.name, src(existing.name))
         elif o_varargs:
             # convert along with all preceeding to positional args
             self.posargs.extend(
-                a.replace(kind=a.POSITIONAL_ONLY)
+                _with_kind(a, a.POSITIONAL_ONLY)
                 for a in self.pokargs)
             self.pokargs[:] = []
-            self.posargs.append(existing.replace(kind=existing.POSITIONAL_ONLY))
-            _add_sources(self.src, existing.name, src)
+            self.posargs.append(_with_kind(existing, existing.POSITIONAL_ONLY))
+            self._add(existing.name, src(existing.name))
         elif existing.default == existing.empty:
             raise ValueError('Unmatched regular parameter: {0}'
                              .format(existing))
 
-    def _merge_unmatched_kwoargs(self, unmatched_kwoargs, o_varkwargs, from_src):
-        if o_varkwargs:
-            self.kwoargs.update(unmatched_kwoargs)
-            _add_all_sources(self.src, unmatched_kwoargs.values(), from_src)
-            _exclude_from_seq(self.varkwargs_src, o_varkwargs)
-        else:
-            non_defaulted = [
-                arg
-                for arg in unmatched_kwoargs.values()
-                if arg.default == arg.empty
-                ]
-            if non_defaulted:
-                raise ValueError(
-                    'Unmatched keyword parameters: {0}'.format(
-                    ' '.join(str(arg) for arg in non_defaulted)))
-
     def _concile_meta(self, left, right):
         default = left.empty
         if left.default != left.empty and right.default != right.empty:
@@ -755,15 +1614,19 @@ def merge(*signatures):
 
     """
     assert signatures, "Expected at least one signature"
-    ret = sort_params(signatures[0], sources=True, _stacklevel=1)
-    for i, sig in enumerate(signatures[1:], 1):
-        sorted_params = sort_params(sig, sources=True, _stacklevel=1)
-        try:
-            ret = SortedParameters(*_Merger(ret, sorted_params))
-        except ValueError:
-            raise IncompatibleSignatures(sig, signatures[:i])
-    ret_sig = apply_params(signatures[0], *ret, _stacklevel=1)
-    return ret_sig
+    with _trace.step('merge') as step:
+        ret, token = _lookup(('merge',), signatures, step)
+        if ret is not None:
+            return ret
+        merger = _Merger(sort_params(signatures[0], sources=True, _stacklevel=1))
+        for i, sig in enumerate(signatures[1:], 1):
+            sorted_params = sort_params(sig, sources=True, _stacklevel=1)
+            try:
+                merger.merge(sorted_params)
+            except ValueError:
+                raise IncompatibleSignatures(sig, signatures[:i])
+        ret_sig = apply_params(signatures[0], *merger.result(), _stacklevel=1)
+        return _store(token, ret_sig)
 
 
 def _check_no_dupes(collect, params):
@@ -784,10 +1647,12 @@ def _embed(outer, inner, use_varargs=True, use_varkwargs=True, depth=1):
 
     stars_sig = SortedParameters(
         [], [], use_varargs and o_varargs,
-        {}, use_varkwargs and o_varkwargs, {})
+        {}, use_varkwargs and o_varkwargs, SourceMap())
 
+    merger = _Merger(inner)
+    merger.merge(stars_sig)
     i_posargs, i_pokargs, i_varargs, i_kwoargs, i_varkwargs, i_src = \
-        _Merger(inner, stars_sig)
+        merger.result()
 
     names = set()
 
@@ -799,7 +1664,8 @@ def _embed(outer, inner, use_varargs=True, use_varkwargs=True, depth=1):
     _check_no_dupes(names, o_posargs)
     if i_posargs:
         _check_no_dupes(names, o_pokargs)
-        e_posargs.extend(arg.replace(kind=arg.POSITIONAL_ONLY) for arg in o_pokargs)
+        e_posargs.extend(
+            _with_kind(arg, arg.POSITIONAL_ONLY) for arg in o_pokargs)
         if i_posargs[0].default is i_posargs[0].empty:
             e_posargs = list(_clear_defaults(e_posargs))
         _check_no_dupes(names, i_posargs)
@@ -819,15 +1685,15 @@ def _embed(outer, inner, use_varargs=True, use_varkwargs=True, depth=1):
     _check_no_dupes(names, i_kwoargs.values())
     e_kwoargs.update(i_kwoargs)
 
-    src = dict(i_src, **o_src)
+    o_src = _source_map(o_src)
+    params = dict(i_src._params)
+    params.update(o_src._params)
+    src = SourceMap._of(
+        params, merge_depths(o_src._depths, i_src._depths, depth))
     if o_varargs and use_varargs:
-        src.pop(o_varargs.name, None)
+        src._discard(o_varargs.name)
     if o_varkwargs and use_varkwargs:
-        src.pop(o_varkwargs.name, None)
-
-    src['+depths'] = merge_depths(
-        o_src.get('+depths', {}),
-        dict((f, v+depth) for f, v in i_src.get('+depths', {}).items()))
+        src._discard(o_varkwargs.name)
 
     return (
         e_posargs, e_pokargs, i_varargs if use_varargs else o_varargs,
@@ -866,6 +1732,17 @@ def embed(*signatures, use_varargs=True, use_varkwargs=True, _stacklevel=0):
         (self, *args, keyword, **kwargs)
     """
     assert signatures
+    with _trace.step('embed') as step:
+        cached, token = _lookup(
+            ('embed', use_varargs, use_varkwargs), signatures, step)
+        if cached is not None:
+            return cached
+        return _store(token, _embed_all(
+            signatures, use_varargs, use_varkwargs,
+            _stacklevel=_stacklevel + 1))
+
+
+def _embed_all(signatures, use_varargs, use_varkwargs, *, _stacklevel=0):
     ret = sort_params(signatures[0], sources=True, _stacklevel=_stacklevel + 1)
     for i, sig in enumerate(signatures[1:], 1):
         try:
@@ -876,15 +1753,9 @@ def embed(*signatures, use_varargs=True, use_varkwargs=True, _stacklevel=0):
     return apply_params(signatures[0], *ret, _stacklevel=_stacklevel + 1)
 
 
-def _pop_chain(*sequences):
-    for sequence in sequences:
-        while sequence:
-            yield sequence.pop(0)
-
-
 def _remove_from_src(src, ita):
     for name in ita:
-        src.pop(name, None)
+        src._discard(name)
 
 
 def _pnames(ita):
@@ -898,7 +1769,6 @@ def _mask(sig, num_args, hide_args, hide_kwargs,
     posargs, pokargs, varargs, kwoargs, varkwargs, src \
         = sort_params(sig, sources=True, _stacklevel=_stacklevel + 1)
 
-    pokargs_by_name = dict((p.name, p) for p in pokargs)
     consumed_names = set()
 
     if hide_args:
@@ -907,23 +1777,23 @@ def _mask(sig, num_args, hide_args, hide_kwargs,
         posargs = []
         pokargs = []
     elif num_args:
-        consume = num_args
-        for param in _pop_chain(posargs, pokargs):
-            consume -= 1
-            consumed_names.add(param.name)
-            if not consume:
-                break
-        else:
-            if not varargs:
-                raise ValueError(
-                    'Signature cannot be passed {0} arguments: {1}'
-                    .format(num_args, sig))
+        num_pos = min(num_args, len(posargs))
+        num_pok = min(num_args - num_pos, len(pokargs))
+        consumed_names.update(_pnames(posargs[:num_pos]))
+        consumed_names.update(_pnames(pokargs[:num_pok]))
+        posargs = posargs[num_pos:]
+        pokargs = pokargs[num_pok:]
+        if num_pos + num_pok < num_args and not varargs:
+            raise ValueError(
+                'Signature cannot be passed {0} arguments: {1}'
+                .format(num_args, sig))
 
     _remove_from_src(src, consumed_names)
+    pokargs_by_name = dict((p.name, i) for i, p in enumerate(pokargs))
 
     if hide_args or hide_varargs:
         if varargs:
-            src.pop(varargs.name, None)
+            src._discard(varargs.name)
         varargs = None
 
     partial_mode = partial_obj is not None
@@ -939,19 +1809,19 @@ def _mask(sig, num_args, hide_args, hide_kwargs,
         if kwarg_name in consumed_names:
             raise ValueError('Duplicate argument: {0!r}'.format(kwarg_name))
         elif kwarg_name in pokargs_by_name:
-            i = pokargs.index(pokargs_by_name[kwarg_name])
+            i = pokargs_by_name[kwarg_name]
             pokargs, param, conv_kwoargs = (
                 pokargs[:i], pokargs[i], pokargs[i+1:])
             kwoargs.update(
-                (p.name, p.replace(kind=p.KEYWORD_ONLY))
+                (p.name, _with_kind(p, p.KEYWORD_ONLY))
                 for p in conv_kwoargs)
             if partial_mode:
                 kwoargs[param.name] = param.replace(
                     kind=param.KEYWORD_ONLY, default=named_args[param.name])
             else:
-                src.pop(kwarg_name, None)
+                src._discard(kwarg_name)
             if varargs:
-                src.pop(varargs.name, None)
+                src._discard(varargs.name)
                 varargs = None
             pokargs_by_name.clear()
         elif kwarg_name in kwoargs:
@@ -960,7 +1830,7 @@ def _mask(sig, num_args, hide_args, hide_kwargs,
                 kwoargs[kwarg_name] = param.replace(
                     kind=param.KEYWORD_ONLY, default=named_args[kwarg_name])
             else:
-                src.pop(kwarg_name, None)
+                src._discard(kwarg_name)
                 kwoargs.pop(kwarg_name)
         elif not varkwargs:
             raise ValueError(
@@ -970,17 +1840,17 @@ def _mask(sig, num_args, hide_args, hide_kwargs,
             kwoargs[kwarg_name] = UpgradedParameter(
                 kwarg_name, _util.funcsigs.Parameter.KEYWORD_ONLY,
                 default=named_args[kwarg_name])
-            src[kwarg_name] = [partial_obj]
+            src._writable_params()[kwarg_name] = (partial_obj,)
         consumed_names.add(kwarg_name)
 
     if hide_kwargs or hide_varkwargs:
         if varkwargs:
-            src.pop(varkwargs.name, None)
+            src._discard(varkwargs.name)
         varkwargs = None
 
     if partial_mode:
         src = copy_sources(src, increase=True)
-        src['+depths'][partial_obj] = 0
+        src._writable_depths()[partial_obj] = 0
     ret = apply_params(sig, posargs, pokargs, varargs, kwoargs, varkwargs, src, _stacklevel=_stacklevel + 1)
     return ret
 
@@ -1018,8 +1888,17 @@ def mask(sig, num_args=0,
         (*, c)
 
     """
-    return _mask(sig, num_args, hide_args, hide_kwargs,
-                 hide_varargs, hide_varkwargs, named_args, None, _stacklevel=_stacklevel + 1)
+    with _trace.step('mask') as step:
+        ret, token = _lookup(
+            ('mask', num_args, named_args, hide_args, hide_kwargs,
+             hide_varargs, hide_varkwargs),
+            (sig,), step)
+        if ret is not None:
+            return ret
+        return _store(token, _mask(
+            sig, num_args, hide_args, hide_kwargs,
+            hide_varargs, hide_varkwargs, named_args, None,
+            _stacklevel=_stacklevel + 1))
 
 
 def forwards(outer, inner, num_args=0,
@@ -1056,6 +1935,15 @@ def forwards(outer, inner, num_args=0,
         :ref:`forwards-pick`
 
     """
+    ret, token = _lookup(
+        ('forwards', num_args, named_args, hide_args, hide_kwargs,
+         use_varargs, use_varkwargs, bool(partial)),
+        (outer, inner))
+    if ret is not None:
+        with _trace.step('forwards') as step:
+            if step is not None:
+                step.outcome = 'cached'
+        return ret
     if partial:
         params = []
         for param in inner.parameters.values():
@@ -1064,14 +1952,526 @@ def forwards(outer, inner, num_args=0,
             else:
                 params.append(param.replace(default=None))
         inner = inner.replace(parameters=params)
-    return embed(
-        outer,
-        mask(inner, num_args,
-             *named_args,
-             hide_args=hide_args, hide_kwargs=hide_kwargs,
-             hide_varargs=False, hide_varkwargs=False,
-             _stacklevel=1,
-             ),
-        use_varargs=use_varargs, use_varkwargs=use_varkwargs,
-        _stacklevel=1,
-    )
+    # the intermediate results aren't cached on their own
+    with _trace.step('mask'):
+        masked = _mask(
+            inner, num_args, hide_args, hide_kwargs, False, False,
+            named_args, None, _stacklevel=1)
+    with _trace.step('embed'):
+        ret = _embed_all(
+            (outer, masked), use_varargs, use_varkwargs, _stacklevel=1)
+    return _store(token, ret)
+
+
+class OperationCache(object):
+    """Bounded cache of the signatures computed by `merge`, `embed`, `mask`
+    and `forwards`.
+
+    Entries are keyed on the operation, its arguments and the structure of
+    the signatures it is given: their parameters, annotations, sources and
+    source depths, with the functions they reference numbered in the order
+    they appear. Signatures that only differ in which functions they come
+    from, such as those of the functions returned by the same decorator,
+    therefore share an entry, and the functions of each caller are put back
+    into the signature it receives. Likewise, defaults and annotations are
+    compared by value, and each caller gets its own objects back.
+
+    Signatures whose defaults or annotations can't be hashed or compared,
+    whatever the error they raise, and signatures that aren't
+    `UpgradedSignature` objects, are not cached.
+
+    When more than ``maxsize`` entries are stored, the least recently used
+    ones are evicted. ``maxsize=None`` lets the cache grow without bound.
+    Cached signatures keep referencing the functions they were first
+    computed with until they are evicted or `clear` is called.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = _util.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<{0} maxsize={1} entries={2} hits={3} misses={4}>'.format(
+            _util.qualname(type(self)), self.maxsize, len(self),
+            self.hits, self.misses)
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key, funcs, values):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry.signature(funcs, values)
+
+    def _put(self, key, sig, funcs, values):
+        entry = _OperationEntry(sig, funcs, values)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+
+class _OperationEntry(object):
+    __slots__ = (
+        'params', 'return_annotation', 'upgraded_return_annotation',
+        'sources', 'funcs', 'values')
+
+    def __init__(self, sig, funcs, values):
+        self.params = tuple(sig.parameters.values())
+        self.return_annotation = sig.return_annotation
+        self.upgraded_return_annotation = sig.upgraded_return_annotation
+        self.sources = sig.sources.copy()
+        self.funcs = funcs
+        self.values = values
+
+    def signature(self, funcs, values):
+        """Returns a new signature with the functions and the defaults and
+        annotations this entry was computed with replaced by ``funcs`` and
+        ``values``."""
+        swap = dict(
+            (old, new) for old, new in zip(self.funcs, funcs)
+            if old is not new)
+        # equal values may still be told apart, so they are matched by
+        # identity
+        value_swap = dict(
+            (id(old), new) for old, new in zip(self.values, values)
+            if old is not new)
+        return_annotation = self.return_annotation
+        upgraded_return_annotation = self.upgraded_return_annotation
+        if swap or value_swap:
+            params = [
+                _swap_param_funcs(param, swap, value_swap)
+                for param in self.params]
+            return_annotation = value_swap.get(
+                id(return_annotation), return_annotation)
+            upgraded_return_annotation = _swap_annotation_func(
+                upgraded_return_annotation, swap, value_swap)
+            sources = copy_sources(self.sources, swap)
+        else:
+            params = self.params
+            sources = self.sources.copy()
+        return UpgradedSignature(
+            params,
+            return_annotation=return_annotation,
+            upgraded_return_annotation=upgraded_return_annotation,
+            sources=sources,
+            __validate_parameters__=False)
+
+
+def _swap_annotation_func(annotation, swap, value_swap):
+    if type(annotation) is _PostponedAnnotation:
+        func = swap.get(annotation._function)
+        if func is not None:
+            return _PostponedAnnotation(annotation._raw_annotation, func)
+    elif type(annotation) is _PreEvaluatedAnnotation:
+        value = value_swap.get(id(annotation._annotation), _UNEVALUATED)
+        if value is not _UNEVALUATED:
+            return _PreEvaluatedAnnotation(value)
+    return annotation
+
+
+def _swap_param_funcs(param, swap, value_swap):
+    # the parameter was already validated when it was first created
+    ret = UpgradedParameter.__new__(type(param))
+    ret._name = param._name
+    ret._kind = param._kind
+    ret._default = value_swap.get(id(param._default), param._default)
+    ret._annotation = value_swap.get(id(param._annotation), param._annotation)
+    ret.upgraded_annotation = _swap_annotation_func(
+        param.upgraded_annotation, swap, value_swap)
+    ret._function = swap.get(param._function, param._function)
+    ret.sources = [swap.get(func, func) for func in param.sources]
+    ret.source_depths = dict(
+        (swap.get(func, func), depth)
+        for func, depth in param.source_depths.items())
+    ret._fingerprint = None
+    ret._structure = None if value_swap else param._structure
+    return ret
+
+
+def _with_kind(param, kind):
+    # only called to turn positional-or-keyword parameters into
+    # positional-only or keyword-only ones, which is always valid
+    if not isinstance(param, UpgradedParameter):
+        return param.replace(kind=kind)
+    ret = UpgradedParameter.__new__(type(param))
+    ret._name = param._name
+    ret._kind = kind
+    ret._default = param._default
+    ret._annotation = param._annotation
+    ret.upgraded_annotation = param.upgraded_annotation
+    ret._function = param._function
+    ret.sources = param.sources
+    ret.source_depths = param.source_depths
+    ret._fingerprint = None
+    ret._structure = param._structure if kind == param._kind else None
+    return ret
+
+
+def _value_key(value):
+    return type(value), value
+
+
+def _annotation_fingerprint(annotation, funcs, values):
+    kind = type(annotation)
+    if kind is _EmptyAnnotation:
+        return None
+    elif kind is _PreEvaluatedAnnotation:
+        values.append(annotation._annotation)
+        return _value_key(annotation._annotation)
+    elif kind is _PostponedAnnotation:
+        funcs.append(annotation._function)
+        return 'postponed', annotation._raw_annotation
+    raise TypeError('Unknown annotation type {0}'.format(kind))
+
+
+def _param_fingerprint(param):
+    """Describes ``param`` by its structure, and lists the functions and the
+    defaults and annotations it references. Parameters aren't modified once
+    they are created, so the description is kept on them."""
+    ret = getattr(param, '_fingerprint', None)
+    if ret is None:
+        funcs = [param._function]
+        values = [param.default, param.annotation]
+        annotation = _annotation_fingerprint(
+            param.upgraded_annotation, funcs, values)
+        funcs.extend(param.sources)
+        depths = list(param.source_depths.items())
+        funcs.extend(func for func, depth in depths)
+        struct = (
+            param.name, param.kind,
+            _value_key(param.default), _value_key(param.annotation),
+            annotation, len(param.sources),
+            tuple(depth for func, depth in depths),
+            )
+        ret = param._fingerprint = struct, funcs, values
+    return ret
+
+
+def _fingerprint(sig, funcs, values):
+    """Describes ``sig`` by its structure, and appends the functions it
+    references to ``funcs`` and its defaults and annotations to ``values``.
+
+    :raises TypeError: if ``sig`` can't be described.
+    """
+    if type(sig) is not UpgradedSignature:
+        raise TypeError('Not an UpgradedSignature: {0!r}'.format(sig))
+    params = []
+    for param in sig.parameters.values():
+        struct, param_funcs, param_values = _param_fingerprint(param)
+        params.append(struct)
+        funcs.extend(param_funcs)
+        values.extend(param_values)
+    src = sig.sources
+    for param_funcs in src._params.values():
+        funcs.extend(param_funcs)
+    funcs.extend(src._depths)
+    values.append(sig.return_annotation)
+    return (
+        tuple(params),
+        _value_key(sig.return_annotation),
+        _annotation_fingerprint(
+            sig.upgraded_return_annotation, funcs, values),
+        tuple(src._params), tuple(map(len, src._params.values())),
+        tuple(src._depths.values()),
+        )
+
+
+_operation_cache = None
+
+
+def set_operation_cache(cache):
+    global _operation_cache
+    _operation_cache = cache
+
+
+def get_operation_cache():
+    return _operation_cache
+
+
+def _lookup(operation, signatures, step=None):
+    """Looks the result of ``operation`` on ``signatures`` up in the
+    operation cache.
+
+    :returns: The cached signature or `None`, and what `_store` needs to
+        cache the signature once it is computed.
+    """
+    cache = _operation_cache
+    if cache is None:
+        return None, None
+    funcs = []
+    values = []
+    try:
+        key = operation + tuple([
+            _fingerprint(sig, funcs, values) for sig in signatures])
+        # functions are numbered in the order they are first seen
+        distinct = list(dict.fromkeys(funcs))
+        numbers = dict(zip(distinct, itertools.count()))
+        key += tuple(map(numbers.__getitem__, funcs)),
+        funcs = distinct
+        # and so are defaults and annotations, but by identity, as they
+        # are compared by value in the structure
+        numbers = {}
+        distinct = []
+        for value in values:
+            if id(value) not in numbers:
+                numbers[id(value)] = len(distinct)
+                distinct.append(value)
+        key += tuple([numbers[id(value)] for value in values]),
+        values = distinct
+        ret = cache._get(key, funcs, values)
+    except Exception:
+        # a default or annotation that can't be hashed or compared, which
+        # numpy arrays and others report with errors other than TypeError
+        return None, None
+    if ret is not None and step is not None:
+        step.outcome = 'cached'
+    return ret, (cache, key, funcs, values)
+
+
+def _store(token, sig):
+    if token is not None:
+        cache, key, funcs, values = token
+        try:
+            cache._put(key, sig, funcs, values)
+        except Exception:
+            # failed comparing to another key with the same hash
+            pass
+    return sig
+
+
+class InternPool(object):
+    """Shares one instance between structurally identical parameters, and
+    between structurally identical signatures.
+
+    Parameters are identical when they have the same name, kind, function,
+    sources and source depths, and the very same default and annotation
+    objects. Postponed annotations are shared between the functions that
+    evaluate them in the same globals. Signatures are identical when their
+    parameters, return annotations and sources are.
+
+    Interned parameters and signatures, including their ``sources``, are
+    shared by everyone who interned an identical one: treat them as
+    read-only. When more than ``maxsize`` parameters, or more than
+    ``maxsize`` signatures, are kept, the least recently used ones are
+    dropped from the pool, along with the functions only they reference.
+    ``maxsize=None`` lets the pool grow until `clear` is called.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._params = _util.OrderedDict()
+        self._signatures = _util.OrderedDict()
+        self._signature_count = 0
+        self._funcs = _util.OrderedDict()
+        self._annotations = _util.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._params) + self._signature_count
+
+    def __repr__(self):
+        return '<{0} maxsize={1} parameters={2} signatures={3}>'.format(
+            _util.qualname(type(self)), self.maxsize, len(self._params),
+            self._signature_count)
+
+    def clear(self):
+        """Removes all parameters and signatures from the pool."""
+        with self._lock:
+            self._params.clear()
+            self._signatures.clear()
+            self._signature_count = 0
+            self._funcs.clear()
+            self._annotations.clear()
+
+    def _shared(self, table, key, make):
+        """Returns the value of ``table`` for ``key``, adding ``make()``
+        if there is none and evicting the least recently used values past
+        ``maxsize``."""
+        # called with the lock held
+        ret = table.get(key)
+        if ret is not None:
+            table.move_to_end(key)
+            return ret
+        ret = table[key] = make()
+        if self.maxsize is not None:
+            while len(table) > self.maxsize:
+                table.popitem(last=False)
+        return ret
+
+    def _annotation(self, annotation, key):
+        """Appends what identifies ``annotation`` to ``key``, and returns
+        the annotation of the pool with the same key."""
+        kind = type(annotation)
+        if kind is _EmptyAnnotation:
+            key.append(None)
+            return annotation
+        elif kind is _PreEvaluatedAnnotation:
+            # equal values may still be told apart. The identity stays valid
+            # for as long as the key is kept, as the annotation kept with it
+            # references the value.
+            ident = kind, id(annotation._annotation)
+        elif kind is _PostponedAnnotation:
+            # only the globals of its function are used to evaluate it, and
+            # the annotation kept with the key keeps them alive
+            ident = (kind, annotation._raw_annotation,
+                     id(annotation._function.__globals__))
+        else:
+            raise TypeError('Unknown annotation type {0}'.format(kind))
+        key.extend(ident)
+        return self._shared(self._annotations, ident, lambda: annotation)
+
+    def intern_parameter(self, param):
+        """Returns the parameter of the pool identical to ``param``, adding
+        a copy of ``param`` to the pool if there is none."""
+        ret = self._intern_parameter(param)
+        return param if ret is None else ret
+
+    def _intern_parameter(self, param):
+        if not isinstance(param, UpgradedParameter):
+            return None
+        # a flat tuple, as the pool keeps one key per parameter. The default,
+        # annotation, function and sources are kept alive by the parameter
+        # kept with the key.
+        sources = param.sources
+        depths = param.source_depths
+        key = [
+            type(param), param.name, param.kind,
+            id(param.default), id(param.annotation), id(param._function),
+            len(sources)]
+        key.extend(map(id, sources))
+        key.append(len(depths))
+        for func, depth in depths.items():
+            key += id(func), depth
+        try:
+            with self._lock:
+                upgraded = self._annotation(param.upgraded_annotation, key)
+                return self._shared(
+                    self._params, tuple(key),
+                    lambda: self._new_parameter(param, upgraded))
+        except TypeError:
+            return None
+
+    def _new_parameter(self, param, upgraded_annotation):
+        # called with the lock held
+        ret = UpgradedParameter.__new__(type(param))
+        ret._name = param._name
+        ret._kind = param._kind
+        ret._default = param._default
+        ret._annotation = param._annotation
+        ret.upgraded_annotation = upgraded_annotation
+        ret._function = param._function
+        ret.sources = list(param.sources)
+        ret.source_depths = dict(param.source_depths.items())
+        ret._fingerprint = None
+        ret._structure = param._structure
+        return ret
+
+    def intern(self, sig):
+        """Returns the signature of the pool identical to ``sig``, made of
+        interned parameters, adding one to the pool if there is none."""
+        if type(sig) is not UpgradedSignature:
+            return sig
+        params = [self._intern_parameter(p) for p in sig.parameters.values()]
+        if any(param is None for param in params):
+            return sig
+        src = sig.sources
+        return_annotation = sig.return_annotation
+        try:
+            # most signatures are only seen once, so rather than keep a key
+            # for each, signatures with the same hash are compared in turn
+            digest = hash((
+                tuple(map(id, params)),
+                tuple(src._params.items()), tuple(src._depths.items()),
+                id(return_annotation)))
+            with self._lock:
+                upgraded = self._annotation(
+                    sig.upgraded_return_annotation, [])
+                candidates = self._signatures.get(digest)
+                if candidates is None:
+                    candidates = self._signatures[digest] = []
+                else:
+                    self._signatures.move_to_end(digest)
+                for candidate in candidates:
+                    if self._same_signature(
+                            candidate, params, src, return_annotation,
+                            upgraded):
+                        return candidate
+                ret = self._new_signature(sig, params, upgraded)
+                candidates.append(ret)
+                self._signature_count += 1
+                if self.maxsize is not None:
+                    while self._signature_count > self.maxsize:
+                        evicted = self._signatures.popitem(last=False)[1]
+                        self._signature_count -= len(evicted)
+                return ret
+        except TypeError:
+            return sig
+
+    def _same_signature(self, candidate, params, src, return_annotation,
+                        upgraded_return_annotation):
+        c_return_annotation = candidate.return_annotation
+        c_src = candidate.sources
+        return (
+            candidate.upgraded_return_annotation
+                is upgraded_return_annotation
+            and c_return_annotation is return_annotation
+            and len(candidate.parameters) == len(params)
+            and all(a is b for a, b in zip(
+                candidate.parameters.values(), params))
+            and list(c_src._params.items()) == list(src._params.items())
+            and list(c_src._depths.items()) == list(src._depths.items())
+            )
+
+    def _new_signature(self, sig, params, upgraded_return_annotation):
+        # called with the lock held
+        src = sig.sources
+        names = {}
+        for name, funcs in src._params.items():
+            names[name] = self._shared(self._funcs, funcs, lambda: funcs)
+        # the depths are shared with the signature being interned, which
+        # copies them before modifying them
+        src._own_depths = False
+        sources = SourceMap._of(names, src._depths, own_depths=False)
+        # shared between the signatures built from this one
+        sources._own_params = False
+        return UpgradedSignature(
+            params,
+            return_annotation=sig.return_annotation,
+            upgraded_return_annotation=upgraded_return_annotation,
+            sources=sources,
+            __validate_parameters__=False)
+
+
+_intern_pool = None
+
+
+def set_intern_pool(pool):
+    global _intern_pool
+    _intern_pool = pool
+
+
+def get_intern_pool():
+    return _intern_pool
+
+
+def _interned(sig):
+    pool = _intern_pool
+    if pool is None:
+        return sig
+    return pool.intern(sig)
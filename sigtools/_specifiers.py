@@ -20,7 +20,388 @@
 # THE SOFTWARE.
 
 
-from sigtools import _signatures, _util
+import atexit
+import itertools
+import math
+import os
+import threading
+import time
+import types
+from functools import partial
+import weakref
+
+from sigtools import _signatures, _trace, _util
+
+
+_STATE_ATTRS = (
+    '__code__', '__defaults__', '__kwdefaults__',
+    '__signature__', '__wrapped__',
+    '_sigtools__forger', '_sigtools__autoforwards_hint',
+    )
+
+
+def _static_attr(obj, name):
+    """Looks up ``name`` on ``obj`` without running user-defined
+    descriptors such as `as_forged` or properties."""
+    if isinstance(obj, type):
+        mro = obj.__mro__
+    else:
+        try:
+            return vars(obj)[name]
+        except (TypeError, KeyError):
+            pass
+        mro = type(obj).__mro__
+    for klass in mro:
+        try:
+            value = klass.__dict__[name]
+        except KeyError:
+            continue
+        if isinstance(value, (types.MemberDescriptorType,
+                              types.GetSetDescriptorType)):
+            try:
+                return value.__get__(obj, type(obj))
+            except AttributeError:
+                return None
+        return value
+    return None
+
+
+def _state_ref(value):
+    # attributes such as __signature__ may reference the callable
+    try:
+        return weakref.ref(value)
+    except TypeError:
+        return lambda: value
+
+
+class _CacheEntry(object):
+    __slots__ = ('ref', 'extra', 'state', 'sig', 'template')
+
+    def __init__(self, ref, extra, state, sig):
+        self.ref = ref
+        self.extra = extra
+        self.state = tuple(map(_state_ref, state))
+        if type(sig) is _signatures.UpgradedSignature:
+            # the signature references the callable through its sources, so
+            # only a copy without it is kept, and the signature itself
+            # weakly, so that the entry doesn't keep the callable alive
+            placeholder = object()
+            self.template = _signatures._OperationEntry(
+                _signatures._OperationEntry(sig, [ref()], [])
+                    .signature([placeholder], []),
+                [placeholder], [])
+            self.sig = weakref.ref(sig)
+        else:
+            self.template = None
+            self.sig = sig
+
+    def signature(self, target):
+        if self.template is None:
+            return self.sig
+        ret = self.sig()
+        if ret is None:
+            ret = _signatures._interned(
+                self.template.signature([target], []))
+            self.sig = weakref.ref(ret)
+        return ret
+
+
+class SignatureCache(object):
+    """Bounded cache of the signatures computed by
+    `sigtools.specifiers.signature`.
+
+    Entries are keyed weakly on the introspected callable (on the
+    function and on the instance for bound methods), the ``auto`` flag and
+    the ``args`` and ``kwargs`` given to `~sigtools.specifiers.signature`.
+    An entry is invalidated as soon as one of the callable's ``__code__``,
+    ``__defaults__``, ``__kwdefaults__``, ``__signature__``,
+    ``__wrapped__`` attributes or its signature forger is replaced.
+
+    When more than ``maxsize`` entries are stored, the least recently used
+    ones are evicted. ``maxsize=None`` lets the cache grow without bound.
+
+    Entries don't keep the callable alive: they are dropped when it, or
+    the instance of a bound method, is garbage-collected. The same signature
+    object is returned for as long as something else references it; after
+    that, an identical one is rebuilt from the entry. The callables the
+    signature is forwarded to are kept until the entry is evicted or `clear`
+    is called. Changes that are invisible from the callable's attributes,
+    such as rebinding a global name a function forwards its arguments to,
+    are not detected either; call `clear` after making them.
+
+    If ``directory`` is given, the signatures of module-level callables are
+    also stored in files in that directory, and reused by later processes
+    as long as the source files of the objects they reference are unchanged.
+    Signatures are written to disk by `flush`, which is called when the
+    interpreter exits. ``disk_hits`` counts the signatures read back from
+    there.
+    """
+
+    def __init__(self, maxsize=1024, directory=None):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._entries = _util.OrderedDict()
+        self._lock = threading.Lock()
+        if directory is None:
+            self._store = None
+        else:
+            self._store = _diskcache.DiskStore(os.fspath(directory))
+            atexit.register(_flush_ref, weakref.ref(self))
+
+    @property
+    def directory(self):
+        """The directory signatures are stored in, or `None`."""
+        return None if self._store is None else self._store.directory
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<{0} maxsize={1} entries={2} hits={3} misses={4}>'.format(
+            _util.qualname(type(self)), self.maxsize, len(self),
+            self.hits, self.misses)
+
+    def clear(self):
+        """Removes all entries from the cache, including those stored
+        on disk. Also forgets which functions automatic signature discovery
+        gave up on, the calls it found in the others and the source files it
+        parsed."""
+        with self._lock:
+            self._entries.clear()
+        _autoforwards.forget_unusable_code()
+        _autoforwards.forget_calls()
+        _util.clear_ast_cache()
+        if self._store is not None:
+            self._store.clear()
+
+    def flush(self):
+        """Writes the signatures computed since the last call to disk,
+        if the cache has a ``directory``."""
+        if self._store is not None:
+            self._store.flush()
+
+    def _key(self, obj, auto, args, kwargs):
+        if isinstance(obj, types.MethodType):
+            target, extra = obj.__func__, obj.__self__
+        else:
+            target, extra = obj, None
+        extra_id = None if extra is None else id(extra)
+        if args or kwargs:
+            for value in itertools.chain(args, kwargs.values()):
+                if isinstance(value, _autoforwards.Unknown):
+                    return None
+            argkey = tuple(args), tuple(sorted(kwargs.items()))
+        else:
+            argkey = ()
+        key = id(target), extra_id, bool(auto), argkey
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key, target, extra
+
+    def _state(self, target):
+        return tuple(_static_attr(target, attr) for attr in _STATE_ATTRS)
+
+    def get(self, obj, auto=True, args=(), kwargs={}):
+        """Returns the cached signature for ``obj``, or `None`."""
+        k = self._key(obj, auto, args, kwargs)
+        if k is None:
+            return None
+        key, target, extra = k
+        state = self._state(target)
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                    entry is not None
+                    and entry.ref() is target
+                    and (entry.extra is None if extra is None
+                         else entry.extra() is extra)
+                    and all(a() is b for a, b in zip(entry.state, state))
+                ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+        if entry is not None:
+            return entry.signature(target)
+        if self._store is not None and extra is None and not key[3]:
+            sig = self._store.load(target, auto)
+            if sig is not None:
+                self._insert(key, target, extra, state, sig)
+                with self._lock:
+                    self.disk_hits += 1
+                return sig
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, obj, sig, auto=True, args=(), kwargs={}):
+        """Stores ``sig`` as the signature of ``obj``."""
+        k = self._key(obj, auto, args, kwargs)
+        if k is None:
+            return
+        key, target, extra = k
+        if self._insert(key, target, extra, self._state(target), sig):
+            if self._store is not None and extra is None and not key[3]:
+                self._store.save(target, auto, sig)
+
+    def _insert(self, key, target, extra, state, sig):
+        discard = partial(self._discard, key)
+        try:
+            ref = weakref.ref(target, discard)
+            if extra is not None:
+                extra = weakref.ref(extra, discard)
+        except TypeError:
+            return False
+        entry = _CacheEntry(ref, extra, state, sig)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return True
+
+    def _discard(self, key, ref):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (ref is entry.ref or ref is entry.extra):
+                del self._entries[key]
+
+
+def _flush_ref(ref):
+    cache = ref()
+    if cache is not None:
+        cache.flush()
+
+
+_cache = None
+
+
+def set_cache(cache):
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    return _cache
+
+
+class BudgetExceeded(Exception):
+    """Automatic signature discovery used up its `Budget`.
+
+    Not a `ValueError`, so that it isn't mistaken for a callee without a
+    signature on its way out of nested resolutions."""
+
+
+class Budget(object):
+    """Limits the work `sigtools.specifiers.signature` may do in
+    automatic signature discovery.
+
+    :param float time: Wall time, in seconds, one call may take.
+    :param int nodes: How many AST nodes or bytecode instructions one call
+        may examine, across all the functions it follows.
+    :param int depth: How many levels of forwarding one call may follow.
+
+    `None` leaves that resource unlimited. When a limit is reached, the
+    signature is computed as with ``auto=False`` instead, and not cached.
+    This also applies to the callables that decorators and modifiers wrap.
+
+    :ivar int exceeded: How many calls ran out of budget.
+    :ivar str last_reason: Which limit was reached last, or `None`.
+    """
+
+    def __init__(self, time=None, nodes=None, depth=None):
+        self.time = time
+        self.nodes = nodes
+        self.depth = depth
+        self._lock = threading.Lock()
+        self.exceeded = 0
+        self.last_reason = None
+
+    def __repr__(self):
+        return '<{0} time={1!r} nodes={2!r} depth={3!r} exceeded={4}>'.format(
+            _util.qualname(type(self)),
+            self.time, self.nodes, self.depth, self.exceeded)
+
+    def _record(self, reason):
+        with self._lock:
+            self.exceeded += 1
+            self.last_reason = reason
+
+
+class _Spend(object):
+    """What remains of a `Budget` during one top-level resolution."""
+
+    __slots__ = ('budget', 'deadline', 'nodes', 'depth')
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.deadline = (
+            math.inf if budget.time is None
+            else time.perf_counter() + budget.time)
+        self.nodes = math.inf if budget.nodes is None else budget.nodes
+        self.depth = -1
+
+    def enter(self):
+        self.depth += 1
+        if self.budget.depth is not None and self.depth > self.budget.depth:
+            raise BudgetExceeded(
+                'depth budget of {0} exceeded'.format(self.budget.depth))
+        self.check_time()
+
+    def node(self):
+        self.nodes -= 1
+        if self.nodes < 0:
+            raise BudgetExceeded(
+                'node budget of {0} exceeded'.format(self.budget.nodes))
+        self.check_time()
+
+    def check_time(self):
+        if time.perf_counter() > self.deadline:
+            raise BudgetExceeded(
+                'time budget of {0}s exceeded'.format(self.budget.time))
+
+
+_budget = None
+
+
+def set_budget(budget):
+    global _budget
+    _budget = budget
+
+
+def get_budget():
+    return _budget
+
+
+_resolution = threading.local()
+
+
+def current_spend():
+    """The `_Spend` of the resolution in progress in this thread, or
+    `None` if it is unlimited."""
+    return getattr(_resolution, 'spend', None)
+
+
+_unknown_arg = object()
+
+
+def _memo_key(obj, auto, args, kwargs):
+    """Identifies a call to `forged_signature` within one resolution.
+    Arguments only known at runtime are all alike."""
+    def token(value):
+        if isinstance(value, _autoforwards.Unknown):
+            return _unknown_arg
+        return id(value)
+    return (
+        id(obj), bool(auto),
+        tuple(token(arg) for arg in args),
+        tuple(sorted((name, token(value)) for name, value in kwargs.items())),
+    )
 
 
 def forged_signature(obj, auto=True, args=(), kwargs={}):
@@ -84,12 +465,101 @@ def forged_signature(obj, auto=True, args=(), kwargs={}):
     :param mapping: Named arguments passed to the function.
 
     .. seealso:
-        :ref:`autofwd limits`
+        :ref:`autofwd limits`, :ref:`signature cache`
     """
+    memo = getattr(_resolution, 'memo', None)
+    if memo is not None:
+        return _memoized_signature(memo, obj, auto, args, kwargs)
+    budget = _budget
+    _resolution.memo = memo = {}
+    if budget is not None and auto:
+        _resolution.spend = _Spend(budget)
+    try:
+        ret = _memoized_signature(memo, obj, auto, args, kwargs)
+    finally:
+        _resolution.memo = None
+        _resolution.spend = None
+        _resolution.exhausted = False
+    if _cache is None:
+        # with the cache enabled, what it keeps is interned instead
+        return _signatures._interned(ret)
+    return ret
+
+
+def _memoized_signature(memo, obj, auto, args, kwargs):
+    """Computes each signature once per top-level call to
+    `forged_signature`, so that callees reached through several forwarding
+    paths are only resolved once."""
+    if auto and getattr(_resolution, 'exhausted', False):
+        # forgers of wrappers look up what they wrap with auto=True
+        auto = False
+    key = _memo_key(obj, auto, args, kwargs)
+    with _trace.step('forged_signature', obj) as step:
+        try:
+            entry = memo[key]
+        except KeyError:
+            pass
+        else:
+            if step is not None:
+                step.outcome = 'memoized'
+            if entry[-1] is not None:
+                raise entry[-1]
+            return entry[-2]
+        spend = getattr(_resolution, 'spend', None)
+        try:
+            if spend is None:
+                ret = _cached_signature(step, obj, auto, args, kwargs)
+            else:
+                ret = _budgeted_signature(spend, step, obj, auto, args, kwargs)
+        except (ValueError, TypeError) as exc:
+            # entries keep obj and args alive so their ids stay unique
+            memo[key] = obj, args, kwargs, None, exc
+            raise
+        memo[key] = obj, args, kwargs, ret, None
+        return ret
+
+
+def _budgeted_signature(spend, step, obj, auto, args, kwargs):
+    """Tracks the depth of nested resolutions, and falls back to the
+    signature without automatic discovery once the budget is used up."""
+    try:
+        spend.enter()
+        return _cached_signature(step, obj, auto, args, kwargs)
+    except BudgetExceeded as exc:
+        if spend.depth:
+            raise
+        spend.budget._record(str(exc))
+        if step is not None:
+            step.outcome = 'budget exceeded: {0}'.format(exc)
+        # the fallback is not cached, the next call may fit in the budget,
+        # and neither does it look at how anything it reaches forwards
+        _resolution.spend = None
+        _resolution.exhausted = True
+        return _forged_signature(obj, False, args, kwargs)
+    finally:
+        spend.depth -= 1
+
+
+def _cached_signature(step, obj, auto, args, kwargs):
+    cache = _cache
+    if cache is None:
+        return _forged_signature(obj, auto, args, kwargs)
+    ret = cache.get(obj, auto, args, kwargs)
+    if ret is not None:
+        if step is not None:
+            step.outcome = 'cached'
+        return ret
+    ret = _signatures._interned(_forged_signature(obj, auto, args, kwargs))
+    cache.put(obj, ret, auto, args, kwargs)
+    return ret
+
+
+def _forged_signature(obj, auto, args, kwargs):
     subject = _util.get_introspectable(obj, af_hint=auto)
     forger = getattr(subject, '_sigtools__forger', None)
     if forger is not None:
-        ret = forger(obj=subject)
+        with _trace.step('forger', subject):
+            ret = forger(obj=subject)
         if ret is not None:
             return _signatures.UpgradedSignature._upgrade_with_warning(ret)
     if auto:
@@ -98,25 +568,44 @@ def forged_signature(obj, auto=True, args=(), kwargs={}):
         except AttributeError:
             pass
         else:
-            h = subject._sigtools__autoforwards_hint(subject)
+            with _trace.step('autoforwards_hint', subject):
+                h = subject._sigtools__autoforwards_hint(subject)
             if h is not None:
                 try:
-                    ret = _autoforwards.autoforwards_ast(
-                        *h, args=args, kwargs=kwargs)
+                    with _trace.step('autoforwards_ast', h[0]):
+                        ret = _autoforwards.autoforwards_ast(
+                            *h, args=args, kwargs=kwargs)
                 except _autoforwards.UnknownForwards:
                     pass
                 else:
                     return _signatures.UpgradedSignature._upgrade_with_warning(ret)
             subject = _util.get_introspectable(subject, af_hint=False)
         try:
-            ret = _signatures.UpgradedSignature._upgrade_with_warning(
-                _autoforwards.autoforwards(subject, args, kwargs)
-            )
+            with _trace.step('autoforwards', subject):
+                ret = _signatures.UpgradedSignature._upgrade_with_warning(
+                    _autoforwards.autoforwards(subject, args, kwargs)
+                )
         except _autoforwards.UnknownForwards:
             pass
         else:
             return _signatures.UpgradedSignature._upgrade_with_warning(ret)
-    return _signatures.UpgradedSignature._upgrade_with_warning(_signatures.signature(obj))
+    with _trace.step('signature', obj):
+        return _signatures.UpgradedSignature._upgrade_with_warning(
+            _signatures.signature(obj))
+
+
+def explain(obj, auto=True, args=(), kwargs={}):
+    """Computes the signature of ``obj`` like `forged_signature`, and records
+    the steps taken along the way.
+
+    :returns: The outermost `~sigtools._trace.Step`. Its ``result``
+        attribute holds the signature.
+    """
+    with _trace.tracing('explain', obj) as root:
+        sig = forged_signature(obj, auto, args, kwargs)
+    ret = root.children[0]
+    ret.result = sig
+    return ret
 
 
-from sigtools import _autoforwards
+from sigtools import _autoforwards, _diskcache
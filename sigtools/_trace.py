@@ -0,0 +1,172 @@
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""Opt-in recording of the steps taken while resolving a signature.
+
+Recording only happens inside `tracing`. Elsewhere, `step` returns a shared
+no-op context manager so that instrumented code pays next to nothing.
+"""
+
+import threading
+import time
+
+
+_local = threading.local()
+
+
+def _describe(obj):
+    if isinstance(obj, str):
+        return obj
+    try:
+        return obj.__qualname__
+    except AttributeError:
+        return repr(obj)
+
+
+class Step(object):
+    """A step taken while resolving a signature, as recorded by
+    `sigtools.specifiers.explain`.
+
+    :ivar str name: What kind of step this is, for instance
+        ``'forged_signature'``, ``'get_ast'`` or ``'merge'``.
+    :ivar str subject: The callable the step was about, if any.
+    :ivar float duration: Wall time spent in this step, in seconds,
+        including its children.
+    :ivar str outcome: ``'ok'``, or a description of why the step did not
+        complete, such as the reason automatic signature discovery
+        gave up.
+    :ivar list children: The steps taken during this one.
+    :ivar result: For the outermost step, the signature that was
+        computed.
+    """
+
+    __slots__ = ('name', 'subject', 'duration', 'outcome', 'children', 'result')
+
+    def __init__(self, name, subject=None):
+        self.name = name
+        self.subject = subject
+        self.duration = 0.0
+        self.outcome = 'ok'
+        self.children = []
+        self.result = None
+
+    def walk(self):
+        """Iterates over this step and all of its descendants,
+        depth-first."""
+        yield self
+        for child in self.children:
+            for step in child.walk():
+                yield step
+
+    def format(self, indent='  '):
+        """Returns a human-readable tree of this step and its children."""
+        lines = []
+        self._format(lines, '', indent)
+        return '\n'.join(lines)
+
+    def _format(self, lines, prefix, indent):
+        lines.append('{0}{1}{2}: {3:.3f}ms {4}'.format(
+            prefix, self.name,
+            '' if self.subject is None else ' ' + self.subject,
+            self.duration * 1000, self.outcome))
+        for child in self.children:
+            child._format(lines, prefix + indent, indent)
+
+    __str__ = format
+
+    def __repr__(self):
+        return '<Step {0}{1}: {2}>'.format(
+            self.name,
+            '' if self.subject is None else ' ' + self.subject,
+            self.outcome)
+
+
+class _NullRecorder(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_null = _NullRecorder()
+
+
+class _Recorder(object):
+    __slots__ = ('step', 'parent', 'start')
+
+    def __init__(self, step, parent):
+        self.step = step
+        self.parent = parent
+
+    def __enter__(self):
+        self.parent.children.append(self.step)
+        _local.current = self.step
+        self.start = time.perf_counter()
+        return self.step
+
+    def __exit__(self, exc_type, exc, tb):
+        self.step.duration = time.perf_counter() - self.start
+        if exc_type is not None:
+            message = str(exc)
+            self.step.outcome = (
+                '{0}: {1}'.format(exc_type.__name__, message) if message
+                else exc_type.__name__)
+        _local.current = self.parent
+        return False
+
+
+def step(name, subject=None):
+    """Records a step named ``name`` for the duration of a ``with`` block
+    if a trace is being recorded in this thread.
+
+    The ``with`` statement binds the `Step`, or `None` when not tracing.
+    """
+    current = getattr(_local, 'current', None)
+    if current is None:
+        return _null
+    return _Recorder(
+        Step(name, None if subject is None else _describe(subject)),
+        current)
+
+
+class tracing(object):
+    """Records the steps taken in this thread within the ``with`` block.
+
+    The ``with`` statement binds a `Step` whose children are the
+    outermost recorded steps.
+    """
+
+    def __init__(self, name='trace', subject=None):
+        self.root = Step(name, None if subject is None else _describe(subject))
+
+    def __enter__(self):
+        self.saved = getattr(_local, 'current', None)
+        _local.current = self.root
+        self.start = time.perf_counter()
+        return self.root
+
+    def __exit__(self, exc_type, exc, tb):
+        self.root.duration = time.perf_counter() - self.start
+        _local.current = self.saved
+        return False
@@ -21,9 +21,13 @@
 
 import inspect
 import ast
+import linecache
+import threading
 from functools import update_wrapper, partial
 from weakref import WeakKeyDictionary
 
+from sigtools import _trace
+
 
 def get_funcsigs():
     import inspect
@@ -78,6 +82,7 @@ class OverrideableDataDesc(object):
                 return type(self)(func, **kwargs)
             self.custom_getter = cg
         self.insts = WeakKeyDictionary()
+        self._insts_lock = threading.Lock()
         super(OverrideableDataDesc, self).__init__(*args, **kwargs)
 
     def __get__(self, instance, owner):
@@ -97,8 +102,9 @@ class OverrideableDataDesc(object):
             ret = self
         else:
             ret = self.custom_getter(func, original=self)
-        self.insts[func] = ret
-        return ret
+        # another thread may have stored one in the meantime
+        with self._insts_lock:
+            return self.insts.setdefault(func, ret)
 
 def safe_get(obj, instance, owner):
     try:
@@ -149,15 +155,96 @@ def get_introspectable(obj, forged=True, af_hint=True, partial=True):
                 return obj
     return obj
 
+
+_AMBIGUOUS = object()
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_parsed_files = OrderedDict()
+_parsed_files_lock = threading.Lock()
+# how many source files to keep the index of, the least recently used ones
+# are dropped past that
+_MAX_PARSED_FILES = 32
+
+
+def _index_tree(tree):
+    """Maps ``(first line, name)`` to the function definitions and lambdas
+    found in ``tree``, as they would be identified by the ``co_firstlineno``
+    and ``co_name`` of their code objects."""
+    index = {}
+    for node in ast.walk(tree):
+        if isinstance(node, _FUNCTION_NODES):
+            first = node.lineno
+            if node.decorator_list:
+                first = min(first, node.decorator_list[0].lineno)
+            key = first, node.name
+        elif isinstance(node, ast.Lambda):
+            key = node.lineno, '<lambda>'
+        else:
+            continue
+        index[key] = _AMBIGUOUS if key in index else node
+    return index
+
+
+def _file_index(filename, module_globals):
+    """Returns the index of the functions defined in ``filename``, parsing
+    it only if it wasn't already or it changed since, or `None` if its
+    source is unavailable."""
+    # linecache drops its copy of the file if its size or modification time
+    # changed, so the list of lines is a new one whenever the file changes
+    linecache.checkcache(filename)
+    lines = linecache.getlines(filename, module_globals)
+    if not lines:
+        return None
+    with _parsed_files_lock:
+        entry = _parsed_files.get(filename)
+        if entry is not None and entry[0] is lines:
+            _parsed_files.move_to_end(filename)
+            return entry[1]
+    with _trace.step('parse', filename):
+        try:
+            index = _index_tree(ast.parse(''.join(lines), filename))
+        except (SyntaxError, ValueError):
+            index = {}
+    with _parsed_files_lock:
+        _parsed_files[filename] = lines, index
+        _parsed_files.move_to_end(filename)
+        while len(_parsed_files) > _MAX_PARSED_FILES:
+            _parsed_files.popitem(last=False)
+    return index
+
+
+def clear_ast_cache():
+    """Forgets the source files parsed by `get_ast`.
+
+    The functions of the most recently used source files are kept indexed,
+    along with their syntax trees, so that looking up another function of
+    the same file doesn't parse it again. This holds a few times the memory
+    of each file's source for up to ``_MAX_PARSED_FILES`` files, until they
+    are dropped to make room for others or this is called."""
+    with _parsed_files_lock:
+        _parsed_files.clear()
+
+
 def get_ast(func):
     try:
         code = func.__code__
     except AttributeError:
         return None
-    try:
-        rawsource = inspect.getsource(code)
-    except (OSError, IOError):
-        return None
-    source = inspect.cleandoc('\n' + rawsource)
-    module = ast.parse(source)
-    return module.body[0]
+    with _trace.step('get_ast', func):
+        index = _file_index(
+            code.co_filename, getattr(func, '__globals__', None))
+        node = None if index is None else index.get(
+            (code.co_firstlineno, code.co_name))
+        if node is not None and node is not _AMBIGUOUS:
+            return node
+        if code.co_name == '<lambda>':
+            # getsource would return the statement the lambda is part of
+            return None
+        try:
+            with _trace.step('getsource'):
+                rawsource = inspect.getsource(code)
+        except (OSError, IOError):
+            return None
+        with _trace.step('parse'):
+            source = inspect.cleandoc('\n' + rawsource)
+            module = ast.parse(source)
+        return module.body[0]
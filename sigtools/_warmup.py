@@ -0,0 +1,178 @@
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import gc
+import importlib
+import pkgutil
+import types
+
+from sigtools import _specifiers, _util
+
+
+class WarmupReport(object):
+    """Outcome of a call to `sigtools.warmup`.
+
+    :ivar int resolved: How many signatures were computed.
+    :ivar list failures: ``(name, exception)`` for each object whose
+        signature could not be computed or module that could not be
+        imported.
+    :ivar cache: The `~sigtools.specifiers.SignatureCache` holding
+        the computed signatures.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.resolved = 0
+        self.failures = []
+
+    @property
+    def failed(self):
+        """How many objects could not be resolved."""
+        return len(self.failures)
+
+    def __repr__(self):
+        return '<{0} resolved={1} failed={2}>'.format(
+            _util.qualname(type(self)), self.resolved, self.failed)
+
+
+class _Warmer(object):
+    def __init__(self, report, recursive, auto):
+        self.report = report
+        self.recursive = recursive
+        self.auto = auto
+        # keeps what it visited alive, so that their ids aren't reused by
+        # objects created later in the walk, such as bound classmethods
+        self.seen = {}
+
+    def visit(self, obj, name):
+        if id(obj) in self.seen:
+            return
+        self.seen[id(obj)] = obj
+        if isinstance(obj, str):
+            self.visit_module_name(obj)
+        elif isinstance(obj, types.ModuleType):
+            self.visit_module(obj)
+        elif callable(obj):
+            self.resolve(obj, name)
+            if isinstance(obj, type):
+                self.visit_class(obj, name)
+
+    def visit_module_name(self, name):
+        try:
+            module = importlib.import_module(name)
+        except Exception as exc:
+            self.report.failures.append((name, exc))
+        else:
+            self.visit(module, name)
+
+    def visit_module(self, module):
+        try:
+            names = list(module.__all__)
+            exported = set(names)
+        except AttributeError:
+            names = [n for n in vars(module) if not n.startswith('_')]
+            exported = ()
+        for attr in names:
+            try:
+                obj = getattr(module, attr)
+            except AttributeError:
+                continue
+            if (
+                    attr in exported
+                    or getattr(obj, '__module__', None) == module.__name__
+                ):
+                self.visit(obj, '{0}.{1}'.format(module.__name__, attr))
+        path = getattr(module, '__path__', None)
+        if self.recursive and path is not None:
+            for info in pkgutil.iter_modules(path, module.__name__ + '.'):
+                if not info.name.rpartition('.')[2].startswith('_'):
+                    self.visit_module_name(info.name)
+
+    def visit_class(self, cls, name):
+        for attr in list(vars(cls)):
+            if attr.startswith('_'):
+                continue
+            try:
+                obj = getattr(cls, attr)
+            except Exception:
+                continue
+            if callable(obj):
+                self.visit(obj, '{0}.{1}'.format(name, attr))
+
+    def resolve(self, obj, name):
+        try:
+            _specifiers.forged_signature(obj, auto=self.auto)
+        except Exception as exc:
+            self.report.failures.append((name, exc))
+        else:
+            self.report.resolved += 1
+
+
+def warmup(modules_or_objects, *, recursive=True, auto=True,
+           cache=None, freeze=False):
+    """Computes ahead of time the signatures of every public callable
+    found in the given modules, so that later calls to `sigtools.signature`
+    are served from the cache.
+
+    :param modules_or_objects: A module, dotted module name or callable,
+        or an iterable of those. Modules are scanned for public callables:
+        the names in ``__all__`` if the module defines it, otherwise
+        those defined in that module whose names don't start with an
+        underscore. Classes are scanned for public methods.
+    :param bool recursive: Also scan the submodules of packages.
+    :param bool auto: Passed on to `sigtools.signature`.
+    :param cache: The `~sigtools.specifiers.SignatureCache` to fill and use
+        from then on. Defaults to the one that is currently enabled, or
+        a new, unbounded one.
+    :param bool freeze: Call `gc.freeze` once done, which moves every object
+        tracked by the garbage collector, including the cached signatures,
+        out of its reach. Do this right before forking worker processes
+        so that collections in the workers don't write to the memory pages
+        holding those objects, which then remain shared between processes.
+    :returns: a `WarmupReport`
+
+    ::
+
+        >>> import sigtools
+        >>> import myapp
+        >>> sigtools.warmup([myapp], freeze=True)
+        <WarmupReport resolved=1287 failed=3>
+
+    Bound methods are cached per instance, so the signatures of the methods
+    of objects created after warm-up are not cached.
+    """
+    if cache is None:
+        cache = _specifiers.get_cache()
+        if cache is None:
+            cache = _specifiers.SignatureCache(maxsize=None)
+    _specifiers.set_cache(cache)
+    if (
+            isinstance(modules_or_objects, (str, types.ModuleType))
+            or callable(modules_or_objects)
+        ):
+        modules_or_objects = [modules_or_objects]
+    report = WarmupReport(cache)
+    warmer = _Warmer(report, recursive, auto)
+    for obj in modules_or_objects:
+        warmer.visit(obj, _util.qualname(obj))
+    if freeze:
+        gc.freeze()
+    return report
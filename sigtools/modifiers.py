@@ -29,8 +29,15 @@ like you can :ref:`using Python 3 syntax <def>`. You can also mark and enforce
 parameters to be positional-only (`posoargs`). `autokwoargs` helps you quickly
 make your parameters with default values become keyword-only.
 
+By default these decorators wrap the function in an object that translates
+the arguments of each call. Pass ``native=True`` to have them generate a
+function whose parameters really are positional-only or keyword-only and
+which calls the decorated function directly.
+
 """
 
+import keyword
+import types
 from functools import partial, update_wrapper
 
 from sigtools import _util, _specifiers, _signatures
@@ -41,15 +48,21 @@ __all__ = ['annotate', 'kwoargs', 'autokwoargs', 'posoargs']
 class _PokTranslator(_util.OverrideableDataDesc):
     __slots__ = ['__self__', 'func', 'posoarg_names', 'kwoarg_names', 'kwopos', '__signature__']
 
-    def __new__(cls, func=None, posoargs=(), kwoargs=(), **kwargs):
+    def __new__(cls, func=None, posoargs=(), kwoargs=(), native=False,
+                **kwargs):
         if func is None:
             return partial(_PokTranslator, posoargs=posoargs,
-                           kwoargs=kwoargs, **kwargs)
+                           kwoargs=kwoargs, native=native, **kwargs)
         if posoargs or kwoargs:
-            return super(_PokTranslator, cls).__new__(cls)
+            ret = super(_PokTranslator, cls).__new__(cls)
+            if native:
+                ret.__init__(func, posoargs, kwoargs, **kwargs)
+                return _native(ret)
+            return ret
         return func
 
-    def __init__(self, func, posoargs=(), kwoargs=(), **kwargs):
+    def __init__(self, func, posoargs=(), kwoargs=(), native=False,
+                 **kwargs):
         update_wrapper(self, func)
         try:
             self.__self__ = func.__self__
@@ -132,7 +145,7 @@ class _PokTranslator(_util.OverrideableDataDesc):
 
     def _sigtools__autoforwards_hint(self, func):
         ast = _util.get_ast(self.func)
-        if ast is None:
+        if ast is None and not hasattr(self.func, '__code__'):
             return None
         sig = self.__signature__
         return self.func, ast, sig
@@ -171,8 +184,96 @@ class _PokTranslator(_util.OverrideableDataDesc):
             '<{0.func!r} with arg translation>'
             .format(self))
 
-@_PokTranslator(kwoargs=('start',))
-def kwoargs(start=None, *kwoarg_names):
+def _unused_name(name, taken):
+    while name in taken:
+        name += '_'
+    taken.add(name)
+    return name
+
+
+def _native_param(param, defaults, defaults_name):
+    if param.default is param.empty:
+        return param.name
+    defaults.append(param.default)
+    return '{0}={1}[{2}]'.format(param.name, defaults_name, len(defaults) - 1)
+
+
+def _native_source(name, sig, orig, func_name, defaults_name, defaults):
+    posargs, pokargs, varargs, kwoargs, varkwargs = \
+        _signatures.sort_params(sig)
+    params = [_native_param(p, defaults, defaults_name) for p in posargs]
+    if posargs:
+        params.append('/')
+    params.extend(_native_param(p, defaults, defaults_name) for p in pokargs)
+    if varargs:
+        params.append('*' + varargs.name)
+    elif kwoargs:
+        params.append('*')
+    params.extend(
+        _native_param(p, defaults, defaults_name) for p in kwoargs.values())
+    if varkwargs:
+        params.append('**' + varkwargs.name)
+
+    posargs, pokargs, varargs, kwoargs, varkwargs = \
+        _signatures.sort_params(orig)
+    args = [p.name for p in posargs + pokargs]
+    if varargs:
+        args.append('*' + varargs.name)
+    args.extend('{0}={0}'.format(p) for p in kwoargs)
+    if varkwargs:
+        args.append('**' + varkwargs.name)
+
+    return (
+        'def make({func}, {defaults}):\n'
+        '    def {name}({params}):\n'
+        '        return {func}({args})\n'
+        '    return {name}\n'
+        ).format(func=func_name, defaults=defaults_name, name=name,
+                 params=', '.join(params), args=', '.join(args))
+
+
+def _native_autoforwards_hint(func, obj):
+    if isinstance(obj, types.MethodType):
+        func = _util.safe_get(func, obj.__self__, type(obj.__self__))
+    ast = _util.get_ast(func)
+    if ast is None and not hasattr(func, '__code__'):
+        return None
+    return func, ast, _specifiers.forged_signature(obj, auto=False)
+
+
+def _native(translator):
+    """Generates a function with the parameters ``translator`` advertises,
+    which calls the translated function without further processing."""
+    func = translator.func
+    sig = translator.__signature__
+    orig = _specifiers.forged_signature(func, auto=False)
+    name = getattr(func, '__name__', None)
+    if (not isinstance(name, str) or not name.isidentifier()
+            or keyword.iskeyword(name)):
+        name = 'translated'
+    taken = set(sig.parameters)
+    taken.add(name)
+    func_name = _unused_name('func', taken)
+    defaults_name = _unused_name('defaults', taken)
+    defaults = []
+    source = _native_source(
+        name, sig, orig, func_name, defaults_name, defaults)
+    namespace = {}
+    exec(compile(source, '<sigtools native>', 'exec'), namespace)
+    ret = namespace['make'](func, tuple(defaults))
+    update_wrapper(ret, func)
+    try:
+        del ret._sigtools__forger
+    except AttributeError:
+        pass
+    ret.__signature__ = sig.replace(
+        sources=_signatures.copy_sources(sig.sources, {translator: ret}))
+    ret._sigtools__autoforwards_hint = partial(_native_autoforwards_hint, func)
+    return ret
+
+
+@_PokTranslator(kwoargs=('start', 'native'))
+def kwoargs(start=None, native=False, *kwoarg_names):
     """Marks the given parameters as keyword-only, avoiding the use of
     python3 syntax.
 
@@ -187,6 +288,9 @@ def kwoargs(start=None, *kwoarg_names):
 
     :param str start: If given and is the name of a parameter, it and all
         parameters after it are made keyword-only
+    :param bool native: Generate a function that has the keyword-only
+        parameters and calls the decorated function directly, rather than
+        translating arguments on each call.
     :param str kwoarg_names: Names of the parameters to convert
 
     :raises: `ValueError` if end or one of posoarg_names isn't in the
@@ -195,13 +299,13 @@ def kwoargs(start=None, *kwoarg_names):
     assert all(isinstance(s, str) for s in kwoarg_names), \
         "argument names must be strings; forgot to put () after @kwoargs?"
     if start is not None:
-        return partial(_kwoargs_start, start, kwoarg_names)
+        return partial(_kwoargs_start, start, kwoarg_names, native)
     if not kwoarg_names:
         return _util.noop
-    return partial(_PokTranslator, kwoargs=kwoarg_names)
+    return partial(_PokTranslator, kwoargs=kwoarg_names, native=native)
 # my syntax highlighter is broken """
 
-def _kwoargs_start(start, _kwoargs, func, *args, **kwargs):
+def _kwoargs_start(start, _kwoargs, native, func, *args, **kwargs):
     kwoarg_names = set(_kwoargs)
     found = False
     sig = _specifiers.forged_signature(func, auto=False).parameters.values()
@@ -216,11 +320,11 @@ def _kwoargs_start(start, _kwoargs, func, *args, **kwargs):
         raise ValueError('{0!r} not found in {1.__name__}{2}'.format(
             start, func, sig))
     return _PokTranslator(
-        func, kwoargs=kwoarg_names,
-        get=partial(_kwoargs_start, start, _kwoargs))
+        func, kwoargs=kwoarg_names, native=native,
+        get=partial(_kwoargs_start, start, _kwoargs, False))
 
-@kwoargs('end')
-def posoargs(end=None, *posoarg_names):
+@kwoargs('end', 'native')
+def posoargs(end=None, native=False, *posoarg_names):
     """Marks the given parameters as positional-only.
 
     If the resulting function is passed any named arguments that references a
@@ -242,6 +346,9 @@ def posoargs(end=None, *posoarg_names):
 
     :param str end: If given and is the name of a parameter, it and all
         parameters leading to it are made positional-only.
+    :param bool native: Generate a function that has the positional-only
+        parameters and calls the decorated function directly, rather than
+        translating arguments on each call.
     :param str posoarg_names: Names of the parameters to convert
 
     :raises: `ValueError` if end or one of posoarg_names isn't in the
@@ -250,12 +357,12 @@ def posoargs(end=None, *posoarg_names):
     assert all(isinstance(s, str) for s in posoarg_names), \
         "argument names must be strings"
     if end is not None:
-        return partial(_posoargs_end, end, posoarg_names)
+        return partial(_posoargs_end, end, posoarg_names, native)
     if not posoarg_names:
         return _util.noop
-    return partial(_PokTranslator, posoargs=posoarg_names)
+    return partial(_PokTranslator, posoargs=posoarg_names, native=native)
 
-def _posoargs_end(end, _posoargs, func, *args, **kwargs):
+def _posoargs_end(end, _posoargs, native, func, *args, **kwargs):
     posoarg_names = set(_posoargs)
     found = False
     sig = _specifiers.forged_signature(func, auto=False).parameters.values()
@@ -271,14 +378,16 @@ def _posoargs_end(end, _posoargs, func, *args, **kwargs):
         raise ValueError('{0!r} not found in {1.__name__}{2}'.format(
             end, func, sig))
     return _PokTranslator(
-        func, posoargs=posoarg_names,
-        get=partial(_posoargs_end, end, _posoargs))
+        func, posoargs=posoarg_names, native=native,
+        get=partial(_posoargs_end, end, _posoargs, False))
 
-@kwoargs('exceptions')
-def autokwoargs(func=None, exceptions=()):
+@kwoargs('exceptions', 'native')
+def autokwoargs(func=None, exceptions=(), native=False):
     """Marks all arguments with default values as keyword-only.
 
     :param sequence exceptions: names of parameters not to convert
+    :param bool native: Generate a function with actual keyword-only
+        parameters, like with `kwoargs`.
 
     ::
 
@@ -294,13 +403,13 @@ def autokwoargs(func=None, exceptions=()):
     """
     if func is not None:
         if callable(func):
-            return _autokwoargs(exceptions, func)
+            return _autokwoargs(exceptions, native, func)
         else:
             raise ValueError("exceptions must be passed by name")
     else:
-        return partial(_autokwoargs, exceptions)
+        return partial(_autokwoargs, exceptions, native)
 
-def _autokwoargs(exceptions, func):
+def _autokwoargs(exceptions, native, func):
     sig = _specifiers.forged_signature(func, auto=False)
     args = []
     exceptions = set(exceptions)
@@ -317,7 +426,7 @@ def _autokwoargs(exceptions, func):
         raise ValueError(
             "parameters referred to by 'exceptions' not present: "
             + ' '.join(repr(name) for name in exceptions))
-    return kwoargs(*args)(func)
+    return kwoargs(*args, native=native)(func)
 
 class annotate(object):
     """Annotates a function, avoiding the use of python3 syntax
@@ -33,14 +33,99 @@ individually. They are most notably used by the decorators from
 from sigtools._signatures import (
     signature,
     IncompatibleSignatures,
-    UpgradedSignature, UpgradedParameter, UpgradedAnnotation,
+    UpgradedSignature, UpgradedParameter, UpgradedAnnotation, SourceMap,
     sort_params, apply_params,
-    merge, embed, mask, forwards
+    merge, embed, mask, forwards,
+    OperationCache, InternPool
     )
+from sigtools import _signatures
 
 __all__ = [
     'signature',
     'merge', 'embed', 'mask', 'forwards', 'IncompatibleSignatures',
     'UpgradedSignature', 'UpgradedParameter', 'UpgradedAnnotation',
-    'sort_params', 'apply_params',
+    'SourceMap', 'sort_params', 'apply_params',
+    'OperationCache', 'enable_cache', 'disable_cache',
+    'InternPool', 'enable_interning', 'disable_interning',
     ]
+
+
+def enable_cache(maxsize=1024):
+    """Makes `merge`, `embed`, `mask` and `forwards` remember the
+    signatures they compute.
+
+    :param maxsize: How many signatures to keep before evicting the least
+        recently used ones, or `None` for no limit.
+    :returns: The `OperationCache` that is now in use. If a cache was
+        already enabled, it is kept and resized.
+
+    ::
+
+        >>> from sigtools import signatures, support
+        >>> cache = signatures.enable_cache()
+        >>> def deco(func):
+        ...     def wrapper(*args, verbose=False, **kwargs):
+        ...         return func(*args, **kwargs)
+        ...     return wrapper
+        ...
+        >>> for func in [support.f('a, b'), support.f('a, b')]:
+        ...     print(signatures.embed(
+        ...         signatures.signature(deco(func)),
+        ...         signatures.signature(func)))
+        ...
+        (a, b, *, verbose=False)
+        (a, b, *, verbose=False)
+        >>> cache.hits
+        1
+
+    See :ref:`operation cache` for how entries are shared.
+    """
+    cache = _signatures.get_operation_cache()
+    if cache is None:
+        cache = OperationCache(maxsize)
+        _signatures.set_operation_cache(cache)
+    else:
+        cache.maxsize = maxsize
+    return cache
+
+
+def disable_cache():
+    """Stops caching the results of `merge`, `embed`, `mask` and
+    `forwards`, and discards the current cache."""
+    _signatures.set_operation_cache(None)
+
+
+def enable_interning(maxsize=4096):
+    """Makes `sigtools.signature` share one instance between the
+    structurally identical parameters and signatures it returns.
+
+    :param maxsize: How many parameters, and how many signatures, to keep
+        before dropping the least recently used ones, or `None` for no
+        limit.
+    :returns: The `InternPool` that is now in use. If a pool was already
+        in use, it is kept and resized.
+
+    ::
+
+        >>> from sigtools import signatures, specifiers
+        >>> pool = signatures.enable_interning()
+        >>> def func(request, timeout=None):
+        ...     pass
+        ...
+        >>> specifiers.signature(func) is specifiers.signature(func)
+        True
+
+    See :ref:`interning` for what is shared.
+    """
+    pool = _signatures.get_intern_pool()
+    if pool is None:
+        pool = InternPool(maxsize)
+        _signatures.set_intern_pool(pool)
+    else:
+        pool.maxsize = maxsize
+    return pool
+
+
+def disable_interning():
+    """Stops interning signatures and discards the current pool."""
+    _signatures.set_intern_pool(None)
@@ -37,16 +37,24 @@ This should cover most use cases, but you can use `forger_function` or
 
 """
 
+import os
+import threading
 from functools import partial, update_wrapper
 
-from sigtools import _util, modifiers, signatures, _specifiers
+from sigtools import _util, modifiers, signatures, _specifiers, _bulk
+from sigtools import _autoforwards
 
 __all__ = [
     'signature',
     'forwards_to_function', 'forwards_to_method',
     'forwards_to_super', 'apply_forwards_to_super',
     'forwards',
-    'forger_function', 'set_signature_forger', 'as_forged'
+    'forger_function', 'set_signature_forger', 'as_forged',
+    'SignatureCache', 'enable_cache', 'disable_cache', 'prefilter_stats',
+    'Budget', 'enable_budget', 'disable_budget',
+    'explain',
+    'describe', 'describe_many', 'SignatureDescription',
+    'ParameterDescription',
     ]
 
 
@@ -56,9 +64,156 @@ _kwowr = modifiers.kwoargs('obj')
 signature = _specifiers.forged_signature
 
 
+SignatureCache = _specifiers.SignatureCache
+
+
+prefilter_stats = _autoforwards.prefilter_stats
+
+
+Budget = _specifiers.Budget
+
+
+describe = _bulk.describe
+describe_many = _bulk.describe_many
+SignatureDescription = _bulk.SignatureDescription
+ParameterDescription = _bulk.ParameterDescription
+
+
+def explain(obj, auto=True, args=(), kwargs={}):
+    """Computes the signature of ``obj`` like `signature` does, while
+    recording each step of the resolution and how long it took.
+
+    :returns: A `~sigtools._trace.Step` describing the call to `signature`.
+        The computed signature is available as its ``result`` attribute.
+
+    Each step has a ``name``, a ``subject``, a ``duration`` in seconds,
+    an ``outcome`` and ``children``. The outcome of a step that did not
+    complete, for instance because automatic signature discovery had to give
+    up, holds the reason why. Use ``format()`` to get a readable tree, here
+    with the durations elided::
+
+        >>> from sigtools import specifiers
+        >>> def inner(a, b):
+        ...     pass
+        ...
+        >>> def outer(c, *args, **kwargs):
+        ...     inner(*args, **kwargs)
+        ...
+        >>> print(specifiers.explain(outer).format())  # doctest: +ELLIPSIS
+        forged_signature outer: ...ms ok
+          autoforwards outer: ...ms ok
+            get_ast outer: ...ms ok
+              parse <doctest ...>: ...ms ok
+            CallListerVisitor outer: ...ms ok
+            forward inner: ...ms ok
+              forged_signature inner: ...ms ok
+                autoforwards inner: ...ms UnusableCode: no *args or **kwargs parameter
+                signature inner: ...ms ok
+              mask: ...ms ok
+              embed: ...ms ok
+            merge: ...ms ok
+
+    """
+    return _specifiers.explain(obj, auto, args, kwargs)
+
+
+def enable_cache(maxsize=1024, directory=None):
+    """Makes `signature` remember the signatures it computes.
+
+    :param maxsize: How many signatures to keep before evicting the least
+        recently used ones, or `None` for no limit.
+    :param directory: Where to store signatures so that later processes
+        can reuse them. See :ref:`persistent signature cache`.
+    :returns: The `SignatureCache` that is now in use. If a cache was
+        already enabled, it is kept and resized, unless it stores signatures
+        in a different directory.
+
+    ::
+
+        >>> from sigtools import specifiers
+        >>> cache = specifiers.enable_cache(maxsize=4096)
+        >>> def func(a, b):
+        ...     pass
+        ...
+        >>> specifiers.signature(func) is specifiers.signature(func)
+        True
+        >>> cache.hits
+        1
+
+    See :ref:`signature cache` for what invalidates cache entries.
+    """
+    cache = _specifiers.get_cache()
+    if cache is None or (
+            directory is not None
+            and os.fspath(directory) != cache.directory
+        ):
+        cache = SignatureCache(maxsize, directory)
+        _specifiers.set_cache(cache)
+    else:
+        cache.maxsize = maxsize
+    return cache
+
+
+def disable_cache():
+    """Stops caching signatures and discards the current cache."""
+    _specifiers.set_cache(None)
+
+
+def enable_budget(time=None, nodes=None, depth=None):
+    """Limits the work `signature` may do in automatic signature discovery,
+    to bound its latency on very large functions.
+
+    :param float time: Wall time, in seconds, one call may take.
+    :param int nodes: How many AST nodes or bytecode instructions one call
+        may examine.
+    :param int depth: How many levels of forwarding one call may follow.
+    :returns: The `Budget` that is now in use.
+
+    When a call runs out of budget, it returns the signature it would
+    return with ``auto=False``, and that signature isn't cached.
+
+    ::
+
+        >>> from sigtools import specifiers
+        >>> def inner(a, b):
+        ...     pass
+        ...
+        >>> def outer(*args, **kwargs):
+        ...     return inner(*args, **kwargs)
+        ...
+        >>> budget = specifiers.enable_budget(depth=0)
+        >>> print(specifiers.signature(outer))
+        (*args, **kwargs)
+        >>> budget.last_reason
+        'depth budget of 0 exceeded'
+        >>> specifiers.disable_budget()
+        >>> print(specifiers.signature(outer))
+        (a, b)
+
+    See :ref:`discovery budget`.
+    """
+    budget = Budget(time, nodes, depth)
+    _specifiers.set_budget(budget)
+    return budget
+
+
+def disable_budget():
+    """Lets automatic signature discovery do as much work as it needs."""
+    _specifiers.set_budget(None)
+
+
 class _AsForged(object):
     def __init__(self):
-        self.currently_computing = set()
+        self._local = threading.local()
+
+    @property
+    def currently_computing(self):
+        """Objects whose signature is being computed by this thread."""
+        try:
+            return self._local.computing
+        except AttributeError:
+            computing = self._local.computing = set()
+            return computing
 
     def __get__(self, instance, owner):
         obj = owner if instance is None else instance
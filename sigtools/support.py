@@ -345,6 +345,107 @@ def bind_callsig(sig, args, kwargs):
     return assigned
 
 
+class _CallsigClassifier(object):
+    """Classifies ways to call a signature with integer operations, as
+    `bind_callsig` would, from bitmasks of the names of its parameters."""
+
+    def __init__(self, sig):
+        pospars, pokpars, varargs, kwopars, varkwargs = \
+            signatures.sort_params(sig)
+        positional = pospars + pokpars
+        named = positional + list(kwopars.values())
+        self.bits = dict(
+            (param.name, 1 << i) for i, param in enumerate(named))
+        self.positional_names = [param.name for param in positional]
+        self.positional_only = sum(self.bits[param.name] for param in pospars)
+        self.keyword = sum(
+            self.bits[param.name]
+            for param in itertools.chain(pokpars, kwopars.values()))
+        self.required = sum(
+            self.bits[param.name] for param in named
+            if param.default is param.empty)
+        # the parameters filled by the first i positional arguments
+        self.filled = [(1 << i) - 1 for i in range(len(positional) + 1)]
+        self.varargs = varargs.name if varargs else None
+        self.varkwargs = varkwargs.name if varkwargs else None
+        self.omitted = [
+            (param.name,
+             () if param.kind == param.VAR_POSITIONAL else param.default)
+            for param in sig.parameters.values()
+            if param.kind != param.VAR_KEYWORD]
+
+    def names(self, kwargs):
+        """Returns the mask of parameters named in ``kwargs``, and whether
+        it names anything else."""
+        mask = 0
+        unknown = False
+        for name in kwargs:
+            bit = self.bits.get(name)
+            if bit is None:
+                unknown = True
+            else:
+                mask |= bit
+        return mask, unknown
+
+    def classify(self, callsigs):
+        """Returns ``(valid, invalid)`` like `sort_callsigs`."""
+        capacity = len(self.positional_names)
+        # for each number of positional arguments, the named parameters
+        # that conflict with them and those still required
+        conflicts = [self.positional_only | filled for filled in self.filled]
+        missing = [self.required & ~filled for filled in self.filled]
+        has_varargs = self.varargs is not None
+        masks = {}
+        bind = self.bind
+        valid = []
+        invalid = []
+        for args, kwargs in callsigs:
+            count = len(args)
+            if count > capacity:
+                if not has_varargs:
+                    invalid.append((args, kwargs))
+                    continue
+                count = capacity
+            # make_up_callsigs pairs each dict with every args tuple
+            try:
+                mask = masks[id(kwargs)][1]
+            except KeyError:
+                mask, unknown = self.names(kwargs)
+                if unknown and self.varkwargs is None:
+                    mask = None
+                # keeping kwargs alive keeps its id unique
+                masks[id(kwargs)] = kwargs, mask
+            if (mask is None
+                    or mask & conflicts[count] or missing[count] & ~mask):
+                invalid.append((args, kwargs))
+            else:
+                valid.append((args, kwargs, bind(args, kwargs)))
+        return valid, invalid
+
+    def bind(self, args, kwargs):
+        """Returns what `bind_callsig` does for a valid way to call the
+        signature."""
+        bound = {}
+        varkwargs = self.varkwargs
+        if varkwargs is not None:
+            extra = bound[varkwargs] = {}
+        bound.update(zip(self.positional_names, args))
+        capacity = len(self.positional_names)
+        if len(args) > capacity:
+            bound[self.varargs] = tuple(args[capacity:])
+        keyword = self.keyword
+        bits = self.bits
+        for key, value in kwargs.items():
+            if keyword & bits.get(key, 0):
+                bound[key] = value
+            else:
+                extra[key] = value
+        for name, default in self.omitted:
+            if name not in bound:
+                bound[name] = default
+        return bound
+
+
 DEBUG_STDLIB=False
 
 
@@ -362,30 +463,23 @@ def sort_callsigs(sig, callsigs):
         ``ìnvalid``
             ``(args, kwargs)``
     """
-    valid = []
-    invalid = []
+    valid, invalid = _CallsigClassifier(sig).classify(callsigs)
 
-    for args, kwargs in callsigs:
-        try:
-            bound = bind_callsig(sig, args, kwargs)
-        except TypeError:
-            if DEBUG_STDLIB:
-                try:
-                    sig.bind(*args, **kwargs)
-                except TypeError:
-                    pass
-                else:
-                    warn('{0}.bind(*{1}, **{2}) didn\'t raise TypeError'
-                         .format(sig, args, kwargs))
-            invalid.append((args, kwargs))
-        else:
-            valid.append((args, kwargs, bound))
-            if DEBUG_STDLIB:
-                try:
-                    sig.bind(*args, **kwargs)
-                except TypeError as e:
-                    warn('{0}.bind(*{1}, **{2}) raised TypeError: {3}'
-                         .format(sig, args, kwargs, e))
+    if DEBUG_STDLIB:
+        for args, kwargs, bound in valid:
+            try:
+                sig.bind(*args, **kwargs)
+            except TypeError as e:
+                warn('{0}.bind(*{1}, **{2}) raised TypeError: {3}'
+                     .format(sig, args, kwargs, e))
+        for args, kwargs in invalid:
+            try:
+                sig.bind(*args, **kwargs)
+            except TypeError:
+                pass
+            else:
+                warn('{0}.bind(*{1}, **{2}) didn\'t raise TypeError'
+                     .format(sig, args, kwargs))
 
     return valid, invalid
 
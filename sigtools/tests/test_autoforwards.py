@@ -22,9 +22,16 @@
 from functools import partial, wraps
 from mock import patch
 import ast
+import functools
+import linecache
+import os
+import shutil
+import sys
+import tempfile
+import importlib
 
 from sigtools import support, modifiers, specifiers, signatures, _util, _autoforwards
-from sigtools.tests.util import Fixtures, tup
+from sigtools.tests.util import Fixtures, SignatureTests, tup
 
 
 _wrapped = support.f('x, y, *, z', name='_wrapped')
@@ -367,6 +374,29 @@ class UnresolvableAutoforwardsTests(Fixtures):
         a = A()
         self._test(a.method, ensure_incoherent=False)
 
+    @tup(False)
+    def ternary_callee(a, *args, **kwargs):
+        return (_wrapped if a else func)(*args, **kwargs)
+
+    @tup(False)
+    def or_callee(a, *args, **kwargs):
+        return (a or _wrapped)(*args, **kwargs)
+
+    @tup(False)
+    def and_callee(a, *args, **kwargs):
+        return (a and _wrapped)(*args, **kwargs)
+
+    class _Conditional(object):
+        def a(self, p):
+            pass
+        def b(self, q):
+            pass
+        def method(self, c, *args, **kwargs):
+            return (self.a if c else self.b)(*args, **kwargs)
+
+    def test_conditional_attribute_callee(self):
+        self._test(self._Conditional().method, ensure_incoherent=False)
+
     @tup(False)
     def attribute_on_unset(*a, **k):
         doesntexist.method(*a, **k) # pyflakes: silence
@@ -375,6 +405,10 @@ class UnresolvableAutoforwardsTests(Fixtures):
     def constant(a, *p, **k):
         None(*p, **k)
 
+    @tup(False)
+    def partial_of_varargs(*args, **kwargs):
+        return partial(*args, **kwargs)
+
     @tup()
     def not_callable(a, *p, **k):
         not_callable(*p, **k)
@@ -524,3 +558,517 @@ class UnresolvableAutoforwardsWithSourcesTests(Fixtures):
     @tup('v, w, *a, **k', {0: 'vwak'})
     def double_kwargs(v, w, *a, **k):
         _wrapped(**k, **w)
+
+
+def _diamond_leaf(a, *, b):
+    raise NotImplementedError
+
+
+def _diamond_left(*args, **kwargs):
+    return _diamond_leaf(*args, **kwargs)
+
+
+def _diamond_right(*args, **kwargs):
+    return _diamond_leaf(*args, **kwargs)
+
+
+def _diamond_top(*args, **kwargs):
+    _diamond_left(*args, **kwargs)
+    _diamond_right(*args, **kwargs)
+
+
+def _diamond_twice(*args, **kwargs):
+    _diamond_top(*args, **kwargs)
+    _diamond_top(*args, **kwargs)
+
+
+class ResolutionMemoTests(Fixtures):
+    def _test(self, func, expected, count):
+        calls = []
+        def forger(obj):
+            calls.append(obj)
+            return signatures.signature(obj)
+        specifiers.set_signature_forger(_diamond_leaf, forger)
+        self.addCleanup(delattr, _diamond_leaf, '_sigtools__forger')
+        self.assertSigsEqual(specifiers.signature(func), support.s(expected))
+        self.assertEqual(len(calls), count)
+        specifiers.signature(func)
+        self.assertEqual(len(calls), 2 * count)
+
+    diamond = _diamond_top, 'a, *, b', 1
+    nested_diamonds = _diamond_twice, 'a, *, b', 1
+    leaf = _diamond_leaf, 'a, *, b', 1
+
+
+def _no_forwarding(a, *args):
+    return args
+
+
+def _starargs_unused(a, *args, **kwargs):
+    return _wrapped(*a)
+
+
+def _starargs_sliced(a, *args):
+    return _wrapped(*args[1:])
+
+
+class UnusableCodeTests(Fixtures):
+    def _test(self, func, reason, expected):
+        expected = support.s(expected)
+        _autoforwards.forget_unusable_code()
+        self.addCleanup(_autoforwards.forget_unusable_code)
+        self.assertSigsEqual(specifiers.signature(func), expected)
+        self.assertEqual(_autoforwards._unusable_code[func.__code__], reason)
+        with patch.object(_autoforwards, 'own_signature') as own_signature:
+            with patch.object(_util, 'get_ast') as get_ast:
+                self.assertSigsEqual(specifiers.signature(func), expected)
+        self.assertFalse(own_signature.called)
+        self.assertFalse(get_ast.called)
+
+    no_source = (
+        support.f('a, *args, **kwargs'),
+        'no call unpacks *args or **kwargs', 'a, *args, **kwargs')
+    no_starargs = (
+        _diamond_leaf, 'no *args or **kwargs parameter', 'a, *, b')
+
+    no_star_call = (
+        _no_forwarding, 'no call unpacks *args or **kwargs', 'a, *args')
+    starargs_unused = (
+        _starargs_unused, '*args and **kwargs are never used',
+        'a, *args, **kwargs')
+    no_forwarding = (
+        _starargs_sliced, 'No forwarding of *args, **kwargs found',
+        'a, *args')
+
+    def test_code_replaced(self):
+        def func(a, *args, **kwargs):
+            pass
+        def other(a, *args, **kwargs):
+            _wrapped(*args, **kwargs)
+        _autoforwards.forget_unusable_code()
+        self.addCleanup(_autoforwards.forget_unusable_code)
+        self.assertSigsEqual(
+            specifiers.signature(func), support.s('a, *args, **kwargs'))
+        func.__code__ = other.__code__
+        self.assertSigsEqual(
+            specifiers.signature(func), support.s('a, x, y, *, z'))
+
+    def test_not_remembered(self):
+        def func(*args, **kwargs):
+            doesntexist(*args, **kwargs) # pyflakes: silence
+        _autoforwards.forget_unusable_code()
+        self.addCleanup(_autoforwards.forget_unusable_code)
+        specifiers.signature(func)
+        self.assertNotIn(func.__code__, _autoforwards._unusable_code)
+
+
+class OwnSignatureTests(SignatureTests):
+    def test_function(self):
+        func = support.f('a, *args, **kwargs')
+        func.__signature__ = support.s('x')
+        func.__wrapped__ = _wrapped
+        self.assertSigsEqual(
+            _autoforwards.own_signature(func), support.s('a, *args, **kwargs'))
+        self.assertSigsEqual(func.__signature__, support.s('x'))
+
+    def test_instance_signature(self):
+        class Callable(object):
+            def __call__(self, a, *args, **kwargs):
+                raise NotImplementedError
+        obj = Callable()
+        obj.__signature__ = support.s('x')
+        sig = _autoforwards.own_signature(obj)
+        self.assertSigsEqual(sig, support.s('a, *args, **kwargs'))
+        self.assertEqual(sig.sources['a'], [obj])
+        self.assertSigsEqual(obj.__signature__, support.s('x'))
+
+    def test_class_signature(self):
+        class Cls(object):
+            __signature__ = support.s('x')
+            def __init__(self, a):
+                raise NotImplementedError
+        with self.assertRaises(_autoforwards.UnusableCode):
+            _autoforwards.own_signature(Cls)
+
+
+class PrefilterTests(Fixtures):
+    def _test(self, func, skipped):
+        stats = _autoforwards.prefilter_stats
+        _autoforwards.forget_unusable_code()
+        _autoforwards.forget_calls()
+        self.addCleanup(_autoforwards.forget_unusable_code)
+        stats.reset()
+        with patch.object(_util, 'get_ast', wraps=_util.get_ast) as get_ast:
+            specifiers.signature(func)
+        self.assertEqual((stats.checked, stats.skipped), (1, int(skipped)))
+        self.assertEqual(get_ast.called, not skipped)
+
+    no_star_call = _no_forwarding, True
+    starargs_unused = _starargs_unused, True
+    starargs_sliced = _starargs_sliced, False
+    forwarding = _diamond_left, False
+    in_closure = AutoforwardsTests.subdef[0], False
+    in_lambda = AutoforwardsTests.subdef_lambda[0], False
+    to_partial = AutoforwardsTests.pass_to_partial[0], False
+
+    def test_many_parameters(self):
+        names = ', '.join('a{0}'.format(i) for i in range(300))
+        namespace = {}
+        exec('def func({0}, *args, **kwargs):\n'
+             '    return len(*a0)\n'.format(names), namespace)
+        expected = support.s(names + ', *args, **kwargs')
+        _autoforwards.prefilter_stats.reset()
+        self.assertSigsEqual(specifiers.signature(namespace['func']), expected)
+        self.assertEqual(_autoforwards.prefilter_stats.skipped, 0)
+
+    def test_repr(self):
+        self.assertRegex(
+            repr(_autoforwards.prefilter_stats),
+            r'^<PrefilterStats checked=\d+ skipped=\d+>$')
+
+
+class ForwardingCallsTests(SignatureTests):
+    def setUp(self):
+        _autoforwards.forget_calls()
+        self.addCleanup(_autoforwards.forget_calls)
+
+    def test_listed_once_per_code(self):
+        class A(object):
+            def __init__(self, wrapped):
+                self.wrapped = wrapped
+            def method(self, *args, **kwargs):
+                return self.wrapped(*args, **kwargs)
+        with patch.object(_autoforwards, 'CallListerVisitor',
+                          wraps=_autoforwards.CallListerVisitor) as visitor:
+            self.assertSigsEqual(
+                specifiers.signature(A(_wrapped).method),
+                support.s('x, y, *, z'))
+            self.assertSigsEqual(
+                specifiers.signature(A(_diamond_leaf).method),
+                support.s('a, *, b'))
+        self.assertEqual(visitor.call_count, 1)
+
+    def test_only_forwarding_calls(self):
+        calls = _autoforwards.forwarding_calls(
+            AutoforwardsTests.args_passed_to_func[0])
+        self.assertEqual(
+            [(call.wrapped.name, call.use_varargs, call.use_varkwargs)
+             for call in calls],
+            [('_wrapped', True, True)])
+
+    def test_forget(self):
+        func = AutoforwardsTests.global_[0]
+        calls = _autoforwards.forwarding_calls(func)
+        self.assertIs(_autoforwards.forwarding_calls(func), calls)
+        _autoforwards.forget_calls()
+        self.assertIsNot(_autoforwards.forwarding_calls(func), calls)
+
+    def test_slotted_markers(self):
+        for marker in [
+                _autoforwards.Name('a'), _autoforwards.Arg('a'),
+                _autoforwards.Attribute(_autoforwards.Name('a'), 'b'),
+                _autoforwards.Unknown()]:
+            self.assertFalse(hasattr(marker, '__dict__'))
+
+
+_indexed_source = """\
+import functools
+
+def plain(a, *args, **kwargs):
+    return _target(*args, **kwargs)
+
+def identity(func):
+    return func
+
+@identity
+@functools.lru_cache()
+def decorated(b, *args, **kwargs):
+    return _target(*args, **kwargs)
+
+async def coroutine(c, *args, **kwargs):
+    return _target(*args, **kwargs)
+
+class Cls:
+    def method(self, *args, **kwargs):
+        return _target(*args, **kwargs)
+
+lam = lambda *args, **kwargs: _target(*args, **kwargs)
+lam1, lam2 = lambda *a: _target(*a), lambda *a: _target(*a)
+
+def _target(x, y):
+    pass
+"""
+
+
+class GetAstTests(SignatureTests):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.name = 'sigtools_indexed_{0}'.format(id(self))
+        self.filename = os.path.join(self.path, self.name + '.py')
+        self.write(_indexed_source)
+        sys.path.insert(0, self.path)
+        self.module = importlib.import_module(self.name)
+        _util.clear_ast_cache()
+
+    def tearDown(self):
+        _util.clear_ast_cache()
+        sys.path.remove(self.path)
+        sys.modules.pop(self.name, None)
+        shutil.rmtree(self.path)
+
+    def write(self, source):
+        with open(self.filename, 'w') as fh:
+            fh.write(source)
+
+    def get_asts(self, *funcs):
+        with patch.object(_util.ast, 'parse', wraps=ast.parse) as parse:
+            nodes = [_util.get_ast(func) for func in funcs]
+        return parse.call_count, nodes
+
+    def test_parsed_once(self):
+        m = self.module
+        count, nodes = self.get_asts(
+            m.plain, m.decorated.__wrapped__, m.coroutine, m.Cls.method,
+            m.lam)
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            [type(node).__name__ for node in nodes],
+            ['FunctionDef', 'FunctionDef', 'AsyncFunctionDef',
+             'FunctionDef', 'Lambda'])
+        self.assertEqual(
+            [getattr(node, 'name', None) for node in nodes],
+            ['plain', 'decorated', 'coroutine', 'method', None])
+        self.assertEqual(self.get_asts(m.plain)[0], 0)
+
+    def test_signatures(self):
+        m = self.module
+        for func, expected in [
+                (m.plain, 'a, x, y'),
+                (m.coroutine, 'c, x, y'),
+                (m.Cls().method, 'x, y'),
+                (m.lam, 'x, y'),
+                ]:
+            self.assertSigsEqual(specifiers.signature(func), support.s(expected))
+
+    def test_ambiguous_lambdas(self):
+        self.assertEqual(self.get_asts(self.module.lam1), (1, [None]))
+
+    def test_changed_file(self):
+        plain = self.module.plain
+        self.get_asts(plain)
+        self.write(_indexed_source.replace('(a, ', '(a, b=1, '))
+        count, (node,) = self.get_asts(plain)
+        self.assertEqual(count, 1)
+        self.assertEqual([arg.arg for arg in node.args.args], ['a', 'b'])
+
+    def test_linecache_source(self):
+        filename = '<sigtools-test-{0}>'.format(id(self))
+        source = 'def func(*args, **kwargs):\n    _target(*args, **kwargs)\n'
+        lines = source.splitlines(True)
+        linecache.cache[filename] = len(source), None, lines, filename
+        self.addCleanup(linecache.cache.pop, filename)
+        namespace = {'_target': self.module._target}
+        exec(compile(source, filename, 'exec'), namespace)
+        count, (node,) = self.get_asts(namespace['func'])
+        self.assertEqual((count, node.name), (1, 'func'))
+        self.assertEqual(self.get_asts(namespace['func'])[0], 0)
+        self.assertSigsEqual(
+            specifiers.signature(namespace['func']), support.s('x, y'))
+
+    def test_bounded(self):
+        funcs = []
+        for i in range(3):
+            filename = '<sigtools-test-{0}-{1}>'.format(id(self), i)
+            source = 'def func():\n    pass\n'
+            linecache.cache[filename] = (
+                len(source), None, source.splitlines(True), filename)
+            self.addCleanup(linecache.cache.pop, filename)
+            namespace = {}
+            exec(compile(source, filename, 'exec'), namespace)
+            funcs.append(namespace['func'])
+        with patch.object(_util, '_MAX_PARSED_FILES', 2):
+            self.assertEqual(self.get_asts(*funcs)[0], 3)
+            self.assertEqual(len(_util._parsed_files), 2)
+            self.assertEqual(self.get_asts(funcs[2], funcs[1])[0], 0)
+            self.assertEqual(self.get_asts(funcs[0])[0], 1)
+            self.assertEqual(self.get_asts(funcs[1])[0], 0)
+            self.assertEqual(self.get_asts(funcs[2])[0], 1)
+
+
+def _marker_key(marker):
+    if isinstance(marker, _autoforwards.Attribute):
+        return 'attribute', _marker_key(marker.value), marker.attr
+    elif isinstance(marker, _autoforwards.Marker):
+        return type(marker).__name__.lower(), marker.name
+    elif isinstance(marker, _autoforwards.Unknown):
+        return 'unknown'
+    return marker
+
+
+def _forwarding_calls(calls):
+    return [
+        (_marker_key(call.wrapped), [_marker_key(arg) for arg in call.args],
+         sorted((name, _marker_key(value))
+                for name, value in call.kwargs.items()),
+         _marker_key(call.varargs), _marker_key(call.varkwargs))
+        + tuple(call[5:])
+        for call in calls if call.use_varargs or call.use_varkwargs]
+
+
+class BytecodeCallListerTests(Fixtures):
+    def _test(self, func):
+        func = getattr(func, '__func__', func)
+        expected = _autoforwards.CallListerVisitor(_util.get_ast(func))
+        found = _autoforwards.BytecodeCallLister(func.__code__)
+        self.assertEqual(
+            _forwarding_calls(found), _forwarding_calls(expected))
+
+    _fwd = AutoforwardsTests
+    _unres = UnresolvableAutoforwardsTests
+
+    global_ = _fwd.global_[0],
+    closure = _fwd.closure[0],
+    args = _fwd.args[0],
+    using_other_varargs = _fwd.using_other_varargs[0],
+    subdef = _fwd.subdef[0],
+    subdef_lambda = _fwd.subdef_lambda[0],
+    rebind_in_subdef = _fwd.rebind_in_subdef[0],
+    rebind_subdef_param = _fwd.rebind_subdef_param[0],
+    global_attribute = _fwd.global_attribute[0],
+    deeparg_kwo = _fwd.deeparg_kwo[0],
+    call_in_args = _fwd.call_in_args[0],
+    call_in_varkwargs = _fwd.call_in_varkwargs[0],
+    unknown_args = _fwd.unknown_args[0],
+    pass_to_partial_with_args = _fwd.pass_to_partial_with_args[0],
+    args_passed_to_func = _fwd.args_passed_to_func[0],
+    kwargs_method_called = _unres.kwargs_method_called[0],
+    kwargs_item_removed = _unres.kwargs_item_removed[0],
+    rebind_subdef_nonlocal = _unres.rebind_subdef_nonlocal[0],
+    nonlocal_backchange = _unres.nonlocal_backchange[0],
+    nonlocal_deep = _unres.nonlocal_deep[0],
+    double_starargs = UnresolvableAutoforwardsWithSourcesTests.double_starargs[0],
+    ternary_callee = _unres.ternary_callee[0],
+    or_callee = _unres.or_callee[0],
+    and_callee = _unres.and_callee[0],
+    conditional_attribute_callee = _unres._Conditional.method,
+
+
+_unsourced = """\
+def plain(a, *args, **kwargs):
+    return _target(*args, **kwargs)
+
+def extra_args(a, *args, **kwargs):
+    return _target(a, *args, **kwargs)
+
+def extra_kwargs(a, *args, **kwargs):
+    return _target(*args, y=a, **kwargs)
+
+def attribute(*args, **kwargs):
+    return functools.partial(_target, *args, **kwargs)
+
+def closure(*args, **kwargs):
+    def inner():
+        return _target(*args, **kwargs)
+    return inner()
+
+def branches(a, *args, **kwargs):
+    try:
+        with open(a) as f:
+            if f and a:
+                return _target(*args, **kwargs)
+    except OSError:
+        pass
+    finally:
+        [str(x) for x in args]
+    return None
+
+def ternary_callee(a, *args, **kwargs):
+    return (_target if a else _other)(*args, **kwargs)
+
+def or_callee(a, *args, **kwargs):
+    return (a or _other)(*args, **kwargs)
+
+def method_on_kwargs(*args, **kwargs):
+    kwargs.pop('y', None)
+    return _target(*args, **kwargs)
+
+def rebound(*args, **kwargs):
+    args = ()
+    return _target(*args, **kwargs)
+
+class Cls:
+    def method(self, *args, **kwargs):
+        self.last = args
+        return self.wrapped(*args, **kwargs)
+
+    def wrapped(self, x, y):
+        pass
+
+    def other(self, p, q):
+        pass
+
+    def conditional(self, c, *args, **kwargs):
+        return (self.wrapped if c else self.other)(*args, **kwargs)
+
+def _target(x, y):
+    pass
+
+def _other(p, q):
+    pass
+"""
+
+
+class NoSourceTests(SignatureTests):
+    def namespace(self, filename):
+        namespace = {'functools': functools}
+        exec(compile(_unsourced, filename, 'exec'), namespace)
+        return namespace
+
+    def setUp(self):
+        filename = '<sigtools-sourced-{0}>'.format(id(self))
+        lines = _unsourced.splitlines(True)
+        linecache.cache[filename] = len(_unsourced), None, lines, filename
+        self.addCleanup(linecache.cache.pop, filename)
+        self.sourced = self.namespace(filename)
+        self.unsourced = self.namespace('<sigtools-unsourced>')
+
+    def _test(self, name, expected):
+        sourced = self.sourced[name]
+        unsourced = self.unsourced[name]
+        self.assertIsNone(_util.get_ast(unsourced))
+        with patch.object(_autoforwards, 'CallListerVisitor') as visitor:
+            sig = specifiers.signature(unsourced)
+        self.assertFalse(visitor.called)
+        self.assertSigsEqual(sig, support.s(expected))
+        self.assertSigsEqual(sig, specifiers.signature(sourced))
+
+    def test_signatures(self):
+        for name, expected in [
+                ('plain', 'a, x, y'),
+                ('extra_args', 'a, y'),
+                ('extra_kwargs', 'a, x'),
+                ('attribute', 'x=None, y=None'),
+                ('closure', 'x, y'),
+                ('branches', 'a, x, y'),
+                ('method_on_kwargs', '**kwargs'),
+                ('rebound', '*args'),
+                ('ternary_callee', 'a, *args, **kwargs'),
+                ('or_callee', 'a, *args, **kwargs'),
+                ]:
+            with self.subTest(name=name):
+                self._test(name, expected)
+
+    def test_method(self):
+        unsourced = self.unsourced['Cls']()
+        self.assertSigsEqual(
+            specifiers.signature(unsourced.method), support.s('x, y'))
+        self.assertSigsEqual(
+            specifiers.signature(unsourced.conditional),
+            support.s('c, *args, **kwargs'))
+
+    def test_trace(self):
+        func = self.unsourced['plain']
+        _autoforwards.forget_calls()
+        tree = specifiers.explain(func)
+        self.assertIn(('BytecodeCallLister', 'plain'),
+                      [(step.name, step.subject) for step in tree.walk()])
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import pickle
+import unittest
+from concurrent import futures
+from functools import partial
+
+from sigtools import specifiers
+from sigtools.tests import warmupfixt
+from sigtools.tests.util import Fixtures
+
+
+_fixt = 'sigtools.tests.warmupfixt.'
+
+
+def _annotated(a: int, *, b: 'list[str]' = None) -> str:
+    raise NotImplementedError
+
+
+_partial = partial(_annotated, 1)
+
+
+class DescribeTests(Fixtures):
+    def _test(self, name, text, sources):
+        desc = specifiers.describe(name)
+        self.assertIsNone(desc.error)
+        self.assertEqual(desc.name, name)
+        self.assertEqual(desc.text, text)
+        self.assertEqual(
+            dict((p.name, p.sources) for p in desc.parameters), sources)
+        self.assertEqual(pickle.loads(pickle.dumps(desc)), desc)
+
+    plain = _fixt + 'plain', '(a, b)', {
+        'a': (_fixt + 'plain',), 'b': (_fixt + 'plain',)}
+    forwarding = _fixt + 'forwarding', '(c, a, b)', {
+        'c': (_fixt + 'forwarding',),
+        'a': (_fixt + 'plain',), 'b': (_fixt + 'plain',)}
+    decorated = _fixt + 'decorated', '(a, *, x)', {
+        'a': (_fixt + 'decorated',), 'x': (_fixt + 'deco',)}
+    colon = 'sigtools.tests.warmupfixt:Klass.static', '(c)', {
+        'c': (_fixt + 'Klass.static',)}
+
+
+class DescriptionTests(unittest.TestCase):
+    def test_annotations_and_defaults(self):
+        desc = specifiers.describe(__name__ + '._annotated')
+        a, b = desc.parameters
+        self.assertEqual(a, specifiers.ParameterDescription(
+            'a', 'POSITIONAL_OR_KEYWORD', None, 'int',
+            (__name__ + '._annotated',)))
+        self.assertEqual(b.kind, 'KEYWORD_ONLY')
+        self.assertEqual(b.default, 'None')
+        self.assertEqual(b.annotation, "'list[str]'")
+        self.assertEqual(desc.return_annotation, 'str')
+
+    def test_error(self):
+        desc = specifiers.describe('sigtools.tests.doesntexist.func')
+        self.assertEqual(desc.parameters, ())
+        self.assertTrue(desc.error.startswith('AttributeError: '))
+        self.assertRaises(ValueError, desc.to_signature)
+        desc = specifiers.describe('sigtools_doesntexist.func')
+        self.assertTrue(desc.error.startswith('ModuleNotFoundError: '))
+
+    def test_to_signature(self):
+        desc = specifiers.describe(_fixt + 'forwarding')
+        self.assertIsNotNone(desc.payload)
+        sig = pickle.loads(pickle.dumps(desc)).to_signature()
+        self.assertEqual(sig, specifiers.signature(warmupfixt.forwarding))
+        self.assertIs(sig.sources['a'][0], warmupfixt.plain)
+
+    def test_to_signature_unpersistable(self):
+        desc = specifiers.describe(__name__ + '._partial')
+        self.assertIsNone(desc.error)
+        self.assertIsNone(desc.payload)
+        self.assertEqual(str(desc.to_signature()), desc.text)
+
+    def test_describe_many(self):
+        names = [_fixt + 'plain', 'sigtools.tests.doesntexist',
+                 _fixt + 'forwarding', _fixt + 'modified']
+        with futures.ProcessPoolExecutor(2) as executor:
+            descs = specifiers.describe_many(
+                names, executor=executor, chunksize=1)
+        self.assertEqual([desc.name for desc in descs], names)
+        self.assertEqual(
+            [desc.text for desc in descs],
+            ['(a, b)', None, '(c, a, b)', '(a, *, b)'])
+        self.assertEqual(descs, [specifiers.describe(name) for name in names])
+
+    def test_describe_many_own_pool(self):
+        descs = specifiers.describe_many([_fixt + 'plain'], max_workers=1)
+        self.assertEqual(descs, [specifiers.describe(_fixt + 'plain')])
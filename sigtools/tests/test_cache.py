@@ -0,0 +1,391 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import functools
+import gc
+import importlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import weakref
+
+import sigtools
+from sigtools import specifiers, support, modifiers, _specifiers
+
+
+def _inner(x, y, *, z):
+    raise NotImplementedError
+
+
+def _outer(a, *args, **kwargs):
+    return _inner(*args, **kwargs)
+
+
+class SignatureCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = specifiers.enable_cache(maxsize=8)
+        self.cache.clear()
+
+    def tearDown(self):
+        specifiers.disable_cache()
+
+    def test_hit(self):
+        sig = specifiers.signature(_outer)
+        self.assertEqual(str(sig), '(a, x, y, *, z)')
+        self.assertIs(specifiers.signature(_outer), sig)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_auto_is_part_of_key(self):
+        self.assertEqual(str(specifiers.signature(_outer)), '(a, x, y, *, z)')
+        self.assertEqual(
+            str(specifiers.signature(_outer, auto=False)),
+            '(a, *args, **kwargs)')
+
+    def test_args_are_part_of_key(self):
+        def outer(func, *args, **kwargs):
+            return func(*args, **kwargs)
+        sig_a = specifiers.signature(outer, args=(support.f('a'),))
+        sig_b = specifiers.signature(outer, args=(support.f('b'),))
+        self.assertEqual(str(sig_a), '(func, a)')
+        self.assertEqual(str(sig_b), '(func, b)')
+
+    def test_unhashable_args(self):
+        def outer(func, *args, **kwargs):
+            return func(*args, **kwargs)
+        sig = specifiers.signature(outer, kwargs={'unhashable': []})
+        self.assertIsNot(
+            specifiers.signature(outer, kwargs={'unhashable': []}), sig)
+
+    def test_invalidate_defaults(self):
+        func = support.f('a=1')
+        self.assertEqual(str(specifiers.signature(func)), '(a=1)')
+        func.__defaults__ = (2,)
+        self.assertEqual(str(specifiers.signature(func)), '(a=2)')
+
+    def test_invalidate_kwdefaults(self):
+        func = support.f('*, a=1')
+        self.assertEqual(str(specifiers.signature(func)), '(*, a=1)')
+        func.__kwdefaults__ = {'a': 2}
+        self.assertEqual(str(specifiers.signature(func)), '(*, a=2)')
+
+    def test_invalidate_code(self):
+        func = support.f('a')
+        specifiers.signature(func)
+        func.__code__ = support.f('b').__code__
+        self.assertEqual(str(specifiers.signature(func)), '(b)')
+
+    def test_invalidate_signature(self):
+        func = support.f('a')
+        specifiers.signature(func)
+        func.__signature__ = support.s('b')
+        self.assertEqual(str(specifiers.signature(func)), '(b)')
+
+    def test_invalidate_forger(self):
+        func = support.f('a')
+        specifiers.signature(func)
+        specifiers.set_signature_forger(func, lambda obj: support.s('c'))
+        self.assertEqual(str(specifiers.signature(func)), '(c)')
+
+    def test_invalidate_modifier(self):
+        func = support.f('a, b')
+        specifiers.signature(func)
+        modifiers.annotate(b=int)(func)
+        self.assertEqual(
+            str(specifiers.signature(func)), "(a, b: int)")
+
+    def test_bound_methods(self):
+        class A(object):
+            def method(self, a, *args, **kwargs):
+                _inner(*args, **kwargs)
+        a, b = A(), A()
+        sig = specifiers.signature(a.method)
+        self.assertIs(specifiers.signature(a.method), sig)
+        self.assertIsNot(specifiers.signature(b.method), sig)
+
+    def test_eviction(self):
+        funcs = [support.f('a') for _ in range(10)]
+        sigs = [specifiers.signature(func) for func in funcs]
+        self.assertEqual(len(self.cache), 8)
+        self.assertIsNot(specifiers.signature(funcs[0]), sigs[0])
+        self.assertIs(specifiers.signature(funcs[-1]), sigs[-1])
+
+    def test_unbounded(self):
+        cache = specifiers.enable_cache(maxsize=None)
+        self.assertIs(cache, self.cache)
+        funcs = [support.f('a') for _ in range(20)]
+        for func in funcs:
+            specifiers.signature(func)
+        self.assertEqual(len(cache), 20)
+
+    def test_weakly_keyed(self):
+        func = support.f('a')
+        sig = support.s('b')
+        specifiers.set_signature_forger(func, lambda obj: sig)
+        self.cache.clear()
+        specifiers.signature(func)
+        self.assertEqual(len(self.cache), 1)
+        del func
+        gc.collect()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_autoforwarded_not_kept_alive(self):
+        def outer(a, *args, **kwargs):
+            return _inner(*args, **kwargs)
+        sig = specifiers.signature(outer)
+        self.assertIs(sig.sources['a'][0], outer)
+        self.assertEqual(len(self.cache), 2)
+        ref = weakref.ref(outer)
+        del outer, sig
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertEqual(len(self.cache), 1)
+
+    def test_rebuilt_after_release(self):
+        def outer(a, *args, **kwargs):
+            return _inner(*args, **kwargs)
+        first = specifiers.signature(outer)
+        expected = str(first), first.sources
+        del first
+        gc.collect()
+        sig = specifiers.signature(outer)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual((str(sig), sig.sources), expected)
+        self.assertIs(sig.parameters['a'].sources[0], outer)
+        self.assertIs(specifiers.signature(outer), sig)
+
+    def test_bound_methods_not_kept_alive(self):
+        class A(object):
+            def method(self, a, *args, **kwargs):
+                _inner(*args, **kwargs)
+        a, b = A(), A()
+        sig_a = specifiers.signature(a.method)
+        sig_b = specifiers.signature(b.method)
+        self.assertIs(specifiers.signature(a.method), sig_a)
+        self.assertIs(specifiers.signature(b.method), sig_b)
+        ref = weakref.ref(b)
+        del b, sig_b
+        gc.collect()
+        self.assertIsNone(ref())
+        self.assertIs(specifiers.signature(a.method), sig_a)
+
+    def test_modifier_not_kept_alive(self):
+        func = modifiers.kwoargs('b')(support.f('a, b'))
+        self.assertEqual(str(specifiers.signature(func)), '(a, *, b)')
+        ref = weakref.ref(func)
+        del func
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_uncacheable(self):
+        class Callable(object):
+            __slots__ = ()
+            def __call__(self, a):
+                raise NotImplementedError
+        obj = Callable()
+        self.assertEqual(str(specifiers.signature(obj)), '(a)')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_disabled(self):
+        specifiers.disable_cache()
+        self.assertIsNone(_specifiers.get_cache())
+        self.assertIsNot(
+            specifiers.signature(_outer), specifiers.signature(_outer))
+
+
+class WarmupTests(unittest.TestCase):
+    def setUp(self):
+        specifiers.disable_cache()
+
+    def tearDown(self):
+        specifiers.disable_cache()
+
+    def test_module(self):
+        from sigtools.tests import warmupfixt
+        report = sigtools.warmup([warmupfixt, next])
+        self.assertEqual(report.resolved, 9)
+        self.assertEqual(report.failed, 1)
+        self.assertIs(report.failures[0][1].__class__, ValueError)
+        self.assertIs(_specifiers.get_cache(), report.cache)
+        self.assertIsNone(report.cache.maxsize)
+        hits = report.cache.hits
+        self.assertEqual(
+            str(specifiers.signature(warmupfixt.forwarding)), '(c, a, b)')
+        self.assertEqual(
+            str(specifiers.signature(warmupfixt.Klass.static)), '(c)')
+        self.assertEqual(
+            str(specifiers.signature(warmupfixt.decorated)), '(a, *, x)')
+        self.assertEqual(report.cache.hits, hits + 3)
+
+    def test_module_name(self):
+        report = sigtools.warmup('sigtools.tests.warmupfixt')
+        self.assertEqual(report.resolved, 9)
+        self.assertEqual(report.failed, 0)
+
+    def test_attributes_created_on_access(self):
+        class Fresh(object):
+            def __get__(self, instance, owner):
+                return functools.partial(_inner, 1)
+        cls = type('Fresh', (object,), dict.fromkeys('abcdefghijkl', Fresh()))
+        report = sigtools.warmup(cls)
+        self.assertEqual(report.resolved, 13)
+
+    def test_bad_module_name(self):
+        report = sigtools.warmup(['sigtools.tests.doesntexist'])
+        self.assertEqual(report.resolved, 0)
+        self.assertEqual(report.failures[0][0], 'sigtools.tests.doesntexist')
+
+    def test_existing_cache(self):
+        cache = specifiers.enable_cache()
+        report = sigtools.warmup([_outer])
+        self.assertIs(report.cache, cache)
+        self.assertEqual(report.resolved, 1)
+
+    def test_given_cache(self):
+        cache = specifiers.SignatureCache(maxsize=10)
+        report = sigtools.warmup(_outer, cache=cache)
+        self.assertIs(_specifiers.get_cache(), cache)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(repr(report), '<WarmupReport resolved=1 failed=0>')
+
+
+_persist_first = """
+from {prefix}_second import inner
+
+def outer(a, *args, **kwargs):
+    return inner(*args, **kwargs)
+
+def with_default(a, b=(1, 'two'), c=object()):
+    raise NotImplementedError
+"""
+
+_persist_second = """
+def inner(x, y):
+    raise NotImplementedError
+"""
+
+_persist_script = """
+import sys
+sys.path.insert(0, {path!r})
+from sigtools import specifiers
+from {prefix}_first import outer
+cache = specifiers.enable_cache(directory={directory!r})
+print(specifiers.signature(outer), cache.disk_hits)
+"""
+
+
+class PersistentCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.directory = os.path.join(self.path, 'cache')
+        self.prefix = 'sigtools_persist_{0}'.format(id(self))
+        self.write('first', _persist_first)
+        self.write('second', _persist_second)
+        sys.path.insert(0, self.path)
+        self.module = importlib.import_module(self.prefix + '_first')
+        self.cache = specifiers.enable_cache(directory=self.directory)
+
+    def tearDown(self):
+        specifiers.disable_cache()
+        sys.path.remove(self.path)
+        for suffix in ('_first', '_second'):
+            sys.modules.pop(self.prefix + suffix, None)
+        shutil.rmtree(self.path)
+
+    def write(self, name, source):
+        filename = os.path.join(self.path, self.prefix + '_' + name + '.py')
+        with open(filename, 'w') as fh:
+            fh.write(textwrap.dedent(source.format(prefix=self.prefix)))
+
+    def reload(self):
+        self.cache = specifiers.SignatureCache(directory=self.directory)
+        _specifiers.set_cache(self.cache)
+
+    def test_reused(self):
+        sig = specifiers.signature(self.module.outer)
+        self.cache.flush()
+        self.reload()
+        sig2 = specifiers.signature(self.module.outer)
+        self.assertEqual(self.cache.disk_hits, 1)
+        self.assertIsNot(sig2, sig)
+        self.assertEqual(str(sig2), '(a, x, y)')
+        self.assertEqual(sig2.sources, sig.sources)
+        self.assertIs(sig2.sources['x'][0], sys.modules[self.prefix + '_second'].inner)
+        self.assertIs(specifiers.signature(self.module.outer), sig2)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_defaults(self):
+        sig = specifiers.signature(self.module.with_default)
+        self.cache.flush()
+        self.reload()
+        sig2 = specifiers.signature(self.module.with_default)
+        self.assertEqual(self.cache.disk_hits, 1)
+        self.assertEqual(sig2.parameters['b'].default, (1, 'two'))
+        self.assertIs(sig2.parameters['c'].default,
+                      sig.parameters['c'].default)
+
+    def test_invalidated_by_dependency(self):
+        specifiers.signature(self.module.outer)
+        self.cache.flush()
+        self.write('second', _persist_second.replace('x, y', 'x, y, z'))
+        self.reload()
+        specifiers.signature(self.module.outer)
+        self.assertEqual(self.cache.disk_hits, 0)
+
+    def test_invalidated_by_module(self):
+        specifiers.signature(self.module.outer)
+        self.cache.flush()
+        self.write('first', _persist_first + '\n# changed\n')
+        self.reload()
+        specifiers.signature(self.module.outer)
+        # only the signature of inner, which is unchanged, is reused
+        self.assertEqual(self.cache.disk_hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_local_function_not_stored(self):
+        def func(a):
+            raise NotImplementedError
+        specifiers.signature(func)
+        self.cache.flush()
+        self.assertFalse(os.path.exists(self.directory))
+
+    def test_clear(self):
+        specifiers.signature(self.module.outer)
+        self.cache.flush()
+        self.assertTrue(os.listdir(self.directory))
+        self.cache.clear()
+        self.assertFalse(os.listdir(self.directory))
+
+    def test_new_process(self):
+        script = _persist_script.format(
+            path=self.path, prefix=self.prefix, directory=self.directory)
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(sigtools.__file__))]
+            + env.get('PYTHONPATH', '').split(os.pathsep))
+        run = lambda: subprocess.check_output(
+            [sys.executable, '-c', script], env=env).decode().strip()
+        self.assertEqual(run(), '(a, x, y) 0')
+        self.assertEqual(run(), '(a, x, y) 1')
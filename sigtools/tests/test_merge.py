@@ -105,6 +105,12 @@ class MergeTests(FixturesWithFutureAnnotations):
         self.assertSigsEqual(ret, s('a, *args, **kwargs'))
 
     three = '*, a, b, c, **k', {1: 'a', 2: 'b', 3: 'ck'}, '*, a, **k', '*, b, **k', '*, c, **k'
+    kwoargs_reorder = (
+        '*, a, c, b, d, **k', {1: 'ab', 2: 'bc', 3: 'ac', 4: 'dk'},
+        '*, a, b, **k', '*, b, c, **k', '*, c, a, **k', '*, d, **k')
+    many = (
+        'a, *args, **k', dict((i, ['a', 'args', 'k']) for i in range(1, 7)),
+        *['a, *args, **k'] * 6)
 
 
 class MergeRaiseTests(Fixtures):
@@ -21,13 +21,15 @@
 # THE SOFTWARE.
 
 
+import types
 from functools import wraps
 
-from sigtools import modifiers, specifiers
+from sigtools import modifiers, specifiers, _util
 from sigtools._util import funcsigs, safe_get
 from sigtools.support import assert_func_sig_coherent, f, s, func_from_sig
 from sigtools.signatures import sort_params, apply_params, signature
 from sigtools._signatures import UpgradedParameter
+from sigtools._autoforwards import own_signature
 from sigtools.tests.util import Fixtures, SignatureTests
 
 
@@ -83,6 +85,18 @@ def poktranslator_test(self, expected_sig_str, orig_sig_str,
             self.assertSigsEqual(exp, signature(func))
             assert_func_sig_coherent(func)
             repr(func) # must not cause an error
+            if posoargs or kwoargs:
+                func = modifiers._PokTranslator(
+                    func_from_sig(orig), posoargs, kwoargs, native=True)
+                self.assertSigsEqual(exp, signature(func))
+                self.assertSigsEqual(
+                    exp, funcsigs.signature(func, follow_wrapped=False))
+                self.assertSigsEqual(exp, own_signature(func))
+                # like python, passes names of positional-only parameters
+                # on to **kwargs
+                posargs, _, _, _, varkwargs = sort_params(exp)
+                assert_func_sig_coherent(
+                    func, check_invalid=not (posargs and varkwargs))
 
 
 class PokTranslatorTestsOneArg(Fixtures):
@@ -375,3 +389,103 @@ class AnnotateTests(SignatureTests):
             s('a:1, *, b:2'),
             signature(safe_get(annotated, object(), object))
             )
+
+
+class NativeTests(SignatureTests):
+    def test_function(self):
+        func = modifiers.kwoargs('b', native=True)(f('a, b, c'))
+        self.assertIsInstance(func, types.FunctionType)
+        self.assertEqual(func.__name__, 'func')
+        self.assertSigsEqual(own_signature(func), s('a, c, *, b'))
+        self.assertEqual(func(1, 2, b=3), {'a': 1, 'b': 3, 'c': 2})
+
+    def test_merge_other(self):
+        orig_func = f('a, b, c=1')
+        func = modifiers.posoargs('a', native=True)(
+            modifiers.autokwoargs(orig_func))
+        self.assertIs(func.__wrapped__, orig_func)
+        self.assertSigsEqual(signature(func), s('<a>, b, *, c=1'))
+        self.assertEqual(func(1, 2), {'a': 1, 'b': 2, 'c': 1})
+
+    def test_start_end(self):
+        func = modifiers.kwoargs(start='b', native=True)(f('a, b, c'))
+        self.assertSigsEqual(signature(func), s('a, *, b, c'))
+        func = modifiers.posoargs(end='b', native=True)(f('a, b, c'))
+        self.assertSigsEqual(signature(func), s('<a>, <b>, c'))
+
+    def test_autokwoargs(self):
+        func = modifiers.autokwoargs(native=True)(f('a, b=1, c=2'))
+        self.assertSigsEqual(signature(func), s('a, *, b=1, c=2'))
+        self.assertEqual(func(0, c=3), {'a': 0, 'b': 1, 'c': 3})
+
+    def test_colliding_names(self):
+        func = modifiers.kwoargs('make', native=True)(
+            f('func, defaults, make=None', name='make'))
+        self.assertSigsEqual(
+            signature(func), s('func, defaults, *, make=None'))
+        self.assertEqual(
+            func(1, 2, make=3), {'func': 1, 'defaults': 2, 'make': 3})
+
+    def test_method(self):
+        class Cls(object):
+            @modifiers.kwoargs('b', native=True)
+            def method(self, a, b=1):
+                return self, a, b
+        obj = Cls()
+        self.assertSigsEqual(signature(obj.method), s('a, *, b=1'))
+        self.assertEqual(obj.method(2, b=3), (obj, 2, 3))
+
+    def test_sources(self):
+        inner = f('a, b', name='inner')
+        outer = f('x, y, *args, **kwargs', name='outer')
+        outer = specifiers.forwards_to_function(inner)(outer)
+        func = modifiers.kwoargs('y', native=True)(outer)
+        sig = specifiers.signature(func)
+        self.assertSigsEqual(sig, s('x, a, b, *, y'))
+        self.assertEqual(sig.sources['x'], [func])
+
+    def test_annotate_after(self):
+        func = modifiers.annotate(a=2)(
+            modifiers.kwoargs('a', native=True)(f('a, b')))
+        self.assertSigsEqual(signature(func), s('b, *, a:2'))
+
+
+_unsourced = """\
+def inner(a, b):
+    pass
+
+def outer(x, *args, **kwargs):
+    return inner(*args, **kwargs)
+
+def method(self, x, *args, **kwargs):
+    return inner(*args, **kwargs)
+"""
+
+
+class NoSourceTests(SignatureTests):
+    def unsourced(self, name):
+        namespace = {}
+        exec(compile(_unsourced, '<sigtools-unsourced>', 'exec'), namespace)
+        func = namespace[name]
+        self.assertIsNone(_util.get_ast(func))
+        return func
+
+    def test_translators(self):
+        for native in (False, True):
+            for modifier, expected in [
+                    (modifiers.kwoargs('x', native=native), 'a, b, *, x'),
+                    (modifiers.posoargs('x', native=native), '<x>, a, b'),
+                    ]:
+                with self.subTest(native=native, expected=expected):
+                    func = modifier(self.unsourced('outer'))
+                    self.assertSigsEqual(
+                        specifiers.signature(func), s(expected))
+
+    def test_method(self):
+        for native in (False, True):
+            with self.subTest(native=native):
+                cls = type('Cls', (object,), {
+                    'method': modifiers.kwoargs('x', native=native)(
+                        self.unsourced('method'))})
+                self.assertSigsEqual(
+                    specifiers.signature(cls().method), s('a, b, *, x'))
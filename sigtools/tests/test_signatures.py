@@ -18,16 +18,29 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
+import copy
+import gc
 import inspect
+import marshal
+import os
+import subprocess
+import sys
+import types
 import unittest
 import warnings
+import weakref
 from functools import partial
 
+from mock import patch
+
 from sigtools._signatures import (
     sort_params, apply_params, IncompatibleSignatures, signature,
     UpgradedSignature, UpgradedParameter, _upgrade_parameters_with_warning,
-    UpgradedAnnotation,
+    UpgradedAnnotation, set_default_sources, SourceMap, embed, mask, merge,
+    forwards, OperationCache, InternPool,
 )
+import sigtools
+from sigtools import _signatures, _specifiers, signatures, specifiers
 from sigtools.support import s, f
 from sigtools._util import OrderedDict
 
@@ -48,6 +61,499 @@ class SourceTests(Fixtures):
     f4 = '',
 
 
+class SourceMapTests(unittest.TestCase):
+    def test_dict_interface(self):
+        func = f('a, *, b')
+        src = signature(func).sources
+        self.assertIsInstance(src, SourceMap)
+        self.assertEqual(
+            src, {'a': [func], 'b': [func], '+depths': {func: 0}})
+        self.assertEqual(list(src), ['a', 'b', '+depths'])
+        self.assertEqual(len(src), 3)
+        self.assertIn('+depths', src)
+        self.assertNotIn('c', src)
+        self.assertEqual(src.get('c', []), [])
+        self.assertEqual(src.funcs('a'), (func,))
+        self.assertEqual(SourceMap(dict(src.items())), src)
+
+    def test_empty(self):
+        self.assertEqual(SourceMap(), {'+depths': {}})
+        self.assertEqual(UpgradedSignature().sources, {'+depths': {}})
+
+    def test_copy_on_write(self):
+        func = f('a, b')
+        src = signature(func).sources
+        copy = src.copy()
+        copy['c'] = [func]
+        del copy['a']
+        copy['+depths'] = {}
+        self.assertEqual(
+            src, {'a': [func], 'b': [func], '+depths': {func: 0}})
+        self.assertEqual(copy, {'b': [func], 'c': [func], '+depths': {}})
+
+    def test_values_write_back(self):
+        func = f('a, b')
+        sig = signature(func)
+        src = sig.sources
+        copy = src.copy()
+        self.assertIs(src['a'], src['a'])
+        src['a'].append(len)
+        src['a'] += [None]
+        src['+depths'][len] = 1
+        src['+depths'].update({None: 2})
+        self.assertEqual(src, {
+            'a': [func, len, None], 'b': [func],
+            '+depths': {func: 0, len: 1, None: 2}})
+        self.assertEqual(src.funcs('a'), (func, len, None))
+        self.assertEqual(
+            copy, {'a': [func], 'b': [func], '+depths': {func: 0}})
+        self.assertEqual(sig.parameters['a'].source_depths, {func: 0})
+        self.assertEqual(signature(func).sources['a'], [func])
+
+    def test_values_write_back_to_their_map(self):
+        func = f('a, b')
+        src = signature(func).sources
+        funcs = src['a']
+        depths = src['+depths']
+        copy = src.copy()
+        funcs.append(len)
+        depths[len] = 1
+        copy['a'].append(None)
+        copy['+depths'][None] = 2
+        self.assertEqual(src, {
+            'a': [func, len], 'b': [func], '+depths': {func: 0, len: 1}})
+        self.assertEqual(copy, {
+            'a': [func, None], 'b': [func], '+depths': {func: 0, None: 2}})
+        src['a'] = [None]
+        self.assertEqual(src['a'], [None])
+        self.assertEqual(funcs, [func, len])
+
+    def test_values_of_upgraded_signature(self):
+        func = f('a')
+        sig = set_default_sources(inspect.signature(func), func)
+        sig.sources['a'].append(len)
+        sig.sources['+depths'][len] = 1
+        self.assertEqual(
+            sig.sources, {'a': [func, len], '+depths': {func: 0, len: 1}})
+        self.assertEqual(sig.parameters['a'].source_depths, {func: 0})
+
+    def test_values_copy_writable(self):
+        func = f('a')
+        src = signature(func).sources
+        funcs = copy.copy(src['a'])
+        funcs.append(None)
+        depths = copy.deepcopy(src['+depths'])
+        depths[None] = 1
+        self.assertEqual((funcs, depths), ([func, None], {func: 0, None: 1}))
+        self.assertIs(type(list(src['a'])), list)
+
+    def test_assign_dict(self):
+        sig = s('a')
+        sig.sources = {'a': [len], '+depths': {len: 0}}
+        self.assertIsInstance(sig.sources, SourceMap)
+        self.assertEqual(sig.sources.funcs('a'), (len,))
+
+    def test_shared_between_steps(self):
+        outer = signature(f('a, *args, **kwargs'))
+        inner = signature(f('b, *, c'))
+        masked = mask(inner, 0, 'c')
+        embedded = embed(outer, masked)
+        self.assertIs(embedded.sources.funcs('b'), inner.sources.funcs('b'))
+        self.assertIs(embedded.sources.funcs('a'), outer.sources.funcs('a'))
+        merged = merge(embedded, embedded)
+        self.assertEqual(
+            merged.sources.funcs('b'), inner.sources.funcs('b') * 2)
+
+    def test_param_depths(self):
+        func = f('a, b')
+        sig = UpgradedSignature._upgrade(
+            inspect.signature(func), func,
+            {'a': [func], 'b': [len], '+depths': {func: 0, len: 1}})
+        self.assertEqual(sig.parameters['a'].source_depths, {func: 0})
+        self.assertEqual(sig.parameters['b'].source_depths, {len: 1})
+        self.assertEqual(len(sig.parameters['b'].source_depths), 1)
+        with self.assertRaises(KeyError):
+            sig.parameters['b'].source_depths[func]
+        sig.sources['+depths'] = {}
+        self.assertEqual(sig.parameters['a'].source_depths, {func: 0})
+
+    def test_param_depths_copy_on_write(self):
+        func = f('a, b')
+        for sig in (signature(func),
+                    set_default_sources(inspect.signature(func), func)):
+            depths = sig.parameters['a'].source_depths
+            depths[len] = 5
+            depths.update({None: 6})
+            del depths[func]
+            self.assertEqual(depths, {len: 5, None: 6})
+            self.assertEqual(len(depths), 2)
+            self.assertEqual(sig.parameters['b'].source_depths, {func: 0})
+            self.assertEqual(sig.sources['+depths'], {func: 0})
+            self.assertEqual(copy.copy(depths), {len: 5, None: 6})
+            self.assertIs(type(copy.deepcopy(depths)), dict)
+
+
+class OperationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = signatures.enable_cache()
+        self.addCleanup(signatures.disable_cache)
+
+    def wrapped(self, inner='a, b=1, *, c'):
+        outer = f('x, *args, y=2, **kwargs')
+        inner = f(inner)
+        return outer, inner, forwards(signature(outer), signature(inner), 1)
+
+    def test_hit_keeps_caller_sources(self):
+        outer1, inner1, sig1 = self.wrapped()
+        outer2, inner2, sig2 = self.wrapped()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(str(sig2), str(sig1))
+        self.assertEqual(sig2.sources, {
+            'x': [outer2], 'y': [outer2], 'b': [inner2], 'c': [inner2],
+            '+depths': {outer2: 0, inner2: 1}})
+        self.assertEqual(sig2.parameters['b'].sources, [inner2])
+        self.assertEqual(sig2.parameters['b'].source_depths, {inner2: 0})
+        self.assertIs(sig2.parameters['b']._function, inner2)
+        self.assertEqual(sig1.sources['b'], [inner1])
+
+    def test_same_functions(self):
+        sig = signature(f('a, *, b'))
+        ret1 = mask(sig, 1)
+        ret2 = mask(sig, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertIsNot(ret1, ret2)
+        self.assertEqual(ret1.sources, ret2.sources)
+
+    def test_result_not_shared(self):
+        sig = signature(f('a, *, b'))
+        ret = merge(sig, sig)
+        ret.sources['b'] = []
+        self.assertEqual(merge(sig, sig).sources['b'], [sig.sources['b'][0]] * 2)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_structure_differs(self):
+        self.wrapped('a, b=1, *, c')
+        self.wrapped('a, b=2, *, c')
+        self.wrapped('a, b=True, *, c')
+        self.wrapped('a, b: int=1, *, c')
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 4))
+
+    def test_hit_keeps_caller_values(self):
+        from decimal import Decimal
+        def make(default, annotation):
+            def func(a, b: annotation=default, *, c: annotation) -> annotation:
+                raise NotImplementedError
+            return func
+        values1 = Decimal('1.0'), Decimal('2.0')
+        values2 = Decimal('1.00'), Decimal('2.00')
+        sig1 = mask(signature(make(*values1)), 1)
+        sig2 = mask(signature(make(*values2)), 1)
+        self.assertEqual(self.cache.hits, 1)
+        for sig, (default, annotation) in [(sig1, values1), (sig2, values2)]:
+            self.assertIs(sig.parameters['b'].default, default)
+            self.assertIs(sig.parameters['b'].annotation, annotation)
+            self.assertIs(sig.parameters['c'].annotation, annotation)
+            self.assertIs(sig.return_annotation, annotation)
+            self.assertIs(
+                sig.parameters['b'].upgraded_annotation.source_value(),
+                annotation)
+            self.assertIs(
+                sig.upgraded_return_annotation.source_value(), annotation)
+
+    def test_values_aliased_differently(self):
+        sig1 = mask(signature(f('a, b=0.0, *, c=-0.0')), 1)
+        zero = 0.0
+        def func(a, b=zero, *, c=zero):
+            raise NotImplementedError
+        sig2 = mask(signature(func), 1)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(str(sig1), '(b=0.0, *, c=-0.0)')
+        self.assertIs(sig2.parameters['b'].default, zero)
+        self.assertIs(sig2.parameters['c'].default, zero)
+
+    def test_operation_args_differ(self):
+        sig = signature(f('a, b, *, c'))
+        mask(sig, 1)
+        mask(sig, 2)
+        mask(sig, 1, 'c')
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 3))
+
+    def test_unhashable_default(self):
+        sig = signature(f('a, b=[]'))
+        self.assertEqual(str(mask(sig, 1)), '(b=[])')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_incomparable_default(self):
+        class Ambiguous(object):
+            def __hash__(self):
+                raise ValueError('ambiguous')
+            def __eq__(self, other):
+                raise ValueError('ambiguous')
+            def __repr__(self):
+                return 'ambiguous'
+        sig = signature(f('a, b=d', globals={'d': Ambiguous()}))
+        self.assertEqual(str(mask(sig, 1)), '(b=ambiguous)')
+        self.assertEqual(str(embed(s('*args, **kwargs'), sig)), '(a, b=ambiguous)')
+        self.assertEqual(len(self.cache), 0)
+
+    def test_errors_not_cached(self):
+        sig1 = signature(f('a'))
+        sig2 = signature(f(''))
+        for i in range(2):
+            with self.assertRaises(IncompatibleSignatures):
+                merge(sig1, sig2)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_maxsize(self):
+        self.cache.maxsize = 2
+        sig = signature(f('a, b, c, d'))
+        for i in range(4):
+            mask(sig, i)
+        self.assertEqual(len(self.cache), 2)
+        mask(sig, 0)
+        self.assertEqual(self.cache.hits, 0)
+        mask(sig, 3)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_enable_disable(self):
+        self.assertIs(signatures.enable_cache(maxsize=5), self.cache)
+        self.assertEqual(self.cache.maxsize, 5)
+        self.assertIs(_signatures.get_operation_cache(), self.cache)
+        signatures.disable_cache()
+        self.assertIsNone(_signatures.get_operation_cache())
+        mask(signature(f('a')), 1)
+        self.assertEqual(self.cache.misses, 0)
+
+    def test_clear(self):
+        cache = OperationCache()
+        self.assertRegex(
+            repr(cache), r'^<[\w.]*OperationCache maxsize=1024 entries=0 ')
+        self.cache.clear()
+        mask(signature(f('a')), 1)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+class InternPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.pool = InternPool()
+
+    def test_same_instance(self):
+        func = f('a, b=1, *, c: int')
+        sig1 = self.pool.intern(signature(func))
+        sig2 = self.pool.intern(signature(func))
+        self.assertIs(sig1, sig2)
+        self.assertEqual(str(sig1), '(a, b=1, *, c: int)')
+        self.assertEqual(sig1.sources, {
+            'a': [func], 'b': [func], 'c': [func], '+depths': {func: 0}})
+        self.assertEqual(len(self.pool), 4)
+
+    def test_shared_parameters(self):
+        inner = f('a, *, b=1')
+        outer1 = f('x, *args, **kwargs')
+        outer2 = f('y, *args, **kwargs')
+        sig1 = self.pool.intern(
+            forwards(signature(outer1), signature(inner)))
+        sig2 = self.pool.intern(
+            forwards(signature(outer2), signature(inner)))
+        self.assertIsNot(sig1, sig2)
+        self.assertIs(sig1.parameters['b'], sig2.parameters['b'])
+        self.assertEqual(sig2.sources['b'], [inner])
+        self.assertEqual(sig2.sources['y'], [outer2])
+
+    def test_structure_differs(self):
+        sigs = [
+            self.pool.intern(signature(func)) for func in [
+                f('a, b=1'), f('a, b=True'), f('a, b: int=1'), f('a, *, b=1')]]
+        params = set(id(sig.parameters['b']) for sig in sigs)
+        self.assertEqual(len(params), 4)
+
+    def test_sources_differ(self):
+        func1 = f('a')
+        func2 = f('a')
+        sig1 = self.pool.intern(signature(func1))
+        sig2 = self.pool.intern(signature(func2))
+        self.assertIsNot(sig1, sig2)
+        self.assertIsNot(sig1.parameters['a'], sig2.parameters['a'])
+        self.assertEqual(sig1.parameters['a'].sources, [func1])
+        self.assertEqual(sig2.parameters['a'].sources, [func2])
+
+    def test_parameters_keep_sources(self):
+        def check(sig, interned):
+            for name, param in sig.parameters.items():
+                ret = interned.parameters[name]
+                self.assertIs(ret._function, param._function)
+                self.assertEqual(ret.sources, param.sources)
+                self.assertEqual(ret.source_depths, param.source_depths)
+            self.assertEqual(interned.sources, sig.sources)
+
+        inner = f('a, *, b: int=1')
+        outer = f('x, *args, **kwargs')
+        outer.__signature__ = forwards(signature(outer), signature(inner))
+        for obj in (inner, outer, partial(inner, 1)):
+            sig = _specifiers.forged_signature(obj)
+            check(sig, self.pool.intern(sig))
+        sig = forwards(signature(f('y, *args, **kwargs')), signature(inner))
+        check(sig, self.pool.intern(sig))
+        self.assertEqual(self.pool.intern(sig).parameters['b'].sources, [inner])
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_shared_postponed_annotations(self):
+        func1 = f('a: int', future_features=['annotations'])
+        func2 = types.FunctionType(func1.__code__, func1.__globals__)
+        func2.__annotations__ = dict(func1.__annotations__)
+        sig1 = self.pool.intern(signature(func1))
+        sig2 = self.pool.intern(signature(func2))
+        self.assertIs(
+            sig1.parameters['a'].upgraded_annotation,
+            sig2.parameters['a'].upgraded_annotation)
+        self.assertIs(sig2.parameters['a'].upgraded_annotation.source_value(), int)
+        self.assertIs(sig2.parameters['a']._function, func2)
+
+    def test_unhashable_default(self):
+        func = f('a, b=[]')
+        sig = self.pool.intern(signature(func))
+        self.assertIs(self.pool.intern(signature(func)), sig)
+        self.assertIs(sig.parameters['b'].default, func.__defaults__[0])
+
+    def test_defaults_reassigned(self):
+        func = f('a, b=0.0, c=1.0')
+        sig1 = self.pool.intern(signature(func))
+        func.__defaults__ = (-0.0, 1.0)
+        sig2 = self.pool.intern(signature(func))
+        self.assertIsNot(sig1, sig2)
+        self.assertEqual(str(sig2), '(a, b=-0.0, c=1.0)')
+        self.assertIs(sig2.parameters['b'].default, func.__defaults__[0])
+        self.assertIs(sig2.parameters['a'], sig1.parameters['a'])
+
+    def test_equal_annotations(self):
+        from decimal import Decimal
+        def make(annotation):
+            def func(a: annotation) -> annotation:
+                raise NotImplementedError
+            return func
+        func = make(Decimal('1.0'))
+        sig1 = self.pool.intern(signature(func))
+        func.__annotations__ = {
+            'a': Decimal('1.00'), 'return': Decimal('1.00')}
+        sig2 = self.pool.intern(signature(func))
+        self.assertIsNot(sig1, sig2)
+        self.assertEqual(str(sig2.parameters['a'].annotation), '1.00')
+        self.assertEqual(str(sig2.return_annotation), '1.00')
+        self.assertEqual(
+            str(sig2.upgraded_return_annotation.source_value()), '1.00')
+
+    def test_maxsize(self):
+        pool = InternPool(maxsize=2)
+        funcs = [f('a'), f('b'), f('c')]
+        sigs = [pool.intern(signature(func)) for func in funcs]
+        self.assertRegex(repr(pool), r'maxsize=2 parameters=2 signatures=2>$')
+        self.assertIs(pool.intern(signature(funcs[2])), sigs[2])
+        self.assertIsNot(pool.intern(signature(funcs[0])), sigs[0])
+
+    def test_evicted_functions_released(self):
+        pool = InternPool(maxsize=1)
+        func = f('a, b=1')
+        pool.intern(signature(func))
+        ref = weakref.ref(func)
+        del func
+        pool.intern(signature(f('c')))
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_sources_copied_on_write(self):
+        func = f('a, b')
+        sig = self.pool.intern(signature(func))
+        sig.sources['a'] = []
+        self.assertEqual(
+            self.pool.intern(signature(func)).sources['a'], [func])
+
+    def test_enable_disable(self):
+        self.addCleanup(signatures.disable_interning)
+        pool = signatures.enable_interning()
+        self.assertEqual(pool.maxsize, 4096)
+        self.assertIs(signatures.enable_interning(maxsize=None), pool)
+        self.assertIsNone(pool.maxsize)
+        func = f('a, *args, **kwargs')
+        sig = specifiers.signature(func)
+        self.assertIs(specifiers.signature(func), sig)
+        signatures.disable_interning()
+        self.assertIsNone(_signatures.get_intern_pool())
+        self.assertIsNot(specifiers.signature(func), sig)
+
+    def test_clear(self):
+        self.assertRegex(
+            repr(self.pool),
+            r'^<[\w.]*InternPool maxsize=4096 parameters=0 signatures=0>$')
+        func = f('a, b')
+        sig = self.pool.intern(signature(func))
+        self.assertRegex(repr(self.pool), r'parameters=2 signatures=1>$')
+        self.pool.clear()
+        self.assertEqual(len(self.pool), 0)
+        self.assertIsNot(self.pool.intern(signature(func)), sig)
+
+
+class FunctionSignatureTests(Fixtures):
+    def _test(self, sig_str, *ret, future_features=()):
+        func = f(sig_str, *ret, future_features=future_features)
+        expected = set_default_sources(inspect.signature(func), func)
+        sig = signature(func)
+        self.assertEqual(str(sig), str(expected))
+        self.assertEqual(sig, expected)
+        self.assertEqual(sig.sources, expected.sources)
+        self.assertEqual(
+            type(sig.upgraded_return_annotation),
+            type(expected.upgraded_return_annotation))
+        for param, exp in zip(sig.parameters.values(),
+                              expected.parameters.values()):
+            self.assertIs(param.default, exp.default)
+            self.assertIs(param.annotation, exp.annotation)
+            self.assertIs(
+                type(param.upgraded_annotation),
+                type(exp.upgraded_annotation))
+            self.assertIs(param._function, func)
+            self.assertEqual(param.sources, exp.sources)
+            self.assertEqual(param.source_depths, exp.source_depths)
+            self.assertIs(type(param.source_depths), type(exp.source_depths))
+
+    empty = '',
+    pok = 'a, b',
+    posonly = 'a, b=1, /, c=2',
+    defaults = 'a, b=1, *, c, d=2',
+    varargs = 'a, *args, b',
+    varkwargs = 'a, **kwargs',
+    everything = 'a, b=1, /, c=2, *args, d, e=3, **kwargs',
+    annotations = 'a: int, *args: str, b: "x"=1, **kwargs: bytes', 'float'
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed(self):
+        self._test('a: int, *, b: str', 'bytes',
+                   future_features=['annotations'])
+
+    def _test_override(self, attr, value):
+        func = f('a, b')
+        setattr(func, attr, value)
+        self.assertEqual(
+            str(signature(func)),
+            str(set_default_sources(inspect.signature(func), func)))
+
+    def test_source_depths_writable(self):
+        func = f('a, b=1, *args')
+        sig = signature(func)
+        sig.parameters['a'].source_depths['x'] = 5
+        self.assertEqual(
+            sig.parameters['a'].source_depths, {func: 0, 'x': 5})
+        self.assertEqual(sig.parameters['b'].source_depths, {func: 0})
+        self.assertEqual(sig.sources['+depths'], {func: 0})
+
+    def test_wrapped(self):
+        self._test_override('__wrapped__', f('c'))
+
+    def test_signature(self):
+        self._test_override('__signature__', s('c'))
+
+
 class PartialSigTests(Fixtures):
     def _test(self, obj, exp_sig, exp_src=None):
         sig = signature(obj)
@@ -159,6 +665,57 @@ class ExcTests(Fixtures):
     two = 'a, b', ['c, d', 'e, f'], '(c, d) (e, f) (a, b)'
 
 
+class CompileBinderTests(Fixtures):
+    def _test(self, sig_str, args, kwargs):
+        sig = s(sig_str)
+        try:
+            expected = sig.bind(*args, **kwargs).arguments
+        except TypeError as exc:
+            with self.assertRaises(TypeError) as cm:
+                sig.compile_binder()(args, kwargs)
+            self.assertEqual(str(cm.exception), str(exc))
+        else:
+            copy = dict(kwargs)
+            ret = sig.compile_binder()(args, kwargs)
+            self.assertEqual(ret, expected)
+            self.assertEqual(list(ret), list(expected))
+            self.assertEqual(kwargs, copy)
+
+    pos = 'a, b', (1, 2), {}
+    named = 'a, b', (1,), {'b': 2}
+    defaults = 'a, b=2, *, c=3', (1,), {}
+    kwoargs = 'a, *, b, c=3', (), {'a': 1, 'b': 2}
+    varargs = 'a, *args', (1, 2, 3), {}
+    varargs_empty = 'a, *args', (1,), {}
+    varkwargs = 'a, **kwargs', (), {'a': 1, 'b': 2}
+    posoarg_in_varkwargs = 'a, /, **kwargs', (1,), {'a': 2}
+    list_args = 'a, *args', [1, 2], {}
+
+    missing = 'a, b', (1,), {}
+    missing_kwoarg = 'a, *, b', (1,), {}
+    too_many = 'a, b', (1, 2, 3), {}
+    too_many_kwoargs = 'a, *, b', (1, 2), {'b': 3}
+    multiple = 'a, b', (1, 2), {'a': 3}
+    unexpected = 'a, b', (1, 2), {'c': 3}
+    posoarg_named = 'a, /, b', (), {'a': 1, 'b': 2}
+    posoarg_default_named = 'a=1, /, **kwargs', (), {'a': 1}
+
+    def test_cached(self):
+        sig = s('a, b=1')
+        self.assertIs(sig.compile_binder(), sig.compile_binder())
+        self.assertIsNot(sig.compile_binder(), s('a, b=1').compile_binder())
+        self.assertIs(
+            sig.compile_binder().__code__, s('a, b=2').compile_binder().__code__)
+        self.assertIsNot(
+            sig.compile_binder().__code__, s('a, b').compile_binder().__code__)
+
+    def test_function_signature(self):
+        binder = signature(f('a, *args, b, **kwargs')).compile_binder()
+        self.assertEqual(
+            binder((1, 2), {'b': 3, 'c': 4}),
+            {'a': 1, 'args': (2,), 'b': 3, 'kwargs': {'c': 4}})
+
+
 class UpgradedSignatureTests(SignatureTests):
     def test_upgrade_with_warning(self):
         sig = s("abc")
@@ -188,6 +745,35 @@ class UpgradedSignatureTests(SignatureTests):
             s("a, b, c", 1)
         )
 
+    def test_hash(self):
+        sigs = [
+            s('a, b: int = 1, *, c, d=2'), s('a, b: int = 1, *, d=2, c'),
+            s('a, b: int = 1, *, c, d=3'), s('a, b: int = 1, *, c, d=2', 1)]
+        self.assertEqual(sigs[0], sigs[1])
+        self.assertEqual(hash(sigs[0]), hash(sigs[1]))
+        self.assertEqual(
+            hash(sigs[0]), hash(self.downgrade_sig(sigs[0])))
+        self.assertEqual(len(set(sigs)), 3)
+        with self.assertRaises(TypeError):
+            hash(s('a=[]'))
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_eq_postponed_not_evaluated(self):
+        func = f("one: a, *, two: b", "a", globals={"a": 1, "b": 2}, future_features=["annotations"])
+        with patch('sigtools._signatures.eval', create=True, side_effect=eval) as ev:
+            self.assertEqual(signature(func), signature(func))
+            self.assertEqual(
+                hash(signature(func)), hash(signature(func)))
+            self.assertNotEqual(signature(func), s("one: 'a', *, two: 'c'", "'a'"))
+            self.assertEqual(ev.call_count, 0)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_eq_postponed_other_globals(self):
+        def make(a):
+            return signature(f("one: a", globals={"a": a}, future_features=["annotations"]))
+        self.assertEqual(make(1), make(1))
+        self.assertNotEqual(make(1), make(2))
+
     @unittest.skipIf(*python_doesnt_have_future_annotations)
     def test_evaluated(self):
         self.assertSigsEqual(
@@ -196,6 +782,171 @@ class UpgradedSignatureTests(SignatureTests):
         )
 
 
+_sentinel = object()
+
+
+def _inner(x, y: int = 3, *, z=_sentinel):
+    pass
+
+
+def _outer(a, *args, b=(1, 'two'), **kwargs):
+    return _inner(*args, **kwargs)
+
+
+class SerializationTests(SignatureTests):
+    def round_trip(self, sig):
+        ret = UpgradedSignature.from_bytes(sig.to_bytes())
+        self.assertIsInstance(ret, UpgradedSignature)
+        return ret
+
+    def test_round_trip(self):
+        sig = specifiers.signature(_outer)
+        sig2 = self.round_trip(sig)
+        self.assertEqual(str(sig2), str(sig))
+        self.assertEqual(sig2, sig)
+        self.assertEqual(sig2.sources, sig.sources)
+        self.assertIs(sig2.parameters['z'].default, _sentinel)
+        for param, param2 in zip(sig.parameters.values(), sig2.parameters.values()):
+            self.assertEqual(param2.sources, param.sources)
+            self.assertEqual(dict(param2.source_depths), dict(param.source_depths))
+            self.assertIs(param2._function, param._function)
+            self.assertEqual(param2.upgraded_annotation, param.upgraded_annotation)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed_annotations(self):
+        module = types.ModuleType('sigtools_serialize_postponed')
+        self.addCleanup(sys.modules.pop, module.__name__, None)
+        sys.modules[module.__name__] = module
+        exec(compile(
+            'from __future__ import annotations\n'
+            'def func(a: Value) -> Value:\n    pass\n',
+            module.__name__, 'exec'), module.__dict__)
+        module.Value = 1
+        sig = self.round_trip(signature(module.func))
+        self.assertEqual(sig.parameters['a'].annotation, 'Value')
+        self.assertEqual(sig.parameters['a'].upgraded_annotation.source_value(), 1)
+        self.assertEqual(sig.upgraded_return_annotation.source_value(), 1)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed_annotations_nested(self):
+        module = types.ModuleType('sigtools_serialize_nested')
+        self.addCleanup(sys.modules.pop, module.__name__, None)
+        sys.modules[module.__name__] = module
+        exec(compile(
+            'from __future__ import annotations\n'
+            'def outer():\n'
+            '    def func(a: Value, *, b: Value = 2) -> Value:\n'
+            '        pass\n'
+            '    return func\n'
+            'def unevaluable():\n'
+            '    def func(a: Missing):\n'
+            '        pass\n'
+            '    return func\n',
+            module.__name__, 'exec'), module.__dict__)
+        module.Value = 1
+        sig = signature(module.outer())
+        sig2 = self.round_trip(sig)
+        self.assertEqual(str(sig2), str(sig))
+        self.assertEqual(sig2, sig)
+        self.assertEqual(sig2.parameters['a'].upgraded_annotation.source_value(), 1)
+        self.assertEqual(sig2.upgraded_return_annotation.source_value(), 1)
+        self.assertEqual(str(sig2.evaluated()), '(a: 1, *, b: 1 = 2) -> 1')
+        sig2 = self.round_trip(signature(module.unevaluable()))
+        self.assertEqual(
+            sig2.parameters['a'].upgraded_annotation.source_value(), 'Missing')
+
+    def test_new_process(self):
+        data = specifiers.signature(_outer).to_bytes()
+        script = (
+            'import sys\n'
+            'from sigtools.signatures import UpgradedSignature\n'
+            'from sigtools.tests import test_signatures\n'
+            'sig = UpgradedSignature.from_bytes(sys.stdin.buffer.read())\n'
+            "print(sig.parameters['y'], sig.parameters['b'])\n"
+            "print(sig.parameters['z'].default is test_signatures._sentinel)\n"
+            "print(sig.sources['z'] == [test_signatures._inner])\n"
+            )
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.path.dirname(os.path.dirname(sigtools.__file__))]
+            + env.get('PYTHONPATH', '').split(os.pathsep))
+        output = subprocess.run(
+            [sys.executable, '-c', script], input=data, env=env,
+            stdout=subprocess.PIPE, check=True).stdout.decode().splitlines()
+        self.assertEqual(output, ["y: int = 3 b=(1, 'two')", 'True', 'True'])
+
+    def test_sources_looked_up_lazily(self):
+        module = types.ModuleType('sigtools_serialize_lazy')
+        self.addCleanup(sys.modules.pop, module.__name__, None)
+        sys.modules[module.__name__] = module
+        exec('def func(a, b=1):\n    pass\n', module.__dict__)
+        data = signature(module.func).to_bytes()
+        del module.func
+        sig = UpgradedSignature.from_bytes(data)
+        self.assertEqual(str(sig), '(a, b=1)')
+        with self.assertRaises(AttributeError):
+            sig.sources['a']
+        with self.assertRaises(AttributeError):
+            sig.parameters['b'].sources
+
+    def test_missing_default(self):
+        module = types.ModuleType('sigtools_serialize_missing')
+        self.addCleanup(sys.modules.pop, module.__name__, None)
+        sys.modules[module.__name__] = module
+        exec('class Default:\n    pass\n'
+             'def func(a=Default):\n    pass\n', module.__dict__)
+        data = signature(module.func).to_bytes()
+        del module.Default
+        with self.assertRaises(ValueError):
+            UpgradedSignature.from_bytes(data)
+
+    def test_placeholders(self):
+        default = object()
+        func = f('a=d', globals={'d': default})
+        sig = signature(func)
+        sig2 = self.round_trip(sig)
+        self.assertEqual(str(sig2), str(sig))
+        self.assertIsNot(sig2.parameters['a'].default, default)
+        self.assertEqual(repr(sig2.sources['a'][0]), repr(func))
+        self.assertEqual(str(self.round_trip(sig2)), str(sig))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            UpgradedSignature.from_bytes(b'not a signature')
+        with self.assertRaises(ValueError):
+            UpgradedSignature.from_bytes(marshal.dumps(('something', 1)))
+        data = marshal.loads(s('a').to_bytes())
+        with self.assertRaises(ValueError):
+            UpgradedSignature.from_bytes(marshal.dumps(data[:1] + (data[1] + 1,) + data[2:]))
+
+    def test_malformed(self):
+        magic, version, refs, params, ret, sources = marshal.loads(
+            s('a, *, b: int=1').to_bytes())
+        a, b = params
+        for record in [
+                (refs + (('p', len(refs), ()),), params, ret, sources),
+                (refs + (('x', 1),), params, ret, sources),
+                (refs + (('g', 'os'),), params, ret, sources),
+                (refs + (('p', 3, (('a',),)),), params, ret, sources),
+                (refs + (('p', 3, (('a', 1),)),), params, ret, sources),
+                (list(refs), params, ret, sources),
+                (refs, (a[:7],), ret, sources),
+                (refs, (a, a), ret, sources),
+                (refs, (a[:1] + (7,) + a[2:],), ret, sources),
+                (refs, (a[:2] + (len(refs),) + a[3:],), ret, sources),
+                (refs, (a[:4] + (('P', 0),) + a[5:],), ret, sources),
+                (refs, (a[:6] + ((-1,),) + a[7:],), ret, sources),
+                (refs, (a[:7] + (((1, 'deep'),),),), ret, sources),
+                (refs, params, (0,), sources),
+                (refs, params, ret, (('a', (len(refs),)),)),
+                (refs, params, ret, (('+depths', (1,)),)),
+                (refs, params, ret, None),
+                ]:
+            data = marshal.dumps((magic, version) + record)
+            with self.assertRaises(ValueError):
+                UpgradedSignature.from_bytes(data)
+
+
 class UpgradedParameterTests(SignatureTests):
     def test_upgrade_with_warning(self):
         param = UpgradedParameter(
@@ -211,6 +962,15 @@ class UpgradedParameterTests(SignatureTests):
         with self.assertWarns(DeprecationWarning):
             _upgrade_parameters_with_warning([param, downgraded_param])
 
+    def test_hash(self):
+        param1 = s('a: int = 1').parameters['a']
+        param2 = s('a: int = 1').parameters['a']
+        self.assertEqual(param1, param2)
+        self.assertEqual(hash(param1), hash(param2))
+        self.assertEqual(len({param1, param2, s('a=1').parameters['a']}), 2)
+        with self.assertRaises(TypeError):
+            hash(s('a=[]').parameters['a'])
+
 
 class UpgradedAnnotationTests(SignatureTests):
     def test_upgrade_empty(self):
@@ -261,6 +1021,66 @@ class UpgradedAnnotationTests(SignatureTests):
             msg="unrelated types"
         )
 
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed_memoized(self):
+        lookups = []
+        class Recorder(object):
+            def __getitem__(self, key):
+                lookups.append(key)
+                return key
+        func = f("one: rec[1]", globals={"rec": Recorder()}, future_features=["annotations"])
+        annotation = signature(func).parameters['one'].upgraded_annotation
+        self.assertEqual(annotation.source_value(), 1)
+        self.assertEqual(annotation.source_value(), 1)
+        self.assertEqual(lookups, [1])
+        func.__globals__['rec'] = Recorder()
+        self.assertEqual(annotation.source_value(), 1)
+        self.assertEqual(lookups, [1, 1])
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed_refresh(self):
+        ns = types.SimpleNamespace(value=1)
+        func = f("one: ns.value", globals={"ns": ns}, future_features=["annotations"])
+        annotation = signature(func).parameters['one'].upgraded_annotation
+        self.assertEqual(annotation.source_value(), 1)
+        ns.value = 2
+        self.assertEqual(annotation.source_value(), 1)
+        annotation.refresh()
+        self.assertEqual(annotation.source_value(), 2)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_postponed_not_found_not_memoized(self):
+        func = f("one: later", future_features=["annotations"])
+        annotation = signature(func).parameters['one'].upgraded_annotation
+        with self.assertRaises(NameError):
+            annotation.source_value()
+        func.__globals__['later'] = 3
+        self.assertEqual(annotation.source_value(), 3)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_source_values(self):
+        func = f("one: a, two: b, three", "a", globals={"a": 1, "b": 2}, future_features=["annotations"])
+        sig = signature(func)
+        annotations = [p.upgraded_annotation for p in sig.parameters.values()]
+        annotations.append(sig.upgraded_return_annotation)
+        annotations.append(UpgradedAnnotation.preevaluated(4))
+        with patch('sigtools._signatures.eval', create=True, side_effect=eval) as ev:
+            self.assertEqual(
+                UpgradedAnnotation.source_values(annotations),
+                [1, 2, UpgradedParameter.empty, 1, 4])
+            self.assertEqual(ev.call_count, 1)
+            self.assertEqual(annotations[1].source_value(), 2)
+            self.assertEqual(ev.call_count, 1)
+
+    @unittest.skipIf(*python_doesnt_have_future_annotations)
+    def test_source_values_error(self):
+        func = f("one: a, two: missing", globals={"a": 1}, future_features=["annotations"])
+        annotations = [
+            p.upgraded_annotation for p in signature(func).parameters.values()]
+        with self.assertRaises(NameError):
+            UpgradedAnnotation.source_values(annotations)
+        self.assertEqual(annotations[0].source_value(), 1)
+
     def test_empty_repr(self):
         self.assertEqual(
             repr(UpgradedAnnotation.preevaluated(UpgradedParameter.empty)),
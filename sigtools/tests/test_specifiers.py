@@ -23,7 +23,11 @@
 
 import sys
 
-from sigtools import modifiers, specifiers, support, _util, signatures
+from mock import patch
+
+from sigtools import modifiers, specifiers, support, _util, signatures, _autoforwards
+from sigtools import wrappers
+from sigtools import _specifiers
 from sigtools.tests.util import Fixtures, SignatureTests, tup
 
 import unittest
@@ -483,3 +487,170 @@ class ForgerFunctionTests(SignatureTests):
             support.s('i, j, *, a'),
             specifiers.signature(func))
         func(1, 2, 3, a=4)
+
+
+def _explain_inner(a, b):
+    raise NotImplementedError
+
+
+def _explain_outer(c, *args, **kwargs):
+    _explain_inner(*args, **kwargs)
+
+
+def _explain_unresolvable(c, *args, **kwargs):
+    doesntexist(*args, **kwargs) # pyflakes: silence
+
+
+class ExplainTests(unittest.TestCase):
+    def names(self, step):
+        return [(s.name, s.subject) for s in step.walk()]
+
+    def test_tree(self):
+        _util.clear_ast_cache()
+        _autoforwards.forget_calls()
+        step = specifiers.explain(_explain_outer)
+        self.assertEqual(str(step.result), '(c, a, b)')
+        self.assertEqual(step.outcome, 'ok')
+        self.assertEqual(self.names(step), [
+            ('forged_signature', '_explain_outer'),
+            ('autoforwards', '_explain_outer'),
+            ('get_ast', '_explain_outer'),
+            ('parse', _explain_outer.__code__.co_filename),
+            ('CallListerVisitor', '_explain_outer'),
+            ('forward', '_explain_inner'),
+            ('forged_signature', '_explain_inner'),
+            ('autoforwards', '_explain_inner'),
+            ('signature', '_explain_inner'),
+            ('mask', None),
+            ('embed', None),
+            ('merge', None),
+        ])
+        for s in step.walk():
+            self.assertGreaterEqual(step.duration, s.duration)
+        self.assertEqual(
+            step.children[0].children[2].children[0].children[0].outcome,
+            'UnusableCode: no *args or **kwargs parameter')
+        self.assertIn('forward _explain_inner: ', step.format())
+
+    def test_reason(self):
+        step = specifiers.explain(_explain_unresolvable)
+        self.assertEqual(str(step.result), '(c, *args, **kwargs)')
+        self.assertEqual(
+            step.children[0].outcome,
+            "UnknownForwards: could not resolve <name 'doesntexist'>")
+
+    def test_forger(self):
+        @specifiers.forwards_to_function(_explain_inner)
+        def func(*args, **kwargs):
+            raise NotImplementedError
+        step = specifiers.explain(func)
+        self.assertEqual(str(step.result), '(a, b)')
+        self.assertEqual(step.children[0].name, 'forger')
+
+    def test_not_tracing_outside(self):
+        specifiers.explain(_explain_outer)
+        from sigtools import _trace
+        with _trace.step('anything') as step:
+            self.assertIsNone(step)
+
+
+def _budget_middle(d, *args, **kwargs):
+    _explain_outer(d, *args, **kwargs)
+
+
+@wrappers.decorator
+def _budget_deco(func, *args, flag, **kwargs):
+    return func(*args, **kwargs)
+
+
+@_budget_deco
+def _budget_decorated(x, *args, **kwargs):
+    return _explain_outer(*args, **kwargs)
+
+
+class BudgetTests(unittest.TestCase):
+    def setUp(self):
+        _autoforwards.forget_calls()
+        self.addCleanup(specifiers.disable_budget)
+
+    def assertFallback(self, budget, reason, func=_explain_outer):
+        self.assertEqual(
+            str(specifiers.signature(func)),
+            str(specifiers.signature(func, auto=False)))
+        self.assertEqual(budget.exceeded, 1)
+        self.assertEqual(budget.last_reason, reason)
+
+    def test_unlimited(self):
+        budget = specifiers.enable_budget()
+        self.assertEqual(str(specifiers.signature(_budget_middle)), '(d, a, b)')
+        self.assertEqual(budget.exceeded, 0)
+        self.assertIsNone(budget.last_reason)
+
+    def test_depth(self):
+        budget = specifiers.enable_budget(depth=2)
+        self.assertEqual(str(specifiers.signature(_budget_middle)), '(d, a, b)')
+        budget = specifiers.enable_budget(depth=1)
+        self.assertFallback(
+            budget, 'depth budget of 1 exceeded', _budget_middle)
+
+    def test_nodes(self):
+        budget = specifiers.enable_budget(nodes=1)
+        self.assertFallback(budget, 'node budget of 1 exceeded')
+
+    def test_nodes_bytecode(self):
+        budget = specifiers.enable_budget(nodes=1)
+        with patch.object(_util, 'get_ast', return_value=None):
+            self.assertFallback(budget, 'node budget of 1 exceeded')
+
+    def test_time(self):
+        budget = specifiers.enable_budget(time=1)
+        clock = iter(range(0, 100, 2))
+        with patch.object(_specifiers.time, 'perf_counter',
+                          lambda: next(clock)):
+            self.assertFallback(budget, 'time budget of 1s exceeded')
+
+    def test_decorated(self):
+        budget = specifiers.enable_budget(depth=0)
+        with patch.object(_util, 'get_ast', wraps=_util.get_ast) as get_ast:
+            self.assertEqual(
+                str(specifiers.signature(_budget_decorated)),
+                '(x, *args, **kwargs)')
+        self.assertFalse(get_ast.called)
+        self.assertEqual(budget.exceeded, 1)
+        specifiers.enable_budget()
+        self.assertEqual(
+            str(specifiers.signature(_budget_decorated)),
+            '(x, c, a, b, *, flag)')
+
+    def test_fallback_not_cached(self):
+        specifiers.enable_cache()
+        self.addCleanup(specifiers.disable_cache)
+        specifiers.enable_budget(depth=0)
+        specifiers.signature(_explain_outer)
+        specifiers.disable_budget()
+        self.assertEqual(str(specifiers.signature(_explain_outer)), '(c, a, b)')
+
+    def test_not_remembered_as_unusable(self):
+        specifiers.enable_budget(nodes=1)
+        specifiers.signature(_explain_outer)
+        specifiers.disable_budget()
+        self.assertEqual(str(specifiers.signature(_explain_outer)), '(c, a, b)')
+
+    def test_explain(self):
+        specifiers.enable_budget(depth=0)
+        step = specifiers.explain(_explain_outer)
+        self.assertEqual(str(step.result), '(c, *args, **kwargs)')
+        self.assertEqual(step.outcome, 'budget exceeded: depth budget of 0 exceeded')
+        self.assertEqual(step.children[-1].name, 'signature')
+
+    def test_no_auto(self):
+        budget = specifiers.enable_budget(nodes=0, depth=0)
+        self.assertEqual(
+            str(specifiers.signature(_explain_outer, auto=False)),
+            '(c, *args, **kwargs)')
+        self.assertEqual(budget.exceeded, 0)
+
+    def test_repr(self):
+        self.assertEqual(
+            repr(specifiers.enable_budget(time=0.5, depth=3)),
+            '<Budget time=0.5 nodes=None depth=3 exceeded=0>')
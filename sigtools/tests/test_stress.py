@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+from sigtools import signatures, support
+from sigtools.tests.util import Fixtures
+
+
+def _names(prefix, start, stop):
+    return ', '.join('{0}{1}'.format(prefix, i) for i in range(start, stop))
+
+
+def _sig(*parts):
+    return support.s(', '.join(part for part in parts if part))
+
+
+class StressTests(Fixtures):
+    def _test(self, operation, n):
+        getattr(self, '_test_' + operation)(n)
+
+    def _test_mask(self, n):
+        sig = _sig(_names('p', 0, n), '*', _names('k', 0, n))
+        half, named = n // 2, n * 3 // 4
+        masked = signatures.mask(
+            sig, half, 'p{0}'.format(named), 'k{0}'.format(n - 1))
+        expected = _sig(
+            _names('p', half, named), '*',
+            _names('k', 0, n - 1), _names('p', named + 1, n))
+        self.assertSigsEqual(masked, expected)
+        self.assertSourcesEqual(
+            masked.sources, {'func': expected.parameters}, func='func')
+
+    def _test_merge(self, n):
+        sig = _sig(_names('p', 0, n), '*', _names('k', 0, n))
+        self.assertSigsEqual(signatures.merge(sig, sig), sig)
+        other = _sig(_names('q', 0, n), '*', _names('k', 0, n))
+        self.assertSigsEqual(
+            signatures.merge(sig, other),
+            _sig(_names('p', 0, n), '/', '*', _names('k', 0, n)))
+
+    def _test_embed(self, n):
+        outer = support.s('o, *args, **kwargs')
+        inner = _sig(_names('p', 0, n), '*', _names('k', 0, n))
+        self.assertSigsEqual(
+            signatures.embed(outer, inner),
+            _sig('o', _names('p', 0, n), '*', _names('k', 0, n)))
+        self.assertSigsEqual(
+            signatures.embed(outer, support.s('*, ' + _names('k', 0, n))),
+            _sig('o', '*', _names('k', 0, n)))
+
+    def _test_forwards(self, n):
+        outer = support.s('o, *args, **kwargs')
+        inner = _sig(_names('p', 0, n), '*', _names('k', 0, n))
+        half = n // 2
+        self.assertSigsEqual(
+            signatures.forwards(outer, inner, 1, *(
+                'k{0}'.format(i) for i in range(half))),
+            _sig('o', _names('p', 1, n), '*', _names('k', half, n)))
+
+    mask_10 = 'mask', 10
+    mask_100 = 'mask', 100
+    mask_1000 = 'mask', 1000
+    mask_5000 = 'mask', 5000
+    merge_10 = 'merge', 10
+    merge_100 = 'merge', 100
+    merge_1000 = 'merge', 1000
+    merge_5000 = 'merge', 5000
+    embed_10 = 'embed', 10
+    embed_100 = 'embed', 100
+    embed_1000 = 'embed', 1000
+    embed_5000 = 'embed', 5000
+    forwards_10 = 'forwards', 10
+    forwards_100 = 'forwards', 100
+    forwards_1000 = 'forwards', 1000
+    forwards_5000 = 'forwards', 5000
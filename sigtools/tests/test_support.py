@@ -235,3 +235,35 @@ class FuncCodeTests(Fixtures):
         def func(a, c, d, b=1, e=4, *args):
             return {'a': a, 'b': b, 'c': c, 'd': d, 'e': e, 'args': args}
     """, force_modifiers
+
+
+class SortCallsigsTests(Fixtures):
+    def _test(self, sig_str, extra_callsigs=()):
+        sig = support.s(sig_str)
+        callsigs = support.make_up_callsigs(sig) + list(extra_callsigs)
+        expected_valid = []
+        expected_invalid = []
+        for args, kwargs in callsigs:
+            try:
+                bound = support.bind_callsig(sig, args, kwargs)
+            except TypeError:
+                expected_invalid.append((args, kwargs))
+            else:
+                expected_valid.append((args, kwargs, bound))
+        valid, invalid = support.sort_callsigs(sig, callsigs)
+        self.assertEqual(valid, expected_valid)
+        self.assertEqual(invalid, expected_invalid)
+        for (_, _, bound), (_, _, expected) in zip(valid, expected_valid):
+            self.assertEqual(list(bound), list(expected))
+
+    empty = '',
+    pok = 'a, b',
+    defaults = 'a, b=1, c=2',
+    posoargs = 'a, /, b, *, c',
+    posoargs_default = 'a=1, /, **kwargs',
+    kwoargs = '*, a, b=1',
+    varargs = 'a, *args, b',
+    varkwargs = 'a, **kwargs', [((), {'kwargs': 1, 'z': 2})]
+    everything = 'a, /, b, c=1, *args, d, e=2, **kwargs',
+    many = 'a, b, c, d=1, e=2, *args, f, g, h=3, **kwargs',
+    list_args = 'a, *args', [([1, 2, 3], {})]
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import inspect
+import sys
+import threading
+import unittest
+
+from sigtools import specifiers, modifiers, _autoforwards, _util
+from sigtools.tests.util import Fixtures
+
+
+def _inner(a, b, *, c):
+    raise NotImplementedError
+
+
+def _outer(x, *args, **kwargs):
+    return _inner(*args, **kwargs)
+
+
+def _wrapped(*args, **kwargs):
+    return _inner(*args, **kwargs)
+_wrapped.__wrapped__ = _outer
+
+
+class _Forged(object):
+    __signature__ = specifiers.as_forged
+
+    def __init__(self):
+        self.seen_from_thread = None
+
+    def _sigtools__forger(self, obj):
+        if self.seen_from_thread is None:
+            self.seen_from_thread = False
+            def read():
+                self.seen_from_thread = str(inspect.signature(self))
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+        return specifiers.signature(_inner)
+
+    def __call__(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+class ThreadSafetyTests(unittest.TestCase):
+    def test_wrapped_function_unmodified(self):
+        observed = []
+        def profile(frame, event, arg):
+            if event == 'call':
+                observed.append('__wrapped__' in vars(_wrapped))
+        sys.setprofile(profile)
+        try:
+            sig = specifiers.signature(_wrapped)
+        finally:
+            sys.setprofile(None)
+        self.assertEqual(str(sig), '(a, b, *, c)')
+        self.assertTrue(observed)
+        self.assertTrue(all(observed))
+        self.assertIs(_wrapped.__wrapped__, _outer)
+
+    def test_as_forged_from_other_thread(self):
+        obj = _Forged()
+        self.assertEqual(str(inspect.signature(obj)), '(a, b, *, c)')
+        self.assertEqual(obj.seen_from_thread, '(a, b, *, c)')
+
+    def test_modifier_bound_once(self):
+        class Cls(object):
+            @modifiers.kwoargs('b')
+            def method(self, a, b):
+                raise NotImplementedError
+        inst = Cls()
+        barrier = threading.Barrier(8)
+        results = []
+        def get():
+            barrier.wait()
+            results.append(Cls.__dict__['method'].__get__(inst, Cls))
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(map(id, results))), 1)
+
+
+class ConcurrentResolutionTests(Fixtures):
+    def _test(self, cache):
+        if cache:
+            cache = specifiers.enable_cache()
+        self.addCleanup(specifiers.disable_cache)
+        objs = [_outer, _wrapped, _inner, _Forged()]
+        expected = [str(specifiers.signature(obj)) for obj in objs]
+        if cache:
+            cache.clear()
+        barrier = threading.Barrier(9)
+        errors = []
+        def resolve():
+            barrier.wait()
+            try:
+                for _ in range(20):
+                    for obj, exp in zip(objs, expected):
+                        sig = str(specifiers.signature(obj))
+                        if sig != exp:
+                            errors.append((obj, sig))
+            except Exception as exc:
+                errors.append(exc)
+        def forget():
+            # the caches shared by all resolutions, enabled or not
+            barrier.wait()
+            try:
+                for _ in range(20):
+                    _autoforwards.forget_calls()
+                    _autoforwards.forget_unusable_code()
+                    _util.clear_ast_cache()
+            except Exception as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=resolve) for _ in range(8)]
+        threads.append(threading.Thread(target=forget))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    uncached = False,
+    cached = True,
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# sigtools - Collection of Python modules for manipulating function signatures
+# Copyright (C) 2013-2022 Yann Kaiser
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from sigtools import modifiers, wrappers
+
+
+def plain(a, b):
+    raise NotImplementedError
+
+
+def forwarding(c, *args, **kwargs):
+    return plain(*args, **kwargs)
+
+
+@modifiers.kwoargs('b')
+def modified(a, b):
+    raise NotImplementedError
+
+
+@wrappers.decorator
+def deco(func, *args, x, **kwargs):
+    return func(*args, **kwargs)
+
+
+@deco
+def decorated(a):
+    raise NotImplementedError
+
+
+def _private(a):
+    raise NotImplementedError
+
+
+class Klass(object):
+    def __init__(self, a):
+        raise NotImplementedError
+
+    def method(self, b, *args, **kwargs):
+        return plain(*args, **kwargs)
+
+    @staticmethod
+    def static(c):
+        raise NotImplementedError
+
+    @classmethod
+    def clsmethod(cls, d):
+        raise NotImplementedError
+
+    def _private(self):
+        raise NotImplementedError